@@ -0,0 +1,458 @@
+"""
+Usage - python benchmark.py -h
+Output - One line per lookup mode with the time it took to look up the
+         country codes of the same random IPv4 addresses, and how many
+         buffers per lookup were read from the database file handle.
+
+         With -p or -t, also checks that one GeoIP instance opened before
+         forking worker processes or starting threads returns the same
+         results in all of them as in a single process.
+
+         With -i, also prints how long importing pygeoip and its largest
+         modules takes in a fresh interpreter, as short-lived scripts pay it
+         on every run.  With -b, exits with status 1 if importing pygeoip
+         takes longer than the given number of milliseconds.
+
+         With -s, instead runs the suite: generates a synthetic Country and
+         ASN database, so that no download is needed, and times cold open,
+         single lookups, batch lookups, and memory growth of every lookup
+         mode in a fresh process.  The results of every mode are checked
+         against the generated ranges, and the command exits with status 1
+         if any of them is wrong or, with -B, slower than in a baseline
+         written by an earlier run with -j.
+"""
+
+import os
+import sys
+import json
+import random
+import time
+import bisect
+import shutil
+import struct
+import tempfile
+import subprocess
+import compileall
+import threading
+import multiprocessing
+import pygeoip
+
+from optparse import OptionParser
+from pygeoip import const, snapshot
+
+MODES = [('STANDARD', pygeoip.STANDARD),
+         ('MEMORY_CACHE', pygeoip.MEMORY_CACHE),
+         ('MMAP_CACHE', pygeoip.MMAP_CACHE),
+         ('STANDARD|INDEX_CACHE', pygeoip.STANDARD | pygeoip.INDEX_CACHE),
+         ('MEMORY_CACHE|INDEX_CACHE', pygeoip.MEMORY_CACHE | pygeoip.INDEX_CACHE),
+         ('MMAP_CACHE|INDEX_CACHE', pygeoip.MMAP_CACHE | pygeoip.INDEX_CACHE),
+         ('RANGE_CACHE', pygeoip.RANGE_CACHE)]
+
+# modules timed by -i; tables and timezone are loaded on their own, without
+# the package that imports them on first use
+IMPORTS = [('pygeoip', 'import pygeoip'),
+           ('pygeoip/tables.py', 'load("tables")'),
+           ('pygeoip/timezone.py', 'load("timezone")')]
+
+IMPORT_TIMER = """
+import sys, time, imp
+sys.path.insert(0, %r)
+def load(name):
+    imp.load_module('_' + name, *imp.find_module(name, [%r]))
+start = time.time()
+%s
+sys.stdout.write('%%f' %% (time.time() - start))
+"""
+
+# lookup methods timed by the suite for each synthetic database edition
+SUITE_EDITIONS = [('country', 'country_code_by_addr', 'country_code_by_addrs'),
+                  ('asn', 'org_by_addr', 'org_by_addrs')]
+
+class ReadCounter(object):
+    """
+    Wraps a file handle and counts read() calls, each of which allocates
+    a new string.
+    """
+    def __init__(self, filehandle):
+        self.filehandle = filehandle
+        self.reads = 0
+
+    def read(self, *args):
+        self.reads += 1
+        return self.filehandle.read(*args)
+
+    def __getattr__(self, name):
+        return getattr(self.filehandle, name)
+
+def random_addrs(count, seed):
+    rnd = random.Random(seed)
+    addrs = []
+    for i in range(count):
+        ipnum = rnd.randint(1, 2 ** 32 - 1)
+        addrs.append("%d.%d.%d.%d" % (ipnum >> 24, (ipnum >> 16) & 255,
+                                      (ipnum >> 8) & 255, ipnum & 255))
+    return addrs
+
+def run(filename, addrs):
+    expected = None
+    for name, flags in MODES:
+        start = time.time()
+        gi = pygeoip.GeoIP(filename, flags)
+        opened = time.time()
+        counter = gi._filehandle = ReadCounter(gi._filehandle)
+        results = [gi.country_code_by_addr(addr) for addr in addrs]
+        done = time.time()
+        if expected is None:
+            expected = results
+        elif results != expected:
+            print "%s: results differ from %s" % (name, MODES[0][0])
+        print "%-26s open %8.1f ms, %d lookups %8.1f ms, %5.1f reads/lookup" % (
+            name, (opened - start) * 1000, len(addrs), (done - opened) * 1000,
+            counter.reads / float(len(addrs)))
+
+# opened before forking, so that worker processes share its mmapped pages
+shared_gi = None
+
+def lookup_chunk(addrs):
+    return [shared_gi.country_code_by_addr(addr) for addr in addrs]
+
+def run_processes(filename, addrs, processes):
+    global shared_gi
+    shared_gi = pygeoip.GeoIP(filename, pygeoip.MMAP_CACHE)
+    expected = lookup_chunk(addrs)
+    chunks = [addrs[i::processes] for i in range(processes)]
+
+    start = time.time()
+    pool = multiprocessing.Pool(processes)
+    results = pool.map(lookup_chunk, chunks)
+    pool.close()
+    pool.join()
+    done = time.time()
+
+    ok = all(result == expected[i::processes] for i, result in enumerate(results))
+    print "%d processes sharing MMAP_CACHE: %d lookups %8.1f ms, %s" % (
+        processes, len(addrs), (done - start) * 1000, "ok" if ok else "FAILED")
+
+def run_threads(filename, addrs, threads):
+    gi = pygeoip.GeoIP(filename, pygeoip.STANDARD)
+    expected = [gi.country_code_by_addr(addr) for addr in addrs]
+    chunks = [addrs[i::threads] for i in range(threads)]
+    results = [None] * threads
+
+    def worker(i):
+        results[i] = [gi.country_code_by_addr(addr) for addr in chunks[i]]
+
+    start = time.time()
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    done = time.time()
+
+    ok = all(result == expected[i::threads] for i, result in enumerate(results))
+    print "%d threads sharing STANDARD: %d lookups %8.1f ms, %s" % (
+        threads, len(addrs), (done - start) * 1000, "ok" if ok else "FAILED")
+
+def run_imports(runs):
+    """
+    Return the median time in ms it took to import pygeoip.
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    package = os.path.join(here, 'pygeoip')
+    # time loading the compiled modules, as installed code does, rather than
+    # compiling them in every run
+    compileall.compile_dir(package, quiet=True)
+    medians = {}
+    for name, statement in IMPORTS:
+        code = IMPORT_TIMER % (here, package, statement)
+        times = [float(subprocess.check_output([sys.executable, '-c', code]))
+                 for i in range(runs)]
+        medians[name] = sorted(times)[len(times) // 2] * 1000
+        print "import %-20s min %6.2f ms, median %6.2f ms over %d runs" % (
+            name, min(times) * 1000, medians[name], runs)
+    return medians['pygeoip']
+
+def build_tree(ranges, empty):
+    """
+    Build the search tree of a database assigning values to the sorted,
+    disjoint (start, end, value) ranges and empty to all other addresses.
+    Each node is a pair of ('node', index) or ('leaf', value) records.
+    """
+    starts = [r[0] for r in ranges]
+    nodes = []
+
+    def block_value(lo, hi):
+        # the value of all addresses from lo to hi, or None if they differ
+        i = bisect.bisect_right(starts, lo) - 1
+        if i >= 0 and hi <= ranges[i][1]:
+            return ranges[i][2]
+        if (i < 0 or ranges[i][1] < lo) and (i + 1 == len(ranges) or
+                                             ranges[i + 1][0] > hi):
+            return empty
+        return None
+
+    def build(lo, bits):
+        index = len(nodes)
+        nodes.append(None)
+        half = 1 << (bits - 1)
+        records = []
+        for child in (lo, lo + half):
+            value = block_value(child, child + half - 1)
+            if value is None:
+                records.append(('node', build(child, bits - 1)))
+            else:
+                records.append(('leaf', value))
+        nodes[index] = records
+        return index
+
+    build(0, 32)
+    return nodes
+
+def write_dat(filename, nodes, segments, data, trailer):
+    with open(filename, 'wb') as f:
+        for records in nodes:
+            for kind, value in records:
+                if kind == 'leaf':
+                    value += segments
+                f.write(struct.pack('<I', value)[:3])
+        f.write(data)
+        f.write(trailer)
+
+def synthetic_ranges(count, values, seed):
+    """
+    Return about count sorted (start, end, value) ranges with random
+    boundaries, values, and gaps.
+    """
+    rnd = random.Random(seed)
+    bounds = sorted(set(rnd.randrange(1, 2 ** 32) for i in range(count)))
+    bounds = [0] + bounds + [2 ** 32]
+    ranges = []
+    for start, end in zip(bounds, bounds[1:]):
+        if rnd.random() < 0.8:
+            ranges.append((start, end - 1, rnd.choice(values)))
+    return ranges
+
+def write_synthetic(directory, count, seed):
+    """
+    Write a synthetic Country and ASN database to directory.
+
+    @return: dict of edition to (filename, ranges)
+    @rtype: dict
+    """
+    databases = {}
+
+    ranges = synthetic_ranges(count, range(1, len(const.COUNTRY_CODES)), seed)
+    filename = os.path.join(directory, 'GeoIP.dat')
+    write_dat(filename, build_tree(ranges, 0), const.COUNTRY_BEGIN, '',
+              '\xff\xff\xff' + chr(const.COUNTRY_EDITION))
+    databases['country'] = (filename, [(start, end, const.COUNTRY_CODES[value])
+                                       for start, end, value in ranges])
+
+    names = ['AS%d Synthetic Org %d' % (i, i) for i in range(1, count // 10 + 2)]
+    ranges = synthetic_ranges(count, names, seed + 1)
+    # offset 0 would be the empty record
+    data = ['\0']
+    offsets = {}
+    for name in names:
+        offsets[name] = sum(len(d) for d in data)
+        data.append(name + '\0')
+    nodes = build_tree([(start, end, offsets[name]) for start, end, name in ranges], 0)
+    filename = os.path.join(directory, 'GeoIPASNum.dat')
+    write_dat(filename, nodes, len(nodes), ''.join(data),
+              '\xff\xff\xff' + chr(const.ASNUM_EDITION) +
+              struct.pack('<I', len(nodes))[:3])
+    databases['asn'] = (filename, ranges)
+
+    return databases
+
+def expected_values(ranges, addrs, empty):
+    starts = [r[0] for r in ranges]
+    values = []
+    for addr in addrs:
+        ipnum = pygeoip.util.ip2long(addr)
+        i = bisect.bisect_right(starts, ipnum) - 1
+        if i >= 0 and ipnum <= ranges[i][1]:
+            values.append(ranges[i][2])
+        else:
+            values.append(empty)
+    return values
+
+def suite_addrs(ranges, count, seed):
+    """
+    Return count random addresses, of which a quarter are first, last, and
+    following addresses of ranges, where fast paths tend to be off by one.
+    """
+    rnd = random.Random(seed)
+    addrs = random_addrs(count - count // 4, seed)
+    while len(addrs) < count:
+        start, end, value = rnd.choice(ranges)
+        for ipnum in (start, end, end + 1):
+            if 0 < ipnum < 2 ** 32:
+                addrs.append("%d.%d.%d.%d" % (ipnum >> 24, (ipnum >> 16) & 255,
+                                              (ipnum >> 8) & 255, ipnum & 255))
+    return addrs[:count]
+
+def resident_kb():
+    """
+    Return the resident set size of this process in KiB, or None where it
+    can't be read from /proc.
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+    except (IOError, IndexError, ValueError):
+        return None
+    return pages * os.sysconf('SC_PAGE_SIZE') // 1024
+
+def measure(filename, flags, single, batch, addrs, expected):
+    """
+    Time one lookup mode; run in a fresh process, so that the open is cold
+    and the memory growth is its own.
+    """
+    rss = resident_kb()
+    start = time.time()
+    gi = pygeoip.GeoIP(filename, flags)
+    opened = time.time()
+    results = [getattr(gi, single)(addr) for addr in addrs]
+    looked_up = time.time()
+    batch_results = getattr(gi, batch)(addrs)
+    done = time.time()
+    grown = resident_kb()
+
+    return {'open_ms': (opened - start) * 1000,
+            'single_us': (looked_up - opened) * 1e6 / len(addrs),
+            'batch_us': (done - looked_up) * 1e6 / len(addrs),
+            'rss_kb': grown - rss if rss is not None else None,
+            'ok': results == expected and batch_results == expected}
+
+def run_suite(count, lookups, seed, as_json, baseline, tolerance):
+    """
+    Run the suite and print one line, or JSON object, per edition and mode.
+
+    @return: whether all modes returned the expected results and none was
+        slower than in the baseline by more than tolerance
+    @rtype: bool
+    """
+    directory = tempfile.mkdtemp(prefix='pygeoip-benchmark-')
+    # each task runs in a fresh process
+    pool = multiprocessing.Pool(1, maxtasksperchild=1)
+    passed = True
+    try:
+        databases = write_synthetic(directory, count, seed)
+        for edition, single, batch in SUITE_EDITIONS:
+            filename, ranges = databases[edition]
+            snapshot_filename = filename + '.snapshot'
+            pool.apply(snapshot.compile_snapshot, (filename, snapshot_filename))
+
+            addrs = suite_addrs(ranges, lookups, seed)
+            expected = expected_values(ranges, addrs,
+                                       '' if edition == 'country' else None)
+
+            modes = [(name, filename, flags) for name, flags in MODES
+                     if edition == 'country' or not flags & pygeoip.RANGE_CACHE]
+            modes.append(('SNAPSHOT', snapshot_filename, 0))
+
+            for name, path, flags in modes:
+                result = pool.apply(measure, (path, flags, single, batch,
+                                              addrs, expected))
+                result.update({'edition': edition, 'mode': name,
+                               'ranges': len(ranges), 'lookups': lookups})
+
+                key = (edition, name)
+                if key in baseline:
+                    for metric in ('single_us', 'batch_us'):
+                        if result[metric] > baseline[key][metric] * (1 + tolerance):
+                            result['regressed'] = result.get('regressed', []) + [metric]
+
+                passed = passed and result['ok'] and not result.get('regressed')
+
+                if as_json:
+                    print json.dumps(result, sort_keys=True)
+                else:
+                    print "%-8s %-26s open %7.1f ms, single %6.2f us, batch %6.2f us, " \
+                          "rss %6s KiB, %s%s" % (
+                        edition, name, result['open_ms'], result['single_us'],
+                        result['batch_us'], result['rss_kb'],
+                        "ok" if result['ok'] else "WRONG RESULTS",
+                        ", slower %s" % ' '.join(result['regressed'])
+                        if result.get('regressed') else '')
+    finally:
+        pool.close()
+        pool.join()
+        shutil.rmtree(directory)
+
+    return passed
+
+def load_baseline(filename):
+    """
+    Return the results of a run with -s -j by (edition, mode).
+    """
+    baseline = {}
+    with open(filename) as f:
+        for line in f:
+            if line.strip():
+                result = json.loads(line)
+                baseline[(result['edition'], result['mode'])] = result
+    return baseline
+
+def parse_args():
+    usage = "Usage - python benchmark.py [options]"
+    parser = OptionParser(usage)
+
+    parser.add_option("-g", "--geoip", dest="gi_db", default="GeoIP.dat",
+                      help="Input GeoIP database")
+    parser.add_option("-n", "--lookups", dest="lookups", type="int",
+                      default=100000, help="Number of addresses to look up")
+    parser.add_option("-r", "--seed", dest="seed", type="int", default=1,
+                      help="Seed for generating random addresses")
+    parser.add_option("-p", "--processes", dest="processes", type="int",
+                      default=0, help="Number of worker processes to check")
+    parser.add_option("-t", "--threads", dest="threads", type="int",
+                      default=0, help="Number of threads to check")
+    parser.add_option("-i", "--imports", dest="imports", type="int",
+                      default=0, help="Number of fresh interpreters to time "
+                      "imports in")
+    parser.add_option("-b", "--import-budget", dest="import_budget",
+                      type="float", default=0, help="Maximum median time in ms "
+                      "for importing pygeoip with -i")
+    parser.add_option("-s", "--suite", dest="suite", action="store_true",
+                      default=False, help="Run the suite on synthetic "
+                      "databases instead of timing -g")
+    parser.add_option("-R", "--ranges", dest="ranges", type="int",
+                      default=20000, help="Number of ranges in the synthetic "
+                      "databases")
+    parser.add_option("-j", "--json", dest="json", action="store_true",
+                      default=False, help="Print suite results as one JSON "
+                      "object per line")
+    parser.add_option("-B", "--baseline", dest="baseline", default=None,
+                      help="Suite results of an earlier run with -j to "
+                      "compare lookup times with")
+    parser.add_option("-T", "--tolerance", dest="tolerance", type="float",
+                      default=0.25, help="Fraction by which lookups may be "
+                      "slower than in the baseline")
+
+    (options, args) = parser.parse_args()
+
+    return options
+
+if __name__ == "__main__":
+    options = parse_args()
+    if options.imports:
+        median = run_imports(options.imports)
+        if options.import_budget and median > options.import_budget:
+            print "import pygeoip took %.2f ms, budget is %.2f ms" % (
+                median, options.import_budget)
+            sys.exit(1)
+    if options.suite:
+        baseline = load_baseline(options.baseline) if options.baseline else {}
+        if not run_suite(options.ranges, options.lookups, options.seed,
+                         options.json, baseline, options.tolerance):
+            sys.exit(1)
+        sys.exit(0)
+    addrs = random_addrs(options.lookups, options.seed)
+    run(options.gi_db, addrs)
+    if options.processes:
+        run_processes(options.gi_db, addrs, options.processes)
+    if options.threads:
+        run_threads(options.gi_db, addrs, options.threads)
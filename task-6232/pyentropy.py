@@ -19,6 +19,7 @@ import sys
 import math
 import os
 import pygeoip
+import pygeoip.history
 import StringIO
 import stem.descriptor
 
@@ -30,6 +31,7 @@ class Router:
     def __init__(self):
         self.bandwidth = None
         self.advertised_bw = None
+        self.address = None
         self.country = None
         self.as_no = None
         self.is_exit = None
@@ -38,9 +40,11 @@ class Router:
     def add_router_info(self, values):
            hex_digest = b2a_hex(a2b_base64(values[2]+"="))
            self.advertised_bw = self.get_advertised_bw(hex_digest)
-           ip = values[5]
-           self.country = gi_db.country_code_by_addr(ip)
-           self.as_no = self.get_as_details(ip)
+           self.address = values[5]
+
+    def add_location(self, record):
+           self.country = record['country_code']
+           self.as_no = record.get('asn')
 
     def add_weights(self, values):
            self.bandwidth = int(values[0].split('=')[1])
@@ -51,13 +55,6 @@ class Router:
            if "Guard" in values:
                self.is_guard = True
  
-    def get_as_details(self, ip):
-        try:
-            value = as_db.org_by_addr(str(ip)).split()
-            return value[0]
-        except:
-            return ""
-    
     def get_advertised_bw(self, hex_digest):
         try:
             with open(options.server_desc+hex_digest) as f:
@@ -111,6 +108,17 @@ def run(file_name):
     
     if len(routers) <= 0:
         return
+
+    # look up all relays at once, in address order, in both databases
+    addresses = [relay.address for relay in routers]
+    if options.history:
+        records = [{'country_code': country, 'asn': as_no} for country, as_no in
+                   zip(gi_history.country_code_by_addrs(addresses, valid_after),
+                       as_history.asn_by_addrs(addresses, valid_after))]
+    else:
+        records = geo_db.records_by_addrs(addresses)
+    for router, record in zip(routers, records):
+        router.add_location(record)
     
     total_bw, total_exit_bw, total_guard_bw = 0, 0, 0
     guards_no, exits_no = 0, 0
@@ -200,6 +208,10 @@ def parse_args():
                       help="Input GeoIP database")
     parser.add_option("-a", "--as", dest="as_db", default="GeoIPASNum.dat",
                       help="Input AS GeoIP database")
+    parser.add_option("-H", "--history", dest="history", action="store_true",
+                      default=False, help="Treat -g and -a as directories of "
+                      "archived databases named by date, e.g. GeoIP-20130101.dat, "
+                      "and use the ones valid at each consensus")
     parser.add_option("-s", "--server_desc", dest="server_desc",
                       default="data/relay-descriptors/server-descriptors/", help="Server descriptors directory")
     parser.add_option("-o", "--output", dest="output", default="entropy.csv",
@@ -213,8 +225,12 @@ def parse_args():
 
 if __name__ == "__main__":
     options = parse_args()
-    gi_db = pygeoip.GeoIP(options.gi_db)
-    as_db = pygeoip.GeoIP(options.as_db)
+    if options.history:
+        gi_history = pygeoip.history.GeoIPHistory.from_directory(options.gi_db)
+        as_history = pygeoip.history.GeoIPHistory.from_directory(options.as_db)
+    else:
+        geo_db = pygeoip.GeoIPStack([pygeoip.GeoIP(options.gi_db),
+                                     pygeoip.GeoIP(options.as_db)])
 
     with open(options.output, 'w') as f:
         for file_name in os.listdir(options.consensus):
@@ -8,6 +8,13 @@ C{new} and C{open} methods are gone. You should instantiate the L{GeoIP} class y
 
 C{gi = GeoIP('/path/to/GeoIP.dat', pygeoip.MEMORY_CACHE)}
 
+A GeoIP instance can be shared between threads: lookups read from the
+database at explicit offsets and never depend on a shared file position.
+In MMAP_CACHE mode it can also be shared with worker processes, e.g. of a
+C{multiprocessing.Pool}, by opening it before the workers are forked. The
+children then read the same mapped pages from the OS page cache instead of
+each opening their own copy of the database.
+
 @author: Jennifer Ennis <zaylea at gmail dot com>
 
 @license:
@@ -29,26 +36,141 @@ along with this program.  If not, see <http://www.gnu.org/licenses/lgpl.txt>.
 
 from __future__ import with_statement, absolute_import, division
 import os
-import math
 import socket
 import mmap
-import gzip
 import codecs
+import sys
+import struct
+import threading
+import bisect
+import functools
+from array import array
 from StringIO import StringIO
 
 from . import const
-from .util import ip2long
-from .timezone import time_zone_by_country_and_region
+from .util import ip2long, LRUCache, MappedArray
+from .record import GeoIPRecord
 
 from . import six
 
 MMAP_CACHE = const.MMAP_CACHE
 MEMORY_CACHE = const.MEMORY_CACHE
 STANDARD = const.STANDARD
+INDEX_CACHE = const.INDEX_CACHE
+RANGE_CACHE = const.RANGE_CACHE
+
+# header of the range table sidecar file: magic, format version, size and
+# modification time of the database it was built from, number of ranges
+RANGES_HEADER = struct.Struct('<4sIQdI')
+RANGES_MAGIC = six.b('PGRT')
+RANGES_VERSION = 1
+
+# header of a snapshot written by pygeoip.snapshot: magic, format version,
+# database type, record length, database segments, number of ranges, offset
+# of the records; the header is followed by the start addresses of the
+# ranges and the records assigned to them, as little-endian uint32 columns
+SNAPSHOT_HEADER = struct.Struct('<4sIBBxxIII')
+SNAPSHOT_MAGIC = six.b('PGSN')
+SNAPSHOT_VERSION = 1
+
+# marks a result that is not in the lookup cache (None is a valid result)
+_missing = object()
 
 class GeoIPError(Exception):
     pass
 
+def _parse_asn(org):
+    """
+    Split the name of an ASN database record like 'AS1234 Example Org'.
+
+    @param org: record name, or None
+    @type org: str
+    @return: (AS number, name) tuple, where name may be None, or None if
+        the record does not contain an AS number
+    @rtype: tuple
+    """
+    if org and org[:2] == 'AS':
+        parts = org[2:].split(' ', 1)
+        if parts[0].isdigit():
+            return (int(parts[0]), parts[1] if len(parts) > 1 else None)
+
+    return None
+
+def time_zone_by_country_and_region(country_code, region_name=None):
+    """
+    Re-export of L{timezone.time_zone_by_country_and_region}, which imports
+    the time zone table on first use instead of with pygeoip.
+
+    @param country_code: two-letter country code
+    @type country_code: str
+    @param region_name: region code, if any
+    @type region_name: str
+    @return: time zone name, or None if unknown
+    @rtype: str
+    """
+    from .timezone import time_zone_by_country_and_region
+    return time_zone_by_country_and_region(country_code, region_name)
+
+def _decompress_cached(filename, cache_dir=None):
+    """
+    Return the path of the decompressed copy of a gzipped database, writing
+    it first if no earlier process has. The copy is named after the SHA-1 of
+    the compressed file, so a changed database is never mistaken for an old
+    one, and written under a temporary name and then renamed, so concurrent
+    processes never see it half-written.
+
+    @param filename: path to the gzipped database
+    @type filename: str
+    @param cache_dir: directory of the copy, by default the pygeoip directory
+        in the user's cache directory, $XDG_CACHE_HOME or ~/.cache, so that
+        copies don't pile up next to archived databases
+    @type cache_dir: str
+    @return: path of the decompressed copy
+    @rtype: str
+    """
+    import gzip
+    import hashlib
+    import shutil
+    import tempfile
+
+    digest = hashlib.sha1()
+    with open(filename, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), six.b('')):
+            digest.update(chunk)
+
+    if cache_dir is None:
+        cache_dir = os.path.join(os.environ.get('XDG_CACHE_HOME') or
+                                 os.path.expanduser(os.path.join('~', '.cache')),
+                                 'pygeoip')
+        if not os.path.isdir(cache_dir):
+            try:
+                os.makedirs(cache_dir, 0o700)
+            except OSError:
+                # created by a concurrent process, or not writable, which
+                # mkstemp will report
+                pass
+    name = os.path.basename(filename)[:-len('.gz')]
+    path = os.path.join(cache_dir, '%s.%s' % (name, digest.hexdigest()))
+
+    if os.path.exists(path):
+        return path
+
+    fd, tmp_path = tempfile.mkstemp(prefix=name + '.', dir=cache_dir)
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            with gzip.open(filename, 'rb') as f:
+                shutil.copyfileobj(f, out, 1 << 20)
+        os.rename(tmp_path, path)
+    except:
+        exc_info = sys.exc_info()
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        six.reraise(*exc_info)
+
+    return path
+
 class GeoIPMetaclass(type):
 
     def __new__(cls, *args, **kwargs):
@@ -77,28 +199,107 @@ GeoIPBase = GeoIPMetaclass('GeoIPBase', (object,), {})
 
 class GeoIP(GeoIPBase):
 
-    def __init__(self, filename, flags=0):
+    def __init__(self, filename, flags=0, cache_size=0, org_cache_size=0,
+                 gzip_cache_dir=None):
         """
         Initialize the class.
 
-        @param filename: path to a geoip database. If MEMORY_CACHE is used,
-            the file can be gzipped.
+        @param filename: path to a geoip database, which can be gzipped.
+            Unless MEMORY_CACHE is used, a gzipped database is decompressed
+            once into a file named after the hash of its contents in
+            gzip_cache_dir, which is then accessed like an uncompressed
+            database by this and later processes.
         @type filename: str
         @param flags: flags that affect how the database is processed.
             Currently the only supported flags are STANDARD (the default),
             MEMORY_CACHE (preload the whole file into memory), and
-            MMAP_CACHE (access the file via mmap).
+            MMAP_CACHE (access the file via mmap). INDEX_CACHE may be
+            combined with any of them to decode the search tree into memory
+            once, so that lookups no longer touch the file for tree nodes.
+            RANGE_CACHE flattens a Country database into a sorted table of
+            address ranges, which is persisted next to the database as
+            filename + '.ranges' and loaded from there by later runs.
+            Snapshots written by L{snapshot.compile_snapshot} are detected
+            automatically and always accessed via mmap, whatever the flags.
         @type flags: int
+        @param cache_size: if positive, remember the results of up to this
+            many country_code_by_addr, org_by_addr, record_by_addr, and
+            region_by_addr lookups, keyed by the integer address. Cached
+            records are shared between callers and must not be modified.
+        @type cache_size: int
+        @param org_cache_size: maximum number of decoded Org/ISP/ASN database
+            records to keep by record offset, so that each distinct record is
+            decoded once and its name is shared by all lookups, which saves
+            memory where many results are kept; 0, the default, disables this
+            cache, as it doesn't make lookups faster
+        @type org_cache_size: int
+        @param gzip_cache_dir: directory for decompressed copies of gzipped
+            databases, by default the pygeoip directory in the user's cache
+            directory; if it is not writable, the database is decompressed
+            into memory instead
+        @type gzip_cache_dir: str
         """
         self._filename = filename
         self._flags = flags
 
+        if cache_size > 0:
+            self._cache = LRUCache(cache_size)
+        else:
+            self._cache = None
+
+        # org names of database records by record offset, so that repeated
+        # records share the same objects
+        if org_cache_size > 0:
+            self._org_cache = LRUCache(org_cache_size)
+        else:
+            self._org_cache = None
+
+        # (AS number, name) tuples of ASN database records by record offset;
+        # ASN databases have few distinct records, so all of them are kept
+        # and repeated ASNs share the same tuple and name objects
+        self._asn_table = {}
+
+        # buffer that tree nodes and records are decoded from in place, if
+        # the database is accessed via mmap or loaded into memory
+        self._buffer = None
+
+        # left and right records of all tree nodes, with INDEX_CACHE
+        self._left = None
+        self._right = None
+
+        # sorted start addresses of all ranges and their records minus the
+        # database segments, with RANGE_CACHE and in snapshots
+        self._range_starts = None
+        self._range_records = None
+
+        # serializes seek() and read() on the file handle in STANDARD mode on
+        # platforms without os.pread; the file position is also shared with
+        # forked processes, so those reopen the file first (see _read)
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+        if filename.endswith('.gz') and not self._flags & const.MEMORY_CACHE:
+            try:
+                filename = _decompress_cached(filename, gzip_cache_dir)
+                self._filename = filename
+            except (IOError, OSError):
+                self._flags = (self._flags | const.MEMORY_CACHE) & ~const.MMAP_CACHE
+
+        with open(filename, 'rb') as f:
+            magic = f.read(len(SNAPSHOT_MAGIC))
+
+        if magic == SNAPSHOT_MAGIC:
+            self._setup_snapshot()
+            return
+
         if self._flags & const.MMAP_CACHE:
             with open(filename, 'rb') as f:
                 self._filehandle = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                self._buffer = self._filehandle
 
         elif self._flags & const.MEMORY_CACHE:
             if filename.endswith('.gz'):
+                import gzip
                 opener = gzip.open
             else:
                 opener = open
@@ -106,11 +307,18 @@ class GeoIP(GeoIPBase):
             with opener(filename, 'rb') as f:
                 self._memoryBuffer = f.read()
                 self._filehandle = StringIO(self._memoryBuffer)
+                self._buffer = self._memoryBuffer
         else:
             self._filehandle = codecs.open(filename, 'rb','latin_1')
 
         self._setup_segments()
 
+        if self._flags & const.INDEX_CACHE:
+            self._setup_index()
+
+        if self._flags & const.RANGE_CACHE:
+            self._setup_ranges()
+
     def _setup_segments(self):
         """
         Parses the database file to determine what kind of database is being used and setup
@@ -125,7 +333,7 @@ class GeoIP(GeoIPBase):
         for i in range(const.STRUCTURE_INFO_MAX_SIZE):
             delim = self._filehandle.read(3)
 
-            if delim == six.u(chr(255) * 3):
+            if [ord(c) for c in delim] == [255, 255, 255]:
                 self._databaseType = ord(self._filehandle.read(1))
 
                 if (self._databaseType >= 106):
@@ -142,7 +350,8 @@ class GeoIP(GeoIPBase):
                                             const.CITY_EDITION_REV1,
                                             const.ORG_EDITION,
                                             const.ISP_EDITION,
-                                            const.ASNUM_EDITION):
+                                            const.ASNUM_EDITION,
+                                            const.ASNUM_EDITION_V6):
                     self._databaseSegments = 0
                     buf = self._filehandle.read(const.SEGMENT_RECORD_LENGTH)
 
@@ -156,11 +365,265 @@ class GeoIP(GeoIPBase):
             else:
                 self._filehandle.seek(-4, os.SEEK_CUR)
 
-        if self._databaseType == const.COUNTRY_EDITION:
+        if self._databaseType in (const.COUNTRY_EDITION, const.COUNTRY_EDITION_V6):
             self._databaseSegments = const.COUNTRY_BEGIN
 
+        if self._databaseType in const.IPV6_EDITIONS:
+            self._addressBits = 128
+        else:
+            self._addressBits = 32
+
+        # records of Org, ISP, and City databases follow the search tree
+        self._recordBase = 2 * self._recordLength * self._databaseSegments
+
+        if self._recordLength == 3:
+            self._nodeStruct = struct.Struct('<HBHB')
+        else:
+            self._nodeStruct = struct.Struct('<II')
+
         self._filehandle.seek(filepos, os.SEEK_SET)
 
+    def _setup_snapshot(self):
+        """
+        Map a snapshot written by L{snapshot.compile_snapshot}. Its columns
+        are used in place as the range table that RANGE_CACHE lookups bisect,
+        so opening it takes constant time and the pages are shared with other
+        processes mapping the same file.
+        """
+        with open(self._filename, 'rb') as f:
+            self._filehandle = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._buffer = self._filehandle
+
+        try:
+            (magic, version, self._databaseType, self._recordLength,
+             self._databaseSegments, count, self._recordBase) = \
+                SNAPSHOT_HEADER.unpack_from(self._buffer, 0)
+        except struct.error:
+            raise GeoIPError('Truncated snapshot: %s' % self._filename)
+
+        if version != SNAPSHOT_VERSION:
+            raise GeoIPError('Unsupported snapshot version %d: %s'
+                             % (version, self._filename))
+
+        self._flags = (self._flags | const.MMAP_CACHE | const.RANGE_CACHE) & \
+            ~(const.MEMORY_CACHE | const.INDEX_CACHE)
+        self._addressBits = 32
+        self._range_starts = MappedArray(self._buffer, SNAPSHOT_HEADER.size, count)
+        self._range_bisect = self._range_starts.bisect_right
+        self._range_records = MappedArray(self._buffer, SNAPSHOT_HEADER.size + 4 * count,
+                                          count)
+
+    def _setup_index(self):
+        """
+        Decode the whole search tree into two arrays holding the left and
+        right record of every node, which is what _seek_country walks when
+        INDEX_CACHE is set.
+        """
+        node_length = 2 * self._recordLength
+
+        if self._flags & const.MEMORY_CACHE:
+            tree = self._memoryBuffer
+        elif self._flags & const.MMAP_CACHE:
+            tree = self._filehandle
+        else:
+            with open(self._filename, 'rb') as f:
+                tree = f.read()
+
+        # Country and region databases don't store the number of nodes, only
+        # the first record value denoting a leaf; the tree then fills the file.
+        nodes = min(self._databaseSegments, len(tree) // node_length)
+        tree = tree[:nodes * node_length]
+
+        if self._recordLength == 3:
+            # pad each 3-byte record to 4 bytes, so that array can decode it
+            padded = bytearray(nodes * 2 * 4)
+            for j in range(3):
+                padded[j::4] = tree[j::3]
+            tree = bytes(padded)
+
+        records = array('I', tree)
+        if sys.byteorder == 'big':
+            records.byteswap()
+
+        self._left = records[0::2]
+        self._right = records[1::2]
+
+    def _iter_ranges(self):
+        """
+        Traverse the search tree in address order, or the range table where
+        there is one, as snapshots have no search tree.
+
+        @return: generator of (start address, record) tuples, one per leaf
+            of the tree or range of the table, where record is what
+            _seek_country would return for any address from start up to the
+            next start
+        @rtype: generator
+        """
+        if self._range_starts is not None:
+            for i in range(len(self._range_starts)):
+                yield (self._range_starts[i],
+                       self._range_records[i] + self._databaseSegments)
+            return
+
+        stack = [(0, 0, self._addressBits)]
+
+        while stack:
+            offset, start, bits = stack.pop()
+
+            if offset >= self._databaseSegments:
+                yield start, offset
+                continue
+
+            if bits == 0:
+                raise Exception('Error traversing database - perhaps it is corrupt?')
+
+            x = self._read_node(offset)
+            bits -= 1
+            stack.append((x[1], start + (1 << bits), bits))
+            stack.append((x[0], start, bits))
+
+    def _setup_ranges(self):
+        """
+        Load the range table of a Country database from its sidecar file, or
+        build it by traversing the search tree and try to save it there.
+
+        The table consists of the sorted start addresses of all ranges and the
+        country ids assigned to them; every range ends where the next begins.
+        Like the records of a snapshot, a country id is what _seek_country
+        returns minus the database segments.
+
+        Unlike a snapshot, the table is read into arrays rather than mapped
+        as L{util.MappedArray}s: reading it takes well under a millisecond,
+        while bisecting mapped values in Python makes every lookup about half
+        again as slow, and fast lookups are what RANGE_CACHE is for.
+        """
+        if self._databaseType != const.COUNTRY_EDITION:
+            raise GeoIPError('Invalid database type; RANGE_CACHE expects '\
+                             'Country database')
+
+        path = self._filename + '.ranges'
+        stat = os.stat(self._filename)
+
+        try:
+            with open(path, 'rb') as f:
+                header = f.read(RANGES_HEADER.size)
+                magic, version, size, mtime, count = RANGES_HEADER.unpack(header)
+                if (magic, version, size, mtime) != (RANGES_MAGIC, RANGES_VERSION,
+                                                     stat.st_size, stat.st_mtime):
+                    raise ValueError('Stale range table: %s' % path)
+
+                starts = array('I')
+                country_ids = array('B')
+                starts.fromfile(f, count)
+                country_ids.fromfile(f, count)
+                if sys.byteorder == 'big':
+                    starts.byteswap()
+
+        except (IOError, EOFError, ValueError, struct.error):
+            starts = array('I')
+            country_ids = array('B')
+            for start, seek in self._iter_ranges():
+                country_id = seek - const.COUNTRY_BEGIN
+                if not country_ids or country_ids[-1] != country_id:
+                    starts.append(start)
+                    country_ids.append(country_id)
+
+            try:
+                with open(path, 'wb') as f:
+                    f.write(RANGES_HEADER.pack(RANGES_MAGIC, RANGES_VERSION,
+                                               stat.st_size, stat.st_mtime, len(starts)))
+                    if sys.byteorder == 'big':
+                        starts.byteswap()
+                        starts.tofile(f)
+                        starts.byteswap()
+                    else:
+                        starts.tofile(f)
+                    country_ids.tofile(f)
+            except (IOError, OSError):
+                # the table is only a cache, so a read-only directory is fine
+                pass
+
+        self._range_starts = starts
+        self._range_bisect = functools.partial(bisect.bisect_right, starts)
+        self._range_records = country_ids
+
+    def _cached(self, func, ipnum):
+        """
+        Return func(ipnum), using the lookup cache if there is one.
+
+        @param func: lookup method taking a converted IP address
+        @type func: callable
+        @param ipnum: converted IP address
+        @type ipnum: int
+        @return: result of func
+        """
+        if self._cache is None:
+            return func(ipnum)
+
+        key = (func.__name__, ipnum)
+        value = self._cache.get(key, _missing)
+        if value is _missing:
+            value = func(ipnum)
+            self._cache.put(key, value)
+
+        return value
+
+    def org_cache_info(self):
+        """
+        Return statistics of the cache of decoded Org/ISP/ASN records.
+
+        @return: dict with hits, misses, evictions, size, and maxsize, or
+            None if the org cache is disabled
+        @rtype: dict
+        """
+        if self._org_cache is None:
+            return None
+
+        return self._org_cache.info()
+
+    def _cached_many(self, func, batch_func, ipnums):
+        """
+        Batch version of L{_cached}, which looks up all results that are not
+        cached with a single call of batch_func.
+
+        @param func: lookup method taking a converted IP address, whose name
+            is used in the cache keys
+        @type func: callable
+        @param batch_func: batch version of func
+        @type batch_func: callable
+        @param ipnums: converted IP addresses
+        @type ipnums: list
+        @return: results of func, in the order of ipnums
+        @rtype: list
+        """
+        if self._cache is None:
+            return batch_func(ipnums)
+
+        name = func.__name__
+        results = [self._cache.get((name, ipnum), _missing) for ipnum in ipnums]
+        misses = [i for i, value in enumerate(results) if value is _missing]
+
+        if misses:
+            values = batch_func([ipnums[i] for i in misses])
+            for i, value in zip(misses, values):
+                results[i] = value
+                self._cache.put((name, ipnums[i]), value)
+
+        return results
+
+    def cache_info(self):
+        """
+        Return lookup cache statistics.
+
+        @return: dict with hits, misses, evictions, size, and maxsize, or
+            None if the lookup cache is disabled
+        @rtype: dict
+        """
+        if self._cache is None:
+            return None
+
+        return self._cache.info()
+
     def _lookup_country_id(self, addr):
         """
         Get the country index.
@@ -170,17 +633,14 @@ class GeoIP(GeoIPBase):
         for the code and name.
 
         @param addr: The IP address
-        @type addr: str
+        @type addr: str or int
         @return: network byte order 32-bit integer
         @rtype: int
         """
 
-        ipnum = ip2long(addr)
-
-        if not ipnum:
-            raise ValueError("Invalid IP address: %s" % addr)
+        ipnum = self._ipnum(addr)
 
-        if self._databaseType != const.COUNTRY_EDITION:
+        if self._databaseType not in (const.COUNTRY_EDITION, const.COUNTRY_EDITION_V6):
             raise GeoIPError('Invalid database type; country_* methods expect '\
                              'Country database')
 
@@ -196,24 +656,32 @@ class GeoIP(GeoIPBase):
         @return: offset of start of record
         @rtype: int
         """
-        offset = 0
+        if self._flags & const.RANGE_CACHE:
+            i = self._range_bisect(ipnum) - 1
+            return self._range_records[i] + self._databaseSegments
+
+        if self._flags & const.INDEX_CACHE:
+            left = self._left
+            right = self._right
+            segments = self._databaseSegments
+            offset = 0
+
+            for depth in range(self._addressBits - 1, -1, -1):
+                if ipnum & (1 << depth):
+                    offset = right[offset]
+                else:
+                    offset = left[offset]
 
-        for depth in range(31, -1, -1):
+                if offset >= segments:
+                    return offset
 
-            if self._flags & const.MEMORY_CACHE:
-                startIndex = 2 * self._recordLength * offset
-                length = 2 * self._recordLength
-                endIndex = startIndex + length
-                buf = self._memoryBuffer[startIndex:endIndex]
-            else:
-                self._filehandle.seek(2 * self._recordLength * offset, os.SEEK_SET)
-                buf = self._filehandle.read(2 * self._recordLength)
+            raise Exception('Error traversing database - perhaps it is corrupt?')
+
+        offset = 0
 
-            x = [0,0]
+        for depth in range(self._addressBits - 1, -1, -1):
 
-            for i in range(2):
-                for j in range(self._recordLength):
-                    x[i] += ord(buf[self._recordLength * i + j]) << (j * 8)
+            x = self._read_node(offset)
 
             if ipnum & (1 << depth):
 
@@ -232,6 +700,196 @@ class GeoIP(GeoIPBase):
 
         raise Exception('Error traversing database - perhaps it is corrupt?')
 
+    def _seek_countries(self, ipnums, order=None):
+        """
+        Batch version of L{_seek_country}. The addresses are walked in sorted
+        order, so that each lookup resumes from the deepest tree node it shares
+        with the previous address instead of starting over at the root.
+
+        @param ipnums: results of ip2long conversion
+        @type ipnums: list
+        @param order: indices of C{ipnums} in ascending order of address, if
+            already known
+        @type order: list
+        @return: offsets of start of records, in the order of C{ipnums}
+        @rtype: list
+        """
+        if self._flags & const.RANGE_CACHE:
+            return [self._seek_country(ipnum) for ipnum in ipnums]
+
+        results = [None] * len(ipnums)
+        if order is None:
+            order = sorted(range(len(ipnums)), key=ipnums.__getitem__)
+
+        # path[level] is the node at that level for the previous address,
+        # as its offset with INDEX_CACHE and decoded otherwise; end is the
+        # level at which the previous walk hit a leaf.
+        index = self._left is not None
+        left = self._left
+        right = self._right
+        bits = self._addressBits
+        path = [None] * bits
+        prev_ipnum = None
+        prev_result = None
+        end = -1
+
+        for i in order:
+            ipnum = ipnums[i]
+
+            if prev_ipnum is None:
+                level = 0
+            else:
+                level = bits - (ipnum ^ prev_ipnum).bit_length()
+                if level > end:
+                    # every branch taken so far is shared; same leaf
+                    results[i] = prev_result
+                    prev_ipnum = ipnum
+                    continue
+
+            if level == 0:
+                path[0] = 0 if index else self._read_node(0)
+
+            while True:
+                x = path[level]
+                if ipnum & (1 << (bits - 1 - level)):
+                    offset = right[x] if index else x[1]
+                else:
+                    offset = left[x] if index else x[0]
+
+                if offset >= self._databaseSegments:
+                    break
+
+                level += 1
+                if level == bits:
+                    raise Exception('Error traversing database - perhaps it is corrupt?')
+                path[level] = offset if index else self._read_node(offset)
+
+            results[i] = prev_result = offset
+            prev_ipnum = ipnum
+            end = level
+
+        return results
+
+    def _read_node(self, offset):
+        """
+        Read and decode the pair of records of the tree node at offset.
+
+        @param offset: index of the node in the search tree
+        @type offset: int
+        @return: left and right record
+        @rtype: sequence
+        """
+        if self._flags & const.INDEX_CACHE:
+            return (self._left[offset], self._right[offset])
+
+        if self._buffer is not None:
+            x = self._nodeStruct.unpack_from(self._buffer, 2 * self._recordLength * offset)
+            if self._recordLength == 3:
+                return (x[0] | x[1] << 16, x[2] | x[3] << 16)
+            return x
+
+        buf = self._read(2 * self._recordLength * offset, 2 * self._recordLength)
+
+        x = [0,0]
+
+        for i in range(2):
+            for j in range(self._recordLength):
+                x[i] += ord(buf[self._recordLength * i + j]) << (j * 8)
+
+        return x
+
+    def _read(self, offset, length):
+        """
+        Read from the database at an absolute offset, without moving a file
+        position shared with other threads.
+
+        @param offset: offset in the database file
+        @type offset: int
+        @param length: number of bytes to read
+        @type length: int
+        @return: data read, decoded as latin_1 in STANDARD mode
+        @rtype: str
+        """
+        if self._buffer is not None:
+            return self._buffer[offset:offset + length]
+
+        if hasattr(os, 'pread'):
+            return os.pread(self._filehandle.fileno(), length, offset).decode('latin_1')
+
+        with self._lock:
+            if self._pid != os.getpid():
+                self._filehandle = codecs.open(self._filename, 'rb', 'latin_1')
+                self._pid = os.getpid()
+
+            self._filehandle.seek(offset, os.SEEK_SET)
+            return self._filehandle.read(length)
+
+    def _ipnum(self, addr):
+        """
+        Convert an address for lookups in this database.
+
+        @param addr: IP address, or the integer it converts to, e.g. as
+            returned by L{util.ip2long}
+        @type addr: str or int
+        @return: network byte order 32-bit (IPv4) or 128-bit (IPv6) integer
+        @rtype: int
+        """
+        if isinstance(addr, six.string_types):
+            if (':' in addr) != (self._addressBits == 128):
+                raise GeoIPError('Invalid database type; expected IPv%d address (Address: %s)'
+                                 % (6 if self._addressBits == 128 else 4, addr))
+            ipnum = ip2long(addr)
+        else:
+            ipnum = int(addr)
+
+        if not 0 < ipnum < (1 << self._addressBits):
+            raise ValueError("Invalid IP address: %s" % addr)
+
+        return ipnum
+
+    def _ipnums(self, addrs):
+        """
+        Convert a batch of addresses for the *_by_addrs methods.
+
+        @param addrs: IP addresses, either as strings or as integers (e.g. a
+            NumPy uint32 array)
+        @type addrs: iterable
+        @return: network byte order 32-bit (IPv4) or 128-bit (IPv6) integers
+        @rtype: list
+        """
+        ipnums = []
+        for addr in addrs:
+            try:
+                ipnums.append(self._ipnum(addr))
+            except ValueError:
+                raise GeoIPError('*_by_addrs methods only accept IP addresses. (Address: %s)' % addr)
+
+        return ipnums
+
+    def _get_country_code(self, ipnum):
+        """
+        Seek and return the 2-letter country code for converted IP addr in a
+        Country database.
+
+        @param ipnum: converted IP address
+        @type ipnum: int
+        @return: 2-letter country code
+        @rtype: str
+        """
+        return const.COUNTRY_CODES[self._seek_country(ipnum) - const.COUNTRY_BEGIN]
+
+    def _get_country_codes(self, ipnums):
+        """
+        Batch version of L{_get_country_code}.
+
+        @param ipnums: converted IP addresses
+        @type ipnums: list
+        @return: 2-letter country codes
+        @rtype: list
+        """
+        seeks = self._seek_countries(ipnums)
+        return [const.COUNTRY_CODES[seek - const.COUNTRY_BEGIN] for seek in seeks]
+
     def _get_org(self, ipnum):
         """
         Seek and return organization (or ISP) name for converted IP addr.
@@ -241,15 +899,114 @@ class GeoIP(GeoIPBase):
         @rtype: str
         """
 
-        seek_org = self._seek_country(ipnum)
+        return self._read_org(self._seek_country(ipnum))
+
+    def _get_orgs(self, ipnums):
+        """
+        Batch version of L{_get_org}, which decodes each distinct record only
+        once.
+
+        @param ipnums: converted IP addresses
+        @type ipnums: list
+        @return: org/isp names
+        @rtype: list
+        """
+        orgs = {}
+        results = []
+        for seek_org in self._seek_countries(ipnums):
+            if seek_org not in orgs:
+                orgs[seek_org] = self._read_org(seek_org)
+            results.append(orgs[seek_org])
+
+        return results
+
+    def _get_asn(self, ipnum):
+        """
+        Seek and return AS number and name for converted IP addr.
+
+        @param ipnum: Converted IP address
+        @type ipnum: int
+        @return: (AS number, name) tuple, or None
+        @rtype: tuple
+        """
+        return self._read_asn(self._seek_country(ipnum))
+
+    def _get_asns(self, ipnums):
+        """
+        Batch version of L{_get_asn}, which decodes each distinct record only
+        once.
+
+        @param ipnums: converted IP addresses
+        @type ipnums: list
+        @return: (AS number, name) tuples, or None for each address
+        @rtype: list
+        """
+        asn_table = self._asn_table
+        results = []
+        for seek_org in self._seek_countries(ipnums):
+            asn = asn_table.get(seek_org, _missing)
+            if asn is _missing:
+                asn = self._read_asn(seek_org)
+            results.append(asn)
+
+        return results
+
+    def _read_asn(self, seek_org):
+        """
+        Return AS number and name for the record found by _seek_country, which
+        are decoded only once per record.
+
+        @param seek_org: result of _seek_country
+        @type seek_org: int
+        @return: (AS number, name) tuple, where name may be None, or None if
+            the record does not contain an AS number
+        @rtype: tuple
+        """
+        asn = self._asn_table.get(seek_org, _missing)
+        if asn is _missing:
+            asn = self._asn_table[seek_org] = _parse_asn(self._read_org(seek_org))
+
+        return asn
+
+    def _read_org(self, seek_org):
+        """
+        Return organization (or ISP) name for the record found by _seek_country,
+        using the org cache if there is one.
+        @param seek_org: result of _seek_country
+        @type seek_org: int
+        @return: org/isp name
+        @rtype: str
+        """
         if seek_org == self._databaseSegments:
             return None
 
-        record_pointer = seek_org + (2 * self._recordLength - 1) * self._databaseSegments
+        if self._org_cache is None:
+            return self._decode_org(seek_org)
 
-        self._filehandle.seek(record_pointer, os.SEEK_SET)
+        org = self._org_cache.get(seek_org, _missing)
+        if org is _missing:
+            org = self._decode_org(seek_org)
+            self._org_cache.put(seek_org, org)
 
-        org_buf = self._filehandle.read(const.MAX_ORG_RECORD_LENGTH)
+        return org
+
+    def _decode_org(self, seek_org):
+        """
+        Read and decode organization (or ISP) name for the record found by
+        _seek_country.
+        @param seek_org: result of _seek_country
+        @type seek_org: int
+        @return: org/isp name
+        @rtype: str
+        """
+        record_pointer = self._recordBase + seek_org - self._databaseSegments
+
+        if self._buffer is not None:
+            end = self._buffer.find(six.b(chr(0)), record_pointer,
+                                    record_pointer + const.MAX_ORG_RECORD_LENGTH)
+            return self._buffer[record_pointer:end]
+
+        org_buf = self._read(record_pointer, const.MAX_ORG_RECORD_LENGTH)
 
         return org_buf[:org_buf.index(chr(0))]
 
@@ -265,8 +1022,29 @@ class GeoIP(GeoIPBase):
         country_code = ''
         region = ''
 
+        if self._databaseType in (const.REGION_EDITION_REV0, const.REGION_EDITION_REV1):
+            return self._read_region(self._seek_country(ipnum))
+
+        elif self._databaseType in (const.CITY_EDITION_REV0, const.CITY_EDITION_REV1):
+            rec = self._get_record(ipnum)
+            country_code = rec['country_code'] if 'country_code' in rec else ''
+            region = rec['region_name'] if 'region_name' in rec else ''
+
+        return {'country_code' : country_code, 'region_name' : region }
+
+    def _read_region(self, seek_country):
+        """
+        Return the region info found by _seek_country in a Region database.
+
+        @param seek_country: result of _seek_country
+        @type seek_country: int
+        @return: dict containing country_code and region_name
+        @rtype: dict
+        """
+        country_code = ''
+        region = ''
+
         if self._databaseType == const.REGION_EDITION_REV0:
-            seek_country = self._seek_country(ipnum)
             seek_region = seek_country - const.STATE_BEGIN_REV0
             if seek_region >= 1000:
                 country_code = 'US'
@@ -275,7 +1053,6 @@ class GeoIP(GeoIPBase):
                 country_code = const.COUNTRY_CODES[seek_region]
                 region = ''
         elif self._databaseType == const.REGION_EDITION_REV1:
-            seek_country = self._seek_country(ipnum)
             seek_region = seek_country - const.STATE_BEGIN_REV1
             if seek_region < const.US_OFFSET:
                 country_code = '';
@@ -295,141 +1072,58 @@ class GeoIP(GeoIPBase):
                     country_code = ''
                 region = ''
 
-        elif self._databaseType in (const.CITY_EDITION_REV0, const.CITY_EDITION_REV1):
-            rec = self._get_record(ipnum)
-            country_code = rec['country_code'] if 'country_code' in rec else ''
-            region = rec['region_name'] if 'region_name' in rec else ''
-
         return {'country_code' : country_code, 'region_name' : region }
 
     def _get_record(self, ipnum):
         """
-        Populate location dict for converted IP.
+        Return the location record for converted IP.
 
         @param ipnum: converted IP address
         @type ipnum: int
-        @return: dict with country_code, country_code3, country_name,
+        @return: record with country_code, country_code3, country_name,
             region, city, postal_code, latitude, longitude,
-            dma_code, metro_code, area_code, region_name, time_zone
-        @rtype: dict
+            dma_code, metro_code, area_code, region_name, time_zone,
+            which are decoded when first accessed
+        @rtype: L{GeoIPRecord}
         """
-        seek_country = self._seek_country(ipnum)
-        if seek_country == self._databaseSegments:
-            return None
-
-        record_pointer = seek_country + (2 * self._recordLength - 1) * self._databaseSegments
-
-        self._filehandle.seek(record_pointer, os.SEEK_SET)
-        record_buf = self._filehandle.read(const.FULL_RECORD_LENGTH)
-
-        record = {}
-
-        record_buf_pos = 0
-        char = ord(record_buf[record_buf_pos])
-        #char = record_buf[record_buf_pos] if six.PY3 else ord(record_buf[record_buf_pos])
-        record['country_code'] = const.COUNTRY_CODES[char]
-        record['country_code3'] = const.COUNTRY_CODES3[char]
-        record['country_name'] = const.COUNTRY_NAMES[char]
-        record_buf_pos += 1
-        str_length = 0
-
-        # get region
-        char = ord(record_buf[record_buf_pos+str_length])
-        while (char != 0):
-            str_length += 1
-            char = ord(record_buf[record_buf_pos+str_length])
-
-        if str_length > 0:
-            record['region_name'] = record_buf[record_buf_pos:record_buf_pos+str_length]
-
-        record_buf_pos += str_length + 1
-        str_length = 0
-
-        # get city
-        char = ord(record_buf[record_buf_pos+str_length])
-        while (char != 0):
-            str_length += 1
-            char = ord(record_buf[record_buf_pos+str_length])
-
-        if str_length > 0:
-            record['city'] = record_buf[record_buf_pos:record_buf_pos+str_length]
-        else:
-            record['city'] = ''
-
-        record_buf_pos += str_length + 1
-        str_length = 0
-
-        # get the postal code
-        char = ord(record_buf[record_buf_pos+str_length])
-        while (char != 0):
-            str_length += 1
-            char = ord(record_buf[record_buf_pos+str_length])
-
-        if str_length > 0:
-            record['postal_code'] = record_buf[record_buf_pos:record_buf_pos+str_length]
-        else:
-            record['postal_code'] = None
-
-        record_buf_pos += str_length + 1
-        str_length = 0
-
-        latitude = 0
-        longitude = 0
-        for j in range(3):
-            char = ord(record_buf[record_buf_pos])
-            record_buf_pos += 1
-            latitude += (char << (j * 8))
-
-        record['latitude'] = (latitude/10000.0) - 180.0
-
-        for j in range(3):
-            char = ord(record_buf[record_buf_pos])
-            record_buf_pos += 1
-            longitude += (char << (j * 8))
+        return self._read_record(self._seek_country(ipnum))
 
-        record['longitude'] = (longitude/10000.0) - 180.0
+    def _read_record(self, seek_country):
+        """
+        Return the location record found by _seek_country.
 
-        if self._databaseType == const.CITY_EDITION_REV1:
-            dmaarea_combo = 0
-            if record['country_code'] == 'US':
-                for j in range(3):
-                    char = ord(record_buf[record_buf_pos])
-                    record_buf_pos += 1
-                    dmaarea_combo += (char << (j*8))
+        @param seek_country: result of _seek_country
+        @type seek_country: int
+        @return: record, or None if there is none
+        @rtype: L{GeoIPRecord}
+        """
+        if seek_country == self._databaseSegments:
+            return None
 
-                record['dma_code'] = int(math.floor(dmaarea_combo/1000))
-                record['area_code'] = dmaarea_combo%1000
-        else:
-            record['dma_code'] = 0
-            record['area_code'] = 0
+        record_pointer = self._recordBase + seek_country - self._databaseSegments
 
-        if 'dma_code' in record and record['dma_code'] in const.DMA_MAP:
-            record['metro_code'] = const.DMA_MAP[record['dma_code']]
-        else:
-            record['metro_code'] = ''
+        if self._buffer is not None:
+            return GeoIPRecord(self._buffer, record_pointer, self._databaseType)
 
-        if 'country_code' in record:
-            record['time_zone'] = time_zone_by_country_and_region(
-                record['country_code'], record.get('region_name')) or ''
-        else:
-            record['time_zone'] = ''
+        record_buf = self._read(record_pointer, const.FULL_RECORD_LENGTH)
 
-        return record
+        return GeoIPRecord(record_buf, 0, self._databaseType)
 
     def country_code_by_addr(self, addr):
         """
         Returns 2-letter country code (e.g. 'US') for specified IP address.
         Use this method if you have a Country, Region, or City database.
 
-        @param addr: IP address
-        @type addr: str
+        @param addr: IP address, or the integer it converts to
+        @type addr: str or int
         @return: 2-letter country code
         @rtype: str
         """
         try:
-            if self._databaseType == const.COUNTRY_EDITION:
-                country_id = self._lookup_country_id(addr)
-                return const.COUNTRY_CODES[country_id]
+            if self._databaseType in (const.COUNTRY_EDITION, const.COUNTRY_EDITION_V6):
+                ipnum = self._ipnum(addr)
+
+                return self._cached(self._get_country_code, ipnum)
             elif self._databaseType in (const.REGION_EDITION_REV0, const.REGION_EDITION_REV1,
                                           const.CITY_EDITION_REV0, const.CITY_EDITION_REV1):
                 return self.region_by_addr(addr)['country_code']
@@ -440,6 +1134,30 @@ class GeoIP(GeoIPBase):
         except ValueError:
             raise GeoIPError('*_by_addr methods only accept IP addresses. Use *_by_name for hostnames. (Address: %s)' % addr)
 
+    def country_code_by_addrs(self, addrs):
+        """
+        Returns 2-letter country codes for a batch of IP addresses, in the
+        same order. Use this method if you have a Country, Region, or City
+        database.
+
+        With a Country database the addresses are looked up in sorted order,
+        so neighbouring addresses share the walk down the search tree.
+
+        @param addrs: IP addresses, as strings or integers
+        @type addrs: iterable
+        @return: 2-letter country codes
+        @rtype: list
+        """
+        if self._databaseType in (const.COUNTRY_EDITION, const.COUNTRY_EDITION_V6):
+            return self._cached_many(self._get_country_code, self._get_country_codes,
+                                     self._ipnums(addrs))
+        elif self._databaseType in (const.REGION_EDITION_REV0, const.REGION_EDITION_REV1,
+                                      const.CITY_EDITION_REV0, const.CITY_EDITION_REV1):
+            return [self._get_region(ipnum)['country_code'] for ipnum in self._ipnums(addrs)]
+        else:
+            raise GeoIPError('Invalid database type; country_* methods expect '\
+                             'Country, City, or Region database')
+
     def country_code_by_name(self, hostname):
         """
         Returns 2-letter country code (e.g. 'US') for specified hostname.
@@ -459,13 +1177,13 @@ class GeoIP(GeoIPBase):
         Returns full country name for specified IP address.
         Use this method if you have a Country or City database.
 
-        @param addr: IP address
-        @type addr: str
+        @param addr: IP address, or the integer it converts to
+        @type addr: str or int
         @return: country name
         @rtype: str
         """
         try:
-            if self._databaseType == const.COUNTRY_EDITION:
+            if self._databaseType in (const.COUNTRY_EDITION, const.COUNTRY_EDITION_V6):
                 country_id = self._lookup_country_id(addr)
                 return const.COUNTRY_NAMES[country_id]
             elif self._databaseType in (const.CITY_EDITION_REV0, const.CITY_EDITION_REV1):
@@ -494,25 +1212,94 @@ class GeoIP(GeoIPBase):
         Lookup the organization (or ISP) for given IP address.
         Use this method if you have an Organization/ISP database.
 
-        @param addr: IP address
-        @type addr: str
+        @param addr: IP address, or the integer it converts to
+        @type addr: str or int
         @return: organization or ISP name
         @rtype: str
         """
         try:
-            ipnum = ip2long(addr)
+            ipnum = self._ipnum(addr)
 
-            if not ipnum:
-                raise ValueError("Invalid IP address: %s" % addr)
-
-            if self._databaseType not in (const.ORG_EDITION, const.ISP_EDITION, const.ASNUM_EDITION):
+            if self._databaseType not in (const.ORG_EDITION, const.ISP_EDITION,
+                                          const.ASNUM_EDITION, const.ASNUM_EDITION_V6):
                 raise GeoIPError('Invalid database type; org_* methods expect '\
                                  'Org/ISP database')
 
-            return self._get_org(ipnum)
+            return self._cached(self._get_org, ipnum)
+        except ValueError:
+            raise GeoIPError('*_by_addr methods only accept IP addresses. Use *_by_name for hostnames. (Address: %s)' % addr)
+
+    def org_by_addrs(self, addrs):
+        """
+        Lookup the organizations (or ISPs) for a batch of IP addresses, in
+        the same order. Use this method if you have an Organization/ISP
+        database.
+
+        The addresses are looked up in sorted order, and each distinct
+        record is only decoded once per batch.
+
+        @param addrs: IP addresses, as strings or integers
+        @type addrs: iterable
+        @return: organization or ISP names
+        @rtype: list
+        """
+        if self._databaseType not in (const.ORG_EDITION, const.ISP_EDITION,
+                                      const.ASNUM_EDITION, const.ASNUM_EDITION_V6):
+            raise GeoIPError('Invalid database type; org_* methods expect '\
+                             'Org/ISP database')
+
+        return self._cached_many(self._get_org, self._get_orgs, self._ipnums(addrs))
+
+    def asn_by_addr(self, addr, with_name=False):
+        """
+        Lookup the AS number for given IP address.
+        Use this method if you have an ASN database.
+
+        @param addr: IP address, or the integer it converts to
+        @type addr: str or int
+        @param with_name: also return the name of the AS
+        @type with_name: bool
+        @return: AS number, or (AS number, name) tuple if with_name is set,
+            or None if the address is not assigned to an AS
+        @rtype: int
+        """
+        try:
+            ipnum = self._ipnum(addr)
+
+            if self._databaseType not in (const.ASNUM_EDITION, const.ASNUM_EDITION_V6):
+                raise GeoIPError('Invalid database type; asn_* methods expect '\
+                                 'ASN database')
+
+            asn = self._cached(self._get_asn, ipnum)
         except ValueError:
             raise GeoIPError('*_by_addr methods only accept IP addresses. Use *_by_name for hostnames. (Address: %s)' % addr)
 
+        if asn is None or with_name:
+            return asn
+        return asn[0]
+
+    def asn_by_addrs(self, addrs, with_name=False):
+        """
+        Lookup the AS numbers for a batch of IP addresses, in the same order.
+        Use this method if you have an ASN database.
+
+        @param addrs: IP addresses, as strings or integers
+        @type addrs: iterable
+        @param with_name: also return the names of the ASes
+        @type with_name: bool
+        @return: AS numbers, or (AS number, name) tuples if with_name is set,
+            or None for addresses that are not assigned to an AS
+        @rtype: list
+        """
+        if self._databaseType not in (const.ASNUM_EDITION, const.ASNUM_EDITION_V6):
+            raise GeoIPError('Invalid database type; asn_* methods expect '\
+                             'ASN database')
+
+        asns = self._cached_many(self._get_asn, self._get_asns, self._ipnums(addrs))
+        if with_name:
+            return asns
+        return [asn[0] if asn is not None else None for asn in asns]
+
     def org_by_name(self, hostname):
         """
         Lookup the organization (or ISP) for hostname.
@@ -532,23 +1319,21 @@ class GeoIP(GeoIPBase):
         Look up the record for a given IP address.
         Use this method if you have a City database.
 
-        @param addr: IP address
-        @type addr: str
-        @return: dict with country_code, country_code3, country_name,
+        @param addr: IP address, or the integer it converts to
+        @type addr: str or int
+        @return: record with country_code, country_code3, country_name,
             region, city, postal_code, latitude, longitude,
-            dma_code, metro_code, area_code, region_name, time_zone
-        @rtype: dict
+            dma_code, metro_code, area_code, region_name, time_zone,
+            which can be read like a dict and are decoded on first access
+        @rtype: L{GeoIPRecord}
         """
         try:
-            ipnum = ip2long(addr)
-
-            if not ipnum:
-                raise ValueError("Invalid IP address: %s" % addr)
+            ipnum = self._ipnum(addr)
 
             if not self._databaseType in (const.CITY_EDITION_REV0, const.CITY_EDITION_REV1):
                 raise GeoIPError('Invalid database type; record_* methods expect City database')
 
-            return self._get_record(ipnum)
+            return self._cached(self._get_record, ipnum)
         except ValueError:
             raise GeoIPError('*_by_addr methods only accept IP addresses. Use *_by_name for hostnames. (Address: %s)' % addr)
 
@@ -559,10 +1344,11 @@ class GeoIP(GeoIPBase):
 
         @param hostname: host name
         @type hostname: str
-        @return: dict with country_code, country_code3, country_name,
+        @return: record with country_code, country_code3, country_name,
             region, city, postal_code, latitude, longitude,
-            dma_code, metro_code, area_code, region_name, time_zone
-        @rtype: dict
+            dma_code, metro_code, area_code, region_name, time_zone,
+            which can be read like a dict and are decoded on first access
+        @rtype: L{GeoIPRecord}
         """
         addr = socket.gethostbyname(hostname)
 
@@ -573,24 +1359,21 @@ class GeoIP(GeoIPBase):
         Lookup the region for given IP address.
         Use this method if you have a Region database.
 
-        @param addr: IP address
-        @type addr: str
+        @param addr: IP address, or the integer it converts to
+        @type addr: str or int
         @return: dict containing country_code, region,
             and region_name
         @rtype: dict
         """
         try:
-            ipnum = ip2long(addr)
-
-            if not ipnum:
-                raise ValueError("Invalid IP address: %s" % addr)
+            ipnum = self._ipnum(addr)
 
             if not self._databaseType in (const.REGION_EDITION_REV0, const.REGION_EDITION_REV1,
                                           const.CITY_EDITION_REV0, const.CITY_EDITION_REV1):
                 raise GeoIPError('Invalid database type; region_* methods expect '\
                                  'Region or City database')
 
-            return self._get_region(ipnum)
+            return self._cached(self._get_region, ipnum)
         except ValueError:
             raise GeoIPError('*_by_addr methods only accept IP addresses. Use *_by_name for hostnames. (Address: %s)' % addr)
 
@@ -619,17 +1402,14 @@ class GeoIP(GeoIPBase):
         @rtype: str
         """
         try:
-            ipnum = ip2long(addr)
-
-            if not ipnum:
-                raise ValueError("Invalid IP address: %s" % addr)
+            ipnum = self._ipnum(addr)
 
             if not self._databaseType in (const.REGION_EDITION_REV0, const.REGION_EDITION_REV1,
                                           const.CITY_EDITION_REV0, const.CITY_EDITION_REV1):
                 raise GeoIPError('Invalid database type; region_* methods expect '\
                                  'Region or City database')
 
-            return self._get_record(ipnum)['time_zone']
+            return self._cached(self._get_record, ipnum)['time_zone']
         except ValueError:
             raise GeoIPError('*_by_addr methods only accept IP addresses. Use *_by_name for hostnames. (Address: %s)' % addr)
 
@@ -645,3 +1425,119 @@ class GeoIP(GeoIPBase):
         """
         addr = socket.gethostbyname(hostname)
         return self.time_zone_by_addr(addr)
+
+class GeoIPStack(object):
+    """
+    Several databases of the same address family that are looked up
+    together, e.g. a Country and an ASN database. Each address is converted
+    only once, and batches are looked up in sorted order in every database.
+
+    Records are dicts with the fields that the databases provide:
+    country_code (Country, Region, and City databases), region_name (Region
+    databases), record (the L{GeoIPRecord} of City databases), org (Org,
+    ISP, and ASN databases), and asn (the AS number of ASN databases, or
+    None). If several databases provide a field, the first one wins. The
+    lookup caches of the databases are not used.
+    """
+
+    def __init__(self, databases):
+        """
+        @param databases: opened databases, in order of precedence
+        @type databases: list of L{GeoIP}
+        """
+        self.databases = list(databases)
+
+        if not self.databases:
+            raise GeoIPError('GeoIPStack needs at least one database')
+
+        if len(set(gi._addressBits for gi in self.databases)) > 1:
+            raise GeoIPError('Invalid database type; GeoIPStack expects '\
+                             'databases of one address family')
+
+    def _decode(self, gi, seek, record):
+        """
+        Add the fields of one database to record.
+
+        @param gi: database that seek was found in
+        @type gi: L{GeoIP}
+        @param seek: result of gi._seek_country
+        @type seek: int
+        @param record: fields found in preceding databases
+        @type record: dict
+        """
+        fields = {}
+        database_type = gi._databaseType
+
+        if database_type in (const.COUNTRY_EDITION, const.COUNTRY_EDITION_V6):
+            fields['country_code'] = const.COUNTRY_CODES[seek - const.COUNTRY_BEGIN]
+
+        elif database_type in (const.REGION_EDITION_REV0, const.REGION_EDITION_REV1):
+            fields = gi._read_region(seek)
+
+        elif database_type in (const.CITY_EDITION_REV0, const.CITY_EDITION_REV1):
+            fields['record'] = gi._read_record(seek)
+            if fields['record'] is not None:
+                fields['country_code'] = fields['record'].country_code
+
+        elif database_type in (const.ORG_EDITION, const.ISP_EDITION):
+            fields['org'] = gi._read_org(seek)
+
+        elif database_type in (const.ASNUM_EDITION, const.ASNUM_EDITION_V6):
+            fields['org'] = gi._read_org(seek)
+            asn = _parse_asn(fields['org'])
+            fields['asn'] = asn[0] if asn else None
+
+        for key, value in fields.items():
+            record.setdefault(key, value)
+
+    def record_by_addr(self, addr):
+        """
+        Look up an address in all databases.
+
+        @param addr: IP address, or the integer it converts to
+        @type addr: str or int
+        @return: combined record
+        @rtype: dict
+        """
+        try:
+            ipnum = self.databases[0]._ipnum(addr)
+        except ValueError:
+            raise GeoIPError('*_by_addr methods only accept IP addresses. Use *_by_name for hostnames. (Address: %s)' % addr)
+
+        record = {}
+        for gi in self.databases:
+            self._decode(gi, gi._seek_country(ipnum), record)
+
+        return record
+
+    def records_by_addrs(self, addrs):
+        """
+        Look up a batch of addresses in all databases, walking each search
+        tree in sorted address order. The batch is sorted only once.
+
+        @param addrs: IP addresses, as strings or integers
+        @type addrs: iterable
+        @return: combined records, in the order of addrs
+        @rtype: list
+        """
+        ipnums = self.databases[0]._ipnums(addrs)
+        order = sorted(range(len(ipnums)), key=ipnums.__getitem__)
+        records = [{} for ipnum in ipnums]
+
+        for gi in self.databases:
+            for seek, record in zip(gi._seek_countries(ipnums, order), records):
+                self._decode(gi, seek, record)
+
+        return records
+
+    def record_by_name(self, hostname):
+        """
+        Look up a hostname in all databases.
+
+        @param hostname: host name
+        @type hostname: str
+        @return: combined record
+        @rtype: dict
+        """
+        addr = socket.gethostbyname(hostname)
+        return self.record_by_addr(addr)
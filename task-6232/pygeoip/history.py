@@ -0,0 +1,361 @@
+"""
+Date-aware lookups in archived GeoIP databases. It is part of the pygeoip
+package.
+
+A L{GeoIPHistory} holds a series of databases of the same kind, each valid
+from its date until the date of the next one, and answers lookups for an
+address at a given date from the database that was valid then:
+
+C{history = GeoIPHistory.from_directory('/path/to/archive/GeoIPASNum')}
+C{history.asn_by_addr('198.51.100.1', '2013-01-01 00:00:00')}
+
+The database for a date is flattened into a sorted table of address ranges
+on first use. Tables are split into chunks at boundaries that depend only on
+the start address of a range, and equal chunks, as well as equal country
+codes and org names, are stored only once for all databases of the history.
+Consecutive archived databases mostly differ in few ranges, so they share
+most of their decoded structure.
+
+@license:
+Copyright(C) 2004 MaxMind LLC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/lgpl.txt>.
+"""
+
+from __future__ import absolute_import
+import os
+import re
+import bisect
+import threading
+
+from . import const
+from . import GeoIP, GeoIPError, _parse_asn
+
+# dates in archived database names, e.g. GeoIP-20130101.dat.gz or
+# GeoIPASNum-2013-01-01.dat
+DATE_PATTERN = re.compile(r'(\d{4})-?(\d{2})-?(\d{2})')
+
+# a chunk of a range table ends before a start address whose hash is below
+# CHUNK_SPLIT, which happens for about one in 64 ranges, or once it has
+# MAX_CHUNK ranges
+CHUNK_SPLIT = 1 << 26
+MAX_CHUNK = 1024
+
+COUNTRY_EDITIONS = (const.COUNTRY_EDITION, const.COUNTRY_EDITION_V6)
+ORG_EDITIONS = (const.ORG_EDITION, const.ISP_EDITION, const.ASNUM_EDITION,
+                const.ASNUM_EDITION_V6)
+
+def _date_key(date):
+    """
+    Convert a date to the 'YYYYMMDD' string it is compared as.
+
+    @param date: date, datetime, or string starting with 'YYYY-MM-DD' or
+        'YYYYMMDD', e.g. the valid-after time of a consensus
+    @type date: date or str
+    @return: date as 'YYYYMMDD'
+    @rtype: str
+    """
+    if hasattr(date, 'strftime'):
+        return '%04d%02d%02d' % (date.year, date.month, date.day)
+
+    match = DATE_PATTERN.match(str(date).strip())
+    if not match:
+        raise GeoIPError('Invalid date: %s' % date)
+
+    return ''.join(match.groups())
+
+def _split_point(start):
+    return (start * 2654435761) & 0xffffffff < CHUNK_SPLIT
+
+class _RangeTable(object):
+    """
+    Decoded address ranges of one database, as a list of shared chunks of
+    (start addresses, values) tuples and the first start of every chunk.
+    """
+
+    __slots__ = ('gi', 'chunk_starts', 'chunks')
+
+    def __init__(self, gi, chunk_starts, chunks):
+        self.gi = gi
+        self.chunk_starts = chunk_starts
+        self.chunks = chunks
+
+    def lookup(self, ipnum):
+        # the first range of a database always starts at address 0
+        starts, values = self.chunks[bisect.bisect_right(self.chunk_starts, ipnum) - 1]
+        return values[bisect.bisect_right(starts, ipnum) - 1]
+
+class GeoIPHistory(object):
+    """
+    Series of Country or Org/ISP/ASN databases that are looked up by address
+    and date. It is safe to share between threads.
+    """
+
+    def __init__(self, databases, flags=const.MMAP_CACHE):
+        """
+        @param databases: (date, path) tuples, where the database at path is
+            valid from date until the next date; dates are converted like
+            the dates passed to lookups
+        @type databases: iterable
+        @param flags: flags to open the databases with
+        @type flags: int
+        """
+        snapshots = sorted((_date_key(date), filename) for date, filename in databases)
+
+        if not snapshots:
+            raise GeoIPError('GeoIPHistory needs at least one database')
+
+        self._dates = [date for date, filename in snapshots]
+        self._filenames = [filename for date, filename in snapshots]
+        self._flags = flags
+        self._tables = [None] * len(snapshots)
+        self._kind = None
+
+        # chunks and values by themselves, so that equal ones are shared
+        self._chunks = {}
+        self._values = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_directory(cls, directory, flags=const.MMAP_CACHE):
+        """
+        Create a history of all databases in a directory whose file names
+        contain their date, e.g. GeoIP-20130101.dat.gz.
+
+        @param directory: path to the directory
+        @type directory: str
+        @param flags: flags to open the databases with
+        @type flags: int
+        @return: history of the databases
+        @rtype: L{GeoIPHistory}
+        """
+        databases = []
+        for name in os.listdir(directory):
+            match = DATE_PATTERN.search(name)
+            if match and (name.endswith('.dat') or name.endswith('.dat.gz')):
+                databases.append((''.join(match.groups()), os.path.join(directory, name)))
+
+        return cls(databases, flags)
+
+    def dates(self):
+        """
+        @return: dates from which the databases are valid, as 'YYYYMMDD'
+        @rtype: list
+        """
+        return list(self._dates)
+
+    def filename_at(self, date):
+        """
+        Return the path of the database valid at a date. Dates before the
+        first database use the first database.
+
+        @param date: date of the lookup
+        @type date: date or str
+        @return: path of the database
+        @rtype: str
+        """
+        return self._filenames[self._index_at(date)]
+
+    def _index_at(self, date):
+        return max(bisect.bisect_right(self._dates, _date_key(date)) - 1, 0)
+
+    def _table_at(self, date):
+        """
+        Return the range table of the database valid at a date, building it
+        on first use.
+        """
+        i = self._index_at(date)
+        table = self._tables[i]
+        if table is None:
+            with self._lock:
+                if self._tables[i] is None:
+                    self._tables[i] = self._build_table(self._filenames[i])
+                table = self._tables[i]
+
+        return table
+
+    def _build_table(self, filename):
+        gi = GeoIP(filename, self._flags)
+        database_type = gi._databaseType
+
+        if database_type in COUNTRY_EDITIONS:
+            kind = 'country'
+            decode = lambda seek: const.COUNTRY_CODES[seek - const.COUNTRY_BEGIN]
+        elif database_type in ORG_EDITIONS:
+            kind = 'org'
+            decode = gi._read_org
+        else:
+            raise GeoIPError('Invalid database type; GeoIPHistory expects '\
+                             'Country or Org/ISP/ASN databases (%s)' % filename)
+
+        if self._kind is None:
+            self._kind = kind
+        elif self._kind != kind:
+            raise GeoIPError('Invalid database type; GeoIPHistory expects '\
+                             'databases of one kind (%s)' % filename)
+
+        chunk_starts = []
+        chunks = []
+        starts = []
+        values = []
+
+        def add_chunk():
+            chunk = (tuple(starts), tuple(values))
+            chunks.append(self._chunks.setdefault(chunk, chunk))
+            chunk_starts.append(starts[0])
+
+        decoded = {}
+        for start, seek in gi._iter_ranges():
+            if seek not in decoded:
+                value = decode(seek)
+                decoded[seek] = self._values.setdefault(value, value)
+            value = decoded[seek]
+
+            if values and values[-1] == value:
+                continue
+
+            if starts and (len(starts) == MAX_CHUNK or _split_point(start)):
+                add_chunk()
+                starts = []
+                values = []
+
+            starts.append(start)
+            values.append(value)
+
+        add_chunk()
+
+        return _RangeTable(gi, chunk_starts, chunks)
+
+    def _lookup(self, addr, date, kind):
+        table = self._table_at(date)
+        if self._kind != kind:
+            raise GeoIPError('Invalid database type; %s_* methods expect '\
+                             '%s databases' % (kind, kind.capitalize()))
+
+        try:
+            return table.lookup(table.gi._ipnum(addr))
+        except ValueError:
+            raise GeoIPError('*_by_addr methods only accept IP addresses. (Address: %s)' % addr)
+
+    def _lookup_many(self, addrs, date, kind):
+        table = self._table_at(date)
+        if self._kind != kind:
+            raise GeoIPError('Invalid database type; %s_* methods expect '\
+                             '%s databases' % (kind, kind.capitalize()))
+
+        return [table.lookup(ipnum) for ipnum in table.gi._ipnums(addrs)]
+
+    def country_code_by_addr(self, addr, date):
+        """
+        Returns 2-letter country code for an IP address at a date.
+
+        @param addr: IP address, or the integer it converts to
+        @type addr: str or int
+        @param date: date of the lookup
+        @type date: date or str
+        @return: 2-letter country code
+        @rtype: str
+        """
+        return self._lookup(addr, date, 'country')
+
+    def country_code_by_addrs(self, addrs, date):
+        """
+        Returns 2-letter country codes for a batch of IP addresses at a date.
+
+        @param addrs: IP addresses, as strings or integers
+        @type addrs: iterable
+        @param date: date of the lookups
+        @type date: date or str
+        @return: 2-letter country codes
+        @rtype: list
+        """
+        return self._lookup_many(addrs, date, 'country')
+
+    def org_by_addr(self, addr, date):
+        """
+        Returns the organization, ISP, or AS name for an IP address at a date.
+
+        @param addr: IP address, or the integer it converts to
+        @type addr: str or int
+        @param date: date of the lookup
+        @type date: date or str
+        @return: organization name, or None
+        @rtype: str
+        """
+        return self._lookup(addr, date, 'org')
+
+    def org_by_addrs(self, addrs, date):
+        """
+        Returns organization names for a batch of IP addresses at a date.
+
+        @param addrs: IP addresses, as strings or integers
+        @type addrs: iterable
+        @param date: date of the lookups
+        @type date: date or str
+        @return: organization names, or None for each address
+        @rtype: list
+        """
+        return self._lookup_many(addrs, date, 'org')
+
+    def asn_by_addr(self, addr, date):
+        """
+        Returns the AS number for an IP address at a date, using ASN
+        databases.
+
+        @param addr: IP address, or the integer it converts to
+        @type addr: str or int
+        @param date: date of the lookup
+        @type date: date or str
+        @return: AS number, or None
+        @rtype: int
+        """
+        asn = _parse_asn(self.org_by_addr(addr, date))
+        return asn[0] if asn else None
+
+    def asn_by_addrs(self, addrs, date):
+        """
+        Returns AS numbers for a batch of IP addresses at a date, using ASN
+        databases.
+
+        @param addrs: IP addresses, as strings or integers
+        @type addrs: iterable
+        @param date: date of the lookups
+        @type date: date or str
+        @return: AS numbers, or None for each address
+        @rtype: list
+        """
+        asns = {}
+        results = []
+        for org in self.org_by_addrs(addrs, date):
+            if org not in asns:
+                asn = _parse_asn(org)
+                asns[org] = asn[0] if asn else None
+            results.append(asns[org])
+
+        return results
+
+    def sharing_info(self):
+        """
+        Return how much decoded structure the loaded databases share.
+
+        @return: dict with the number of databases, loaded databases, chunk
+            references of their tables, distinct chunks, and distinct values
+        @rtype: dict
+        """
+        tables = [table for table in self._tables if table is not None]
+        return {'databases': len(self._tables),
+                'loaded': len(tables),
+                'chunk_references': sum(len(table.chunks) for table in tables),
+                'chunks': len(self._chunks),
+                'values': len(self._values)}
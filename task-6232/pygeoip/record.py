@@ -0,0 +1,235 @@
+"""
+Lazily decoded City database records. It is part of the pygeoip package.
+
+@license:
+Copyright(C) 2004 MaxMind LLC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/lgpl.txt>.
+"""
+
+from __future__ import division
+import math
+
+from . import const
+
+FIELDS = ('country_code', 'country_code3', 'country_name', 'region_name',
+          'city', 'postal_code', 'latitude', 'longitude', 'dma_code',
+          'area_code', 'metro_code', 'time_zone')
+
+def _int24(buf, pos):
+    return ord(buf[pos]) | ord(buf[pos + 1]) << 8 | ord(buf[pos + 2]) << 16
+
+class GeoIPRecord(object):
+    """
+    City database record that decodes its fields from its raw bytes in the
+    database only when they are first accessed.
+
+    Fields can be read as attributes (C{record.city}) or, like the dicts
+    previously returned by record_by_addr, as items (C{record['city']}).
+    As before, region_name is missing from the items if the record has no
+    region, and dma_code and area_code are missing for non-US records in
+    CITY_EDITION_REV1 databases; the attributes are None in these cases.
+    """
+
+    __slots__ = ('_buf', '_databaseType', '_country_id', '_region_name',
+                 '_city', '_postal_code', '_numbers_pos', '_latitude',
+                 '_longitude', '_dma_code', '_area_code', '_time_zone')
+
+    def __init__(self, buf, pos, database_type):
+        """
+        @param buf: buffer containing the record; only the record is copied
+            out of it, so that records don't keep the database alive and
+            pickle small
+        @type buf: str or mmap
+        @param pos: offset of the record in buf
+        @type pos: int
+        @param database_type: CITY_EDITION_REV0 or CITY_EDITION_REV1
+        @type database_type: int
+        """
+        self._buf = buf[pos:pos + const.FULL_RECORD_LENGTH]
+        self._databaseType = database_type
+        self._country_id = ord(self._buf[0])
+        self._numbers_pos = None
+        self._latitude = None
+        self._time_zone = None
+
+    def _decode_strings(self):
+        buf = self._buf
+        pos = 1
+        end = const.FULL_RECORD_LENGTH
+
+        strings = []
+        for i in range(3):
+            nul = buf.find(chr(0), pos, end)
+            strings.append(buf[pos:nul])
+            pos = nul + 1
+
+        self._region_name, self._city, self._postal_code = strings
+        self._numbers_pos = pos
+
+    def _decode_numbers(self):
+        if self._numbers_pos is None:
+            self._decode_strings()
+
+        buf = self._buf
+        pos = self._numbers_pos
+
+        self._latitude = _int24(buf, pos) / 10000.0 - 180.0
+        self._longitude = _int24(buf, pos + 3) / 10000.0 - 180.0
+
+        if self._databaseType == const.CITY_EDITION_REV1:
+            if self.country_code == 'US':
+                dmaarea_combo = _int24(buf, pos + 6)
+                self._dma_code = int(math.floor(dmaarea_combo / 1000))
+                self._area_code = dmaarea_combo % 1000
+            else:
+                self._dma_code = None
+                self._area_code = None
+        else:
+            self._dma_code = 0
+            self._area_code = 0
+
+    @property
+    def country_code(self):
+        return const.COUNTRY_CODES[self._country_id]
+
+    @property
+    def country_code3(self):
+        return const.COUNTRY_CODES3[self._country_id]
+
+    @property
+    def country_name(self):
+        return const.COUNTRY_NAMES[self._country_id]
+
+    @property
+    def region_name(self):
+        if self._numbers_pos is None:
+            self._decode_strings()
+        return self._region_name or None
+
+    @property
+    def city(self):
+        if self._numbers_pos is None:
+            self._decode_strings()
+        return self._city
+
+    @property
+    def postal_code(self):
+        if self._numbers_pos is None:
+            self._decode_strings()
+        return self._postal_code or None
+
+    @property
+    def latitude(self):
+        if self._latitude is None:
+            self._decode_numbers()
+        return self._latitude
+
+    @property
+    def longitude(self):
+        if self._latitude is None:
+            self._decode_numbers()
+        return self._longitude
+
+    @property
+    def dma_code(self):
+        if self._latitude is None:
+            self._decode_numbers()
+        return self._dma_code
+
+    @property
+    def area_code(self):
+        if self._latitude is None:
+            self._decode_numbers()
+        return self._area_code
+
+    @property
+    def metro_code(self):
+        return const.DMA_MAP.get(self.dma_code, '')
+
+    @property
+    def time_zone(self):
+        if self._time_zone is None:
+            # imported here so that programs which never look at time zones
+            # don't pay for loading the table
+            from .timezone import time_zone_by_country_and_region
+            self._time_zone = time_zone_by_country_and_region(
+                self.country_code, self.region_name) or ''
+        return self._time_zone
+
+    def keys(self):
+        keys = list(FIELDS)
+        if self.region_name is None:
+            keys.remove('region_name')
+        if self.dma_code is None:
+            keys.remove('dma_code')
+            keys.remove('area_code')
+        return keys
+
+    def __getitem__(self, key):
+        if key not in FIELDS:
+            raise KeyError(key)
+
+        value = getattr(self, key)
+        if value is None and key in ('region_name', 'dma_code', 'area_code'):
+            raise KeyError(key)
+
+        return value
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def values(self):
+        return [self[key] for key in self.keys()]
+
+    def to_dict(self):
+        """
+        @return: all fields decoded into a dict
+        @rtype: dict
+        """
+        return dict(self.items())
+
+    def __reduce__(self):
+        # __slots__ classes can't be pickled with protocols 0 and 1 otherwise
+        return (GeoIPRecord, (self._buf, 0, self._databaseType))
+
+    def __eq__(self, other):
+        if isinstance(other, GeoIPRecord):
+            other = other.to_dict()
+        return self.to_dict() == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return 'GeoIPRecord(%r)' % self.to_dict()
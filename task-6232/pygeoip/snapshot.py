@@ -0,0 +1,106 @@
+"""
+Compiles legacy GeoIP databases into columnar snapshots. It is part of the
+pygeoip package.
+
+A snapshot holds the address ranges of a database as two columns of
+little-endian uint32 values, the sorted start addresses and the records
+assigned to them, followed by the string and location records of Org, ISP,
+ASN, and City databases. L{GeoIP} recognizes snapshots by their header and
+maps them, so opening one takes constant time and lookups bisect the start
+addresses in place.
+
+Usage - python -m pygeoip.snapshot [options] <database> <snapshot>
+
+@license:
+Copyright(C) 2004 MaxMind LLC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/lgpl.txt>.
+"""
+
+from __future__ import absolute_import
+import sys
+from array import array
+from optparse import OptionParser
+
+from . import const
+from . import GeoIP, GeoIPError, SNAPSHOT_HEADER, SNAPSHOT_MAGIC, SNAPSHOT_VERSION
+
+def compile_snapshot(filename, snapshot_filename):
+    """
+    Write the snapshot of a Country, Region, City, Org, ISP, or ASN database.
+
+    @param filename: path to the database, which may be gzipped
+    @type filename: str
+    @param snapshot_filename: path to write the snapshot to
+    @type snapshot_filename: str
+    @return: number of address ranges in the snapshot
+    @rtype: int
+    """
+    gi = GeoIP(filename, const.MEMORY_CACHE)
+
+    if gi._read(0, len(SNAPSHOT_MAGIC)) == SNAPSHOT_MAGIC:
+        raise GeoIPError('Already a snapshot: %s' % filename)
+
+    if gi._addressBits != 32:
+        raise GeoIPError('Invalid database type; snapshots hold IPv4 '\
+                         'databases only')
+
+    # merge neighbouring leaves with the same record into one range
+    starts = array('I')
+    records = array('I')
+    for start, seek in gi._iter_ranges():
+        record = seek - gi._databaseSegments
+        if not records or records[-1] != record:
+            starts.append(start)
+            records.append(record)
+
+    # Country and Region databases have no records after the tree
+    data = gi._buffer[gi._recordBase:]
+
+    record_base = SNAPSHOT_HEADER.size + 8 * len(starts)
+
+    if sys.byteorder == 'big':
+        starts.byteswap()
+        records.byteswap()
+
+    with open(snapshot_filename, 'wb') as f:
+        f.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION,
+                                     gi._databaseType, gi._recordLength,
+                                     gi._databaseSegments, len(starts),
+                                     record_base))
+        starts.tofile(f)
+        records.tofile(f)
+        f.write(data)
+
+    return len(starts)
+
+def parse_args():
+    usage = "Usage - python -m pygeoip.snapshot [options] <database> <snapshot>"
+    parser = OptionParser(usage)
+
+    parser.add_option("-q", "--quiet", dest="quiet", action="store_true",
+                      default=False, help="Don't print the number of ranges")
+
+    (options, args) = parser.parse_args()
+
+    if len(args) != 2:
+        parser.error("expected a database and a snapshot path")
+
+    return options, args
+
+if __name__ == "__main__":
+    options, (filename, snapshot_filename) = parse_args()
+    count = compile_snapshot(filename, snapshot_filename)
+    if not options.quiet:
+        sys.stdout.write("%s: %d ranges\n" % (snapshot_filename, count))
@@ -1,714 +1,1059 @@
+"""
+Time zones by country code and region code. It is part of the pygeoip
+package.
+
+The table is stored as two string constants, which are loaded with the
+compiled module in one piece instead of being built by one statement per
+entry at import time.  They are only split into a dict on first use.
+"""
+
 __all__ = ['time_zone_by_country_and_region']
 
-_country = {}
-_country["AD"] = "Europe/Andorra"
-_country["AE"] = "Asia/Dubai"
-_country["AF"] = "Asia/Kabul"
-_country["AG"] = "America/Antigua"
-_country["AI"] = "America/Anguilla"
-_country["AL"] = "Europe/Tirane"
-_country["AM"] = "Asia/Yerevan"
-_country["AO"] = "Africa/Luanda"
-_country["AR"] = {}
-_country["AR"]["01"] = "America/Argentina/Buenos_Aires"
-_country["AR"]["02"] = "America/Argentina/Catamarca"
-_country["AR"]["03"] = "America/Argentina/Tucuman"
-_country["AR"]["04"] = "America/Argentina/Rio_Gallegos"
-_country["AR"]["05"] = "America/Argentina/Cordoba"
-_country["AR"]["06"] = "America/Argentina/Tucuman"
-_country["AR"]["07"] = "America/Argentina/Buenos_Aires"
-_country["AR"]["08"] = "America/Argentina/Buenos_Aires"
-_country["AR"]["09"] = "America/Argentina/Tucuman"
-_country["AR"]["10"] = "America/Argentina/Jujuy"
-_country["AR"]["11"] = "America/Argentina/San_Luis"
-_country["AR"]["12"] = "America/Argentina/La_Rioja"
-_country["AR"]["13"] = "America/Argentina/Mendoza"
-_country["AR"]["14"] = "America/Argentina/Buenos_Aires"
-_country["AR"]["15"] = "America/Argentina/San_Luis"
-_country["AR"]["16"] = "America/Argentina/Buenos_Aires"
-_country["AR"]["17"] = "America/Argentina/Salta"
-_country["AR"]["18"] = "America/Argentina/San_Juan"
-_country["AR"]["19"] = "America/Argentina/San_Luis"
-_country["AR"]["20"] = "America/Argentina/Rio_Gallegos"
-_country["AR"]["21"] = "America/Argentina/Buenos_Aires"
-_country["AR"]["22"] = "America/Argentina/Catamarca"
-_country["AR"]["23"] = "America/Argentina/Ushuaia"
-_country["AR"]["24"] = "America/Argentina/Tucuman"
-_country["AS"] = "US/Samoa"
-_country["AT"] = "Europe/Vienna"
-_country["AU"] = {}
-_country["AU"]["01"] = "Australia/Canberra"
-_country["AU"]["02"] = "Australia/NSW"
-_country["AU"]["03"] = "Australia/North"
-_country["AU"]["04"] = "Australia/Queensland"
-_country["AU"]["05"] = "Australia/South"
-_country["AU"]["06"] = "Australia/Tasmania"
-_country["AU"]["07"] = "Australia/Victoria"
-_country["AU"]["08"] = "Australia/West"
-_country["AW"] = "America/Aruba"
-_country["AX"] = "Europe/Mariehamn"
-_country["AZ"] = "Asia/Baku"
-_country["BA"] = "Europe/Sarajevo"
-_country["BB"] = "America/Barbados"
-_country["BD"] = "Asia/Dhaka"
-_country["BE"] = "Europe/Brussels"
-_country["BF"] = "Africa/Ouagadougou"
-_country["BG"] = "Europe/Sofia"
-_country["BH"] = "Asia/Bahrain"
-_country["BI"] = "Africa/Bujumbura"
-_country["BJ"] = "Africa/Porto-Novo"
-_country["BL"] = "America/St_Barthelemy"
-_country["BM"] = "Atlantic/Bermuda"
-_country["BN"] = "Asia/Brunei"
-_country["BO"] = "America/La_Paz"
-_country["BQ"] = "America/Curacao"
-_country["BR"] = {}
-_country["BR"]["01"] = "America/Rio_Branco"
-_country["BR"]["02"] = "America/Maceio"
-_country["BR"]["03"] = "America/Sao_Paulo"
-_country["BR"]["04"] = "America/Manaus"
-_country["BR"]["05"] = "America/Bahia"
-_country["BR"]["06"] = "America/Fortaleza"
-_country["BR"]["07"] = "America/Sao_Paulo"
-_country["BR"]["08"] = "America/Sao_Paulo"
-_country["BR"]["11"] = "America/Campo_Grande"
-_country["BR"]["13"] = "America/Belem"
-_country["BR"]["14"] = "America/Cuiaba"
-_country["BR"]["15"] = "America/Sao_Paulo"
-_country["BR"]["16"] = "America/Belem"
-_country["BR"]["17"] = "America/Recife"
-_country["BR"]["18"] = "America/Sao_Paulo"
-_country["BR"]["20"] = "America/Fortaleza"
-_country["BR"]["21"] = "America/Sao_Paulo"
-_country["BR"]["22"] = "America/Recife"
-_country["BR"]["23"] = "America/Sao_Paulo"
-_country["BR"]["24"] = "America/Porto_Velho"
-_country["BR"]["25"] = "America/Boa_Vista"
-_country["BR"]["26"] = "America/Sao_Paulo"
-_country["BR"]["27"] = "America/Sao_Paulo"
-_country["BR"]["28"] = "America/Maceio"
-_country["BR"]["29"] = "America/Sao_Paulo"
-_country["BR"]["30"] = "America/Recife"
-_country["BR"]["31"] = "America/Araguaina"
-_country["BS"] = "America/Nassau"
-_country["BT"] = "Asia/Thimphu"
-_country["BW"] = "Africa/Gaborone"
-_country["BY"] = "Europe/Minsk"
-_country["BZ"] = "America/Belize"
-_country["CA"] = {}
-_country["CA"]["AB"] = "America/Edmonton"
-_country["CA"]["BC"] = "America/Vancouver"
-_country["CA"]["MB"] = "America/Winnipeg"
-_country["CA"]["NB"] = "America/Halifax"
-_country["CA"]["NL"] = "America/St_Johns"
-_country["CA"]["NS"] = "America/Halifax"
-_country["CA"]["NT"] = "America/Yellowknife"
-_country["CA"]["NU"] = "America/Rankin_Inlet"
-_country["CA"]["ON"] = "America/Rainy_River"
-_country["CA"]["PE"] = "America/Halifax"
-_country["CA"]["QC"] = "America/Montreal"
-_country["CA"]["SK"] = "America/Regina"
-_country["CA"]["YT"] = "America/Whitehorse"
-_country["CC"] = "Indian/Cocos"
-_country["CD"] = {}
-_country["CD"]["02"] = "Africa/Kinshasa"
-_country["CD"]["05"] = "Africa/Lubumbashi"
-_country["CD"]["06"] = "Africa/Kinshasa"
-_country["CD"]["08"] = "Africa/Kinshasa"
-_country["CD"]["10"] = "Africa/Lubumbashi"
-_country["CD"]["11"] = "Africa/Lubumbashi"
-_country["CD"]["12"] = "Africa/Lubumbashi"
-_country["CF"] = "Africa/Bangui"
-_country["CG"] = "Africa/Brazzaville"
-_country["CH"] = "Europe/Zurich"
-_country["CI"] = "Africa/Abidjan"
-_country["CK"] = "Pacific/Rarotonga"
-_country["CL"] = "Chile/Continental"
-_country["CM"] = "Africa/Lagos"
-_country["CN"] = {}
-_country["CN"]["01"] = "Asia/Shanghai"
-_country["CN"]["02"] = "Asia/Shanghai"
-_country["CN"]["03"] = "Asia/Shanghai"
-_country["CN"]["04"] = "Asia/Shanghai"
-_country["CN"]["05"] = "Asia/Harbin"
-_country["CN"]["06"] = "Asia/Chongqing"
-_country["CN"]["07"] = "Asia/Shanghai"
-_country["CN"]["08"] = "Asia/Harbin"
-_country["CN"]["09"] = "Asia/Shanghai"
-_country["CN"]["10"] = "Asia/Shanghai"
-_country["CN"]["11"] = "Asia/Chongqing"
-_country["CN"]["12"] = "Asia/Shanghai"
-_country["CN"]["13"] = "Asia/Urumqi"
-_country["CN"]["14"] = "Asia/Chongqing"
-_country["CN"]["15"] = "Asia/Chongqing"
-_country["CN"]["16"] = "Asia/Chongqing"
-_country["CN"]["18"] = "Asia/Chongqing"
-_country["CN"]["19"] = "Asia/Harbin"
-_country["CN"]["20"] = "Asia/Harbin"
-_country["CN"]["21"] = "Asia/Chongqing"
-_country["CN"]["22"] = "Asia/Harbin"
-_country["CN"]["23"] = "Asia/Shanghai"
-_country["CN"]["24"] = "Asia/Chongqing"
-_country["CN"]["25"] = "Asia/Shanghai"
-_country["CN"]["26"] = "Asia/Chongqing"
-_country["CN"]["28"] = "Asia/Shanghai"
-_country["CN"]["29"] = "Asia/Chongqing"
-_country["CN"]["30"] = "Asia/Chongqing"
-_country["CN"]["31"] = "Asia/Chongqing"
-_country["CN"]["32"] = "Asia/Chongqing"
-_country["CN"]["33"] = "Asia/Chongqing"
-_country["CO"] = "America/Bogota"
-_country["CR"] = "America/Costa_Rica"
-_country["CU"] = "America/Havana"
-_country["CV"] = "Atlantic/Cape_Verde"
-_country["CW"] = "America/Curacao"
-_country["CX"] = "Indian/Christmas"
-_country["CY"] = "Asia/Nicosia"
-_country["CZ"] = "Europe/Prague"
-_country["DE"] = "Europe/Berlin"
-_country["DJ"] = "Africa/Djibouti"
-_country["DK"] = "Europe/Copenhagen"
-_country["DM"] = "America/Dominica"
-_country["DO"] = "America/Santo_Domingo"
-_country["DZ"] = "Africa/Algiers"
-_country["EC"] = {}
-_country["EC"]["01"] = "Pacific/Galapagos"
-_country["EC"]["02"] = "America/Guayaquil"
-_country["EC"]["03"] = "America/Guayaquil"
-_country["EC"]["04"] = "America/Guayaquil"
-_country["EC"]["05"] = "America/Guayaquil"
-_country["EC"]["06"] = "America/Guayaquil"
-_country["EC"]["07"] = "America/Guayaquil"
-_country["EC"]["08"] = "America/Guayaquil"
-_country["EC"]["09"] = "America/Guayaquil"
-_country["EC"]["10"] = "America/Guayaquil"
-_country["EC"]["11"] = "America/Guayaquil"
-_country["EC"]["12"] = "America/Guayaquil"
-_country["EC"]["13"] = "America/Guayaquil"
-_country["EC"]["14"] = "America/Guayaquil"
-_country["EC"]["15"] = "America/Guayaquil"
-_country["EC"]["17"] = "America/Guayaquil"
-_country["EC"]["18"] = "America/Guayaquil"
-_country["EC"]["19"] = "America/Guayaquil"
-_country["EC"]["20"] = "America/Guayaquil"
-_country["EC"]["22"] = "America/Guayaquil"
-_country["EE"] = "Europe/Tallinn"
-_country["EG"] = "Africa/Cairo"
-_country["EH"] = "Africa/El_Aaiun"
-_country["ER"] = "Africa/Asmera"
-_country["ES"] = {}
-_country["ES"]["07"] = "Europe/Madrid"
-_country["ES"]["27"] = "Europe/Madrid"
-_country["ES"]["29"] = "Europe/Madrid"
-_country["ES"]["31"] = "Europe/Madrid"
-_country["ES"]["32"] = "Europe/Madrid"
-_country["ES"]["34"] = "Europe/Madrid"
-_country["ES"]["39"] = "Europe/Madrid"
-_country["ES"]["51"] = "Africa/Ceuta"
-_country["ES"]["52"] = "Europe/Madrid"
-_country["ES"]["53"] = "Atlantic/Canary"
-_country["ES"]["54"] = "Europe/Madrid"
-_country["ES"]["55"] = "Europe/Madrid"
-_country["ES"]["56"] = "Europe/Madrid"
-_country["ES"]["57"] = "Europe/Madrid"
-_country["ES"]["58"] = "Europe/Madrid"
-_country["ES"]["59"] = "Europe/Madrid"
-_country["ES"]["60"] = "Europe/Madrid"
-_country["ET"] = "Africa/Addis_Ababa"
-_country["FI"] = "Europe/Helsinki"
-_country["FJ"] = "Pacific/Fiji"
-_country["FK"] = "Atlantic/Stanley"
-_country["FO"] = "Atlantic/Faeroe"
-_country["FR"] = "Europe/Paris"
-_country["GA"] = "Africa/Libreville"
-_country["GB"] = "Europe/London"
-_country["GD"] = "America/Grenada"
-_country["GE"] = "Asia/Tbilisi"
-_country["GF"] = "America/Cayenne"
-_country["GG"] = "Europe/Guernsey"
-_country["GH"] = "Africa/Accra"
-_country["GI"] = "Europe/Gibraltar"
-_country["GL"] = {}
-_country["GL"]["01"] = "America/Thule"
-_country["GL"]["02"] = "America/Godthab"
-_country["GL"]["03"] = "America/Godthab"
-_country["GM"] = "Africa/Banjul"
-_country["GN"] = "Africa/Conakry"
-_country["GP"] = "America/Guadeloupe"
-_country["GQ"] = "Africa/Malabo"
-_country["GR"] = "Europe/Athens"
-_country["GS"] = "Atlantic/South_Georgia"
-_country["GT"] = "America/Guatemala"
-_country["GU"] = "Pacific/Guam"
-_country["GW"] = "Africa/Bissau"
-_country["GY"] = "America/Guyana"
-_country["HK"] = "Asia/Hong_Kong"
-_country["HN"] = "America/Tegucigalpa"
-_country["HR"] = "Europe/Zagreb"
-_country["HT"] = "America/Port-au-Prince"
-_country["HU"] = "Europe/Budapest"
-_country["ID"] = {}
-_country["ID"]["01"] = "Asia/Pontianak"
-_country["ID"]["02"] = "Asia/Makassar"
-_country["ID"]["03"] = "Asia/Jakarta"
-_country["ID"]["04"] = "Asia/Jakarta"
-_country["ID"]["05"] = "Asia/Jakarta"
-_country["ID"]["06"] = "Asia/Jakarta"
-_country["ID"]["07"] = "Asia/Jakarta"
-_country["ID"]["08"] = "Asia/Jakarta"
-_country["ID"]["09"] = "Asia/Jayapura"
-_country["ID"]["10"] = "Asia/Jakarta"
-_country["ID"]["11"] = "Asia/Pontianak"
-_country["ID"]["12"] = "Asia/Makassar"
-_country["ID"]["13"] = "Asia/Makassar"
-_country["ID"]["14"] = "Asia/Makassar"
-_country["ID"]["15"] = "Asia/Jakarta"
-_country["ID"]["16"] = "Asia/Makassar"
-_country["ID"]["17"] = "Asia/Makassar"
-_country["ID"]["18"] = "Asia/Makassar"
-_country["ID"]["19"] = "Asia/Pontianak"
-_country["ID"]["20"] = "Asia/Makassar"
-_country["ID"]["21"] = "Asia/Makassar"
-_country["ID"]["22"] = "Asia/Makassar"
-_country["ID"]["23"] = "Asia/Makassar"
-_country["ID"]["24"] = "Asia/Jakarta"
-_country["ID"]["25"] = "Asia/Pontianak"
-_country["ID"]["26"] = "Asia/Pontianak"
-_country["ID"]["30"] = "Asia/Jakarta"
-_country["ID"]["31"] = "Asia/Makassar"
-_country["ID"]["33"] = "Asia/Jakarta"
-_country["IE"] = "Europe/Dublin"
-_country["IL"] = "Asia/Jerusalem"
-_country["IM"] = "Europe/Isle_of_Man"
-_country["IN"] = "Asia/Calcutta"
-_country["IO"] = "Indian/Chagos"
-_country["IQ"] = "Asia/Baghdad"
-_country["IR"] = "Asia/Tehran"
-_country["IS"] = "Atlantic/Reykjavik"
-_country["IT"] = "Europe/Rome"
-_country["JE"] = "Europe/Jersey"
-_country["JM"] = "America/Jamaica"
-_country["JO"] = "Asia/Amman"
-_country["JP"] = "Asia/Tokyo"
-_country["KE"] = "Africa/Nairobi"
-_country["KG"] = "Asia/Bishkek"
-_country["KH"] = "Asia/Phnom_Penh"
-_country["KI"] = "Pacific/Tarawa"
-_country["KM"] = "Indian/Comoro"
-_country["KN"] = "America/St_Kitts"
-_country["KP"] = "Asia/Pyongyang"
-_country["KR"] = "Asia/Seoul"
-_country["KW"] = "Asia/Kuwait"
-_country["KY"] = "America/Cayman"
-_country["KZ"] = {}
-_country["KZ"]["01"] = "Asia/Almaty"
-_country["KZ"]["02"] = "Asia/Almaty"
-_country["KZ"]["03"] = "Asia/Qyzylorda"
-_country["KZ"]["04"] = "Asia/Aqtobe"
-_country["KZ"]["05"] = "Asia/Qyzylorda"
-_country["KZ"]["06"] = "Asia/Aqtau"
-_country["KZ"]["07"] = "Asia/Oral"
-_country["KZ"]["08"] = "Asia/Qyzylorda"
-_country["KZ"]["09"] = "Asia/Aqtau"
-_country["KZ"]["10"] = "Asia/Qyzylorda"
-_country["KZ"]["11"] = "Asia/Almaty"
-_country["KZ"]["12"] = "Asia/Qyzylorda"
-_country["KZ"]["13"] = "Asia/Aqtobe"
-_country["KZ"]["14"] = "Asia/Qyzylorda"
-_country["KZ"]["15"] = "Asia/Almaty"
-_country["KZ"]["16"] = "Asia/Aqtobe"
-_country["KZ"]["17"] = "Asia/Almaty"
-_country["LA"] = "Asia/Vientiane"
-_country["LB"] = "Asia/Beirut"
-_country["LC"] = "America/St_Lucia"
-_country["LI"] = "Europe/Vaduz"
-_country["LK"] = "Asia/Colombo"
-_country["LR"] = "Africa/Monrovia"
-_country["LS"] = "Africa/Maseru"
-_country["LT"] = "Europe/Vilnius"
-_country["LU"] = "Europe/Luxembourg"
-_country["LV"] = "Europe/Riga"
-_country["LY"] = "Africa/Tripoli"
-_country["MA"] = "Africa/Casablanca"
-_country["MC"] = "Europe/Monaco"
-_country["MD"] = "Europe/Chisinau"
-_country["ME"] = "Europe/Podgorica"
-_country["MF"] = "America/Marigot"
-_country["MG"] = "Indian/Antananarivo"
-_country["MK"] = "Europe/Skopje"
-_country["ML"] = "Africa/Bamako"
-_country["MM"] = "Asia/Rangoon"
-_country["MN"] = "Asia/Choibalsan"
-_country["MO"] = "Asia/Macao"
-_country["MP"] = "Pacific/Saipan"
-_country["MQ"] = "America/Martinique"
-_country["MR"] = "Africa/Nouakchott"
-_country["MS"] = "America/Montserrat"
-_country["MT"] = "Europe/Malta"
-_country["MU"] = "Indian/Mauritius"
-_country["MV"] = "Indian/Maldives"
-_country["MW"] = "Africa/Blantyre"
-_country["MX"] = {}
-_country["MX"]["01"] = "America/Mexico_City"
-_country["MX"]["02"] = "America/Tijuana"
-_country["MX"]["03"] = "America/Hermosillo"
-_country["MX"]["04"] = "America/Merida"
-_country["MX"]["05"] = "America/Mexico_City"
-_country["MX"]["06"] = "America/Chihuahua"
-_country["MX"]["07"] = "America/Monterrey"
-_country["MX"]["08"] = "America/Mexico_City"
-_country["MX"]["09"] = "America/Mexico_City"
-_country["MX"]["10"] = "America/Mazatlan"
-_country["MX"]["11"] = "America/Mexico_City"
-_country["MX"]["12"] = "America/Mexico_City"
-_country["MX"]["13"] = "America/Mexico_City"
-_country["MX"]["14"] = "America/Mazatlan"
-_country["MX"]["15"] = "America/Chihuahua"
-_country["MX"]["16"] = "America/Mexico_City"
-_country["MX"]["17"] = "America/Mexico_City"
-_country["MX"]["18"] = "America/Mazatlan"
-_country["MX"]["19"] = "America/Monterrey"
-_country["MX"]["20"] = "America/Mexico_City"
-_country["MX"]["21"] = "America/Mexico_City"
-_country["MX"]["22"] = "America/Mexico_City"
-_country["MX"]["23"] = "America/Cancun"
-_country["MX"]["24"] = "America/Mexico_City"
-_country["MX"]["25"] = "America/Mazatlan"
-_country["MX"]["26"] = "America/Hermosillo"
-_country["MX"]["27"] = "America/Merida"
-_country["MX"]["28"] = "America/Monterrey"
-_country["MX"]["29"] = "America/Mexico_City"
-_country["MX"]["30"] = "America/Mexico_City"
-_country["MX"]["31"] = "America/Merida"
-_country["MX"]["32"] = "America/Monterrey"
-_country["MY"] = {}
-_country["MY"]["01"] = "Asia/Kuala_Lumpur"
-_country["MY"]["02"] = "Asia/Kuala_Lumpur"
-_country["MY"]["03"] = "Asia/Kuala_Lumpur"
-_country["MY"]["04"] = "Asia/Kuala_Lumpur"
-_country["MY"]["05"] = "Asia/Kuala_Lumpur"
-_country["MY"]["06"] = "Asia/Kuala_Lumpur"
-_country["MY"]["07"] = "Asia/Kuala_Lumpur"
-_country["MY"]["08"] = "Asia/Kuala_Lumpur"
-_country["MY"]["09"] = "Asia/Kuala_Lumpur"
-_country["MY"]["11"] = "Asia/Kuching"
-_country["MY"]["12"] = "Asia/Kuala_Lumpur"
-_country["MY"]["13"] = "Asia/Kuala_Lumpur"
-_country["MY"]["14"] = "Asia/Kuala_Lumpur"
-_country["MY"]["15"] = "Asia/Kuching"
-_country["MY"]["16"] = "Asia/Kuching"
-_country["MZ"] = "Africa/Maputo"
-_country["NA"] = "Africa/Windhoek"
-_country["NC"] = "Pacific/Noumea"
-_country["NE"] = "Africa/Niamey"
-_country["NF"] = "Pacific/Norfolk"
-_country["NG"] = "Africa/Lagos"
-_country["NI"] = "America/Managua"
-_country["NL"] = "Europe/Amsterdam"
-_country["NO"] = "Europe/Oslo"
-_country["NP"] = "Asia/Katmandu"
-_country["NR"] = "Pacific/Nauru"
-_country["NU"] = "Pacific/Niue"
-_country["NZ"] = {}
-_country["NZ"]["85"] = "Pacific/Auckland"
-_country["NZ"]["E7"] = "Pacific/Auckland"
-_country["NZ"]["E8"] = "Pacific/Auckland"
-_country["NZ"]["E9"] = "Pacific/Auckland"
-_country["NZ"]["F1"] = "Pacific/Auckland"
-_country["NZ"]["F2"] = "Pacific/Auckland"
-_country["NZ"]["F3"] = "Pacific/Auckland"
-_country["NZ"]["F4"] = "Pacific/Auckland"
-_country["NZ"]["F5"] = "Pacific/Auckland"
-_country["NZ"]["F7"] = "Pacific/Chatham"
-_country["NZ"]["F8"] = "Pacific/Auckland"
-_country["NZ"]["F9"] = "Pacific/Auckland"
-_country["NZ"]["G1"] = "Pacific/Auckland"
-_country["NZ"]["G2"] = "Pacific/Auckland"
-_country["NZ"]["G3"] = "Pacific/Auckland"
-_country["OM"] = "Asia/Muscat"
-_country["PA"] = "America/Panama"
-_country["PE"] = "America/Lima"
-_country["PF"] = "Pacific/Marquesas"
-_country["PG"] = "Pacific/Port_Moresby"
-_country["PH"] = "Asia/Manila"
-_country["PK"] = "Asia/Karachi"
-_country["PL"] = "Europe/Warsaw"
-_country["PM"] = "America/Miquelon"
-_country["PN"] = "Pacific/Pitcairn"
-_country["PR"] = "America/Puerto_Rico"
-_country["PS"] = "Asia/Gaza"
-_country["PT"] = {}
-_country["PT"]["02"] = "Europe/Lisbon"
-_country["PT"]["03"] = "Europe/Lisbon"
-_country["PT"]["04"] = "Europe/Lisbon"
-_country["PT"]["05"] = "Europe/Lisbon"
-_country["PT"]["06"] = "Europe/Lisbon"
-_country["PT"]["07"] = "Europe/Lisbon"
-_country["PT"]["08"] = "Europe/Lisbon"
-_country["PT"]["09"] = "Europe/Lisbon"
-_country["PT"]["10"] = "Atlantic/Madeira"
-_country["PT"]["11"] = "Europe/Lisbon"
-_country["PT"]["13"] = "Europe/Lisbon"
-_country["PT"]["14"] = "Europe/Lisbon"
-_country["PT"]["16"] = "Europe/Lisbon"
-_country["PT"]["17"] = "Europe/Lisbon"
-_country["PT"]["18"] = "Europe/Lisbon"
-_country["PT"]["19"] = "Europe/Lisbon"
-_country["PT"]["20"] = "Europe/Lisbon"
-_country["PT"]["21"] = "Europe/Lisbon"
-_country["PT"]["22"] = "Europe/Lisbon"
-_country["PW"] = "Pacific/Palau"
-_country["PY"] = "America/Asuncion"
-_country["QA"] = "Asia/Qatar"
-_country["RE"] = "Indian/Reunion"
-_country["RO"] = "Europe/Bucharest"
-_country["RS"] = "Europe/Belgrade"
-_country["RU"] = {}
-_country["RU"]["01"] = "Europe/Volgograd"
-_country["RU"]["02"] = "Asia/Irkutsk"
-_country["RU"]["03"] = "Asia/Novokuznetsk"
-_country["RU"]["04"] = "Asia/Novosibirsk"
-_country["RU"]["05"] = "Asia/Vladivostok"
-_country["RU"]["06"] = "Europe/Moscow"
-_country["RU"]["07"] = "Europe/Volgograd"
-_country["RU"]["08"] = "Europe/Samara"
-_country["RU"]["09"] = "Europe/Moscow"
-_country["RU"]["10"] = "Europe/Moscow"
-_country["RU"]["11"] = "Asia/Irkutsk"
-_country["RU"]["13"] = "Asia/Yekaterinburg"
-_country["RU"]["14"] = "Asia/Irkutsk"
-_country["RU"]["15"] = "Asia/Anadyr"
-_country["RU"]["16"] = "Europe/Samara"
-_country["RU"]["17"] = "Europe/Volgograd"
-_country["RU"]["18"] = "Asia/Krasnoyarsk"
-_country["RU"]["20"] = "Asia/Irkutsk"
-_country["RU"]["21"] = "Europe/Moscow"
-_country["RU"]["22"] = "Europe/Volgograd"
-_country["RU"]["23"] = "Europe/Kaliningrad"
-_country["RU"]["24"] = "Europe/Volgograd"
-_country["RU"]["25"] = "Europe/Moscow"
-_country["RU"]["26"] = "Asia/Kamchatka"
-_country["RU"]["27"] = "Europe/Volgograd"
-_country["RU"]["28"] = "Europe/Moscow"
-_country["RU"]["29"] = "Asia/Novokuznetsk"
-_country["RU"]["30"] = "Asia/Vladivostok"
-_country["RU"]["31"] = "Asia/Krasnoyarsk"
-_country["RU"]["32"] = "Asia/Omsk"
-_country["RU"]["33"] = "Asia/Yekaterinburg"
-_country["RU"]["34"] = "Asia/Yekaterinburg"
-_country["RU"]["35"] = "Asia/Yekaterinburg"
-_country["RU"]["36"] = "Asia/Anadyr"
-_country["RU"]["37"] = "Europe/Moscow"
-_country["RU"]["38"] = "Europe/Volgograd"
-_country["RU"]["39"] = "Asia/Krasnoyarsk"
-_country["RU"]["40"] = "Asia/Yekaterinburg"
-_country["RU"]["41"] = "Europe/Moscow"
-_country["RU"]["42"] = "Europe/Moscow"
-_country["RU"]["43"] = "Europe/Moscow"
-_country["RU"]["44"] = "Asia/Magadan"
-_country["RU"]["45"] = "Europe/Samara"
-_country["RU"]["46"] = "Europe/Samara"
-_country["RU"]["47"] = "Europe/Moscow"
-_country["RU"]["48"] = "Europe/Moscow"
-_country["RU"]["49"] = "Europe/Moscow"
-_country["RU"]["50"] = "Asia/Yekaterinburg"
-_country["RU"]["51"] = "Europe/Moscow"
-_country["RU"]["52"] = "Europe/Moscow"
-_country["RU"]["53"] = "Asia/Novosibirsk"
-_country["RU"]["54"] = "Asia/Omsk"
-_country["RU"]["55"] = "Europe/Samara"
-_country["RU"]["56"] = "Europe/Moscow"
-_country["RU"]["57"] = "Europe/Samara"
-_country["RU"]["58"] = "Asia/Yekaterinburg"
-_country["RU"]["59"] = "Asia/Vladivostok"
-_country["RU"]["60"] = "Europe/Kaliningrad"
-_country["RU"]["61"] = "Europe/Volgograd"
-_country["RU"]["62"] = "Europe/Moscow"
-_country["RU"]["63"] = "Asia/Yakutsk"
-_country["RU"]["64"] = "Asia/Sakhalin"
-_country["RU"]["65"] = "Europe/Samara"
-_country["RU"]["66"] = "Europe/Moscow"
-_country["RU"]["67"] = "Europe/Samara"
-_country["RU"]["68"] = "Europe/Volgograd"
-_country["RU"]["69"] = "Europe/Moscow"
-_country["RU"]["70"] = "Europe/Volgograd"
-_country["RU"]["71"] = "Asia/Yekaterinburg"
-_country["RU"]["72"] = "Europe/Moscow"
-_country["RU"]["73"] = "Europe/Samara"
-_country["RU"]["74"] = "Asia/Krasnoyarsk"
-_country["RU"]["75"] = "Asia/Novosibirsk"
-_country["RU"]["76"] = "Europe/Moscow"
-_country["RU"]["77"] = "Europe/Moscow"
-_country["RU"]["78"] = "Asia/Yekaterinburg"
-_country["RU"]["79"] = "Asia/Irkutsk"
-_country["RU"]["80"] = "Asia/Yekaterinburg"
-_country["RU"]["81"] = "Europe/Samara"
-_country["RU"]["82"] = "Asia/Irkutsk"
-_country["RU"]["83"] = "Europe/Moscow"
-_country["RU"]["84"] = "Europe/Volgograd"
-_country["RU"]["85"] = "Europe/Moscow"
-_country["RU"]["86"] = "Europe/Moscow"
-_country["RU"]["87"] = "Asia/Novosibirsk"
-_country["RU"]["88"] = "Europe/Moscow"
-_country["RU"]["89"] = "Asia/Vladivostok"
-_country["RW"] = "Africa/Kigali"
-_country["SA"] = "Asia/Riyadh"
-_country["SB"] = "Pacific/Guadalcanal"
-_country["SC"] = "Indian/Mahe"
-_country["SD"] = "Africa/Khartoum"
-_country["SE"] = "Europe/Stockholm"
-_country["SG"] = "Asia/Singapore"
-_country["SH"] = "Atlantic/St_Helena"
-_country["SI"] = "Europe/Ljubljana"
-_country["SJ"] = "Arctic/Longyearbyen"
-_country["SK"] = "Europe/Bratislava"
-_country["SL"] = "Africa/Freetown"
-_country["SM"] = "Europe/San_Marino"
-_country["SN"] = "Africa/Dakar"
-_country["SO"] = "Africa/Mogadishu"
-_country["SR"] = "America/Paramaribo"
-_country["ST"] = "Africa/Sao_Tome"
-_country["SV"] = "America/El_Salvador"
-_country["SX"] = "America/Curacao"
-_country["SY"] = "Asia/Damascus"
-_country["SZ"] = "Africa/Mbabane"
-_country["TC"] = "America/Grand_Turk"
-_country["TD"] = "Africa/Ndjamena"
-_country["TF"] = "Indian/Kerguelen"
-_country["TG"] = "Africa/Lome"
-_country["TH"] = "Asia/Bangkok"
-_country["TJ"] = "Asia/Dushanbe"
-_country["TK"] = "Pacific/Fakaofo"
-_country["TL"] = "Asia/Dili"
-_country["TM"] = "Asia/Ashgabat"
-_country["TN"] = "Africa/Tunis"
-_country["TO"] = "Pacific/Tongatapu"
-_country["TR"] = "Asia/Istanbul"
-_country["TT"] = "America/Port_of_Spain"
-_country["TV"] = "Pacific/Funafuti"
-_country["TW"] = "Asia/Taipei"
-_country["TZ"] = "Africa/Dar_es_Salaam"
-_country["UA"] = {}
-_country["UA"]["01"] = "Europe/Kiev"
-_country["UA"]["02"] = "Europe/Kiev"
-_country["UA"]["03"] = "Europe/Uzhgorod"
-_country["UA"]["04"] = "Europe/Zaporozhye"
-_country["UA"]["05"] = "Europe/Zaporozhye"
-_country["UA"]["06"] = "Europe/Uzhgorod"
-_country["UA"]["07"] = "Europe/Zaporozhye"
-_country["UA"]["08"] = "Europe/Simferopol"
-_country["UA"]["09"] = "Europe/Kiev"
-_country["UA"]["10"] = "Europe/Zaporozhye"
-_country["UA"]["11"] = "Europe/Simferopol"
-_country["UA"]["13"] = "Europe/Kiev"
-_country["UA"]["14"] = "Europe/Zaporozhye"
-_country["UA"]["15"] = "Europe/Uzhgorod"
-_country["UA"]["16"] = "Europe/Zaporozhye"
-_country["UA"]["17"] = "Europe/Simferopol"
-_country["UA"]["18"] = "Europe/Zaporozhye"
-_country["UA"]["19"] = "Europe/Kiev"
-_country["UA"]["20"] = "Europe/Simferopol"
-_country["UA"]["21"] = "Europe/Kiev"
-_country["UA"]["22"] = "Europe/Uzhgorod"
-_country["UA"]["23"] = "Europe/Kiev"
-_country["UA"]["24"] = "Europe/Uzhgorod"
-_country["UA"]["25"] = "Europe/Uzhgorod"
-_country["UA"]["26"] = "Europe/Zaporozhye"
-_country["UA"]["27"] = "Europe/Kiev"
-_country["UG"] = "Africa/Kampala"
-_country["US"] = {}
-_country["US"]["AK"] = "America/Anchorage"
-_country["US"]["AL"] = "America/Chicago"
-_country["US"]["AR"] = "America/Chicago"
-_country["US"]["AZ"] = "America/Phoenix"
-_country["US"]["CA"] = "America/Los_Angeles"
-_country["US"]["CO"] = "America/Denver"
-_country["US"]["CT"] = "America/New_York"
-_country["US"]["DC"] = "America/New_York"
-_country["US"]["DE"] = "America/New_York"
-_country["US"]["FL"] = "America/New_York"
-_country["US"]["GA"] = "America/New_York"
-_country["US"]["HI"] = "Pacific/Honolulu"
-_country["US"]["IA"] = "America/Chicago"
-_country["US"]["ID"] = "America/Denver"
-_country["US"]["IL"] = "America/Chicago"
-_country["US"]["IN"] = "America/Indianapolis"
-_country["US"]["KS"] = "America/Chicago"
-_country["US"]["KY"] = "America/New_York"
-_country["US"]["LA"] = "America/Chicago"
-_country["US"]["MA"] = "America/New_York"
-_country["US"]["MD"] = "America/New_York"
-_country["US"]["ME"] = "America/New_York"
-_country["US"]["MI"] = "America/New_York"
-_country["US"]["MN"] = "America/Chicago"
-_country["US"]["MO"] = "America/Chicago"
-_country["US"]["MS"] = "America/Chicago"
-_country["US"]["MT"] = "America/Denver"
-_country["US"]["NC"] = "America/New_York"
-_country["US"]["ND"] = "America/Chicago"
-_country["US"]["NE"] = "America/Chicago"
-_country["US"]["NH"] = "America/New_York"
-_country["US"]["NJ"] = "America/New_York"
-_country["US"]["NM"] = "America/Denver"
-_country["US"]["NV"] = "America/Los_Angeles"
-_country["US"]["NY"] = "America/New_York"
-_country["US"]["OH"] = "America/New_York"
-_country["US"]["OK"] = "America/Chicago"
-_country["US"]["OR"] = "America/Los_Angeles"
-_country["US"]["PA"] = "America/New_York"
-_country["US"]["RI"] = "America/New_York"
-_country["US"]["SC"] = "America/New_York"
-_country["US"]["SD"] = "America/Chicago"
-_country["US"]["TN"] = "America/Chicago"
-_country["US"]["TX"] = "America/Chicago"
-_country["US"]["UT"] = "America/Denver"
-_country["US"]["VA"] = "America/New_York"
-_country["US"]["VT"] = "America/New_York"
-_country["US"]["WA"] = "America/Los_Angeles"
-_country["US"]["WI"] = "America/Chicago"
-_country["US"]["WV"] = "America/New_York"
-_country["US"]["WY"] = "America/Denver"
-_country["UY"] = "America/Montevideo"
-_country["UZ"] = {}
-_country["UZ"]["01"] = "Asia/Tashkent"
-_country["UZ"]["02"] = "Asia/Samarkand"
-_country["UZ"]["03"] = "Asia/Tashkent"
-_country["UZ"]["06"] = "Asia/Tashkent"
-_country["UZ"]["07"] = "Asia/Samarkand"
-_country["UZ"]["08"] = "Asia/Samarkand"
-_country["UZ"]["09"] = "Asia/Samarkand"
-_country["UZ"]["10"] = "Asia/Samarkand"
-_country["UZ"]["12"] = "Asia/Samarkand"
-_country["UZ"]["13"] = "Asia/Tashkent"
-_country["UZ"]["14"] = "Asia/Tashkent"
-_country["VA"] = "Europe/Vatican"
-_country["VC"] = "America/St_Vincent"
-_country["VE"] = "America/Caracas"
-_country["VG"] = "America/Tortola"
-_country["VI"] = "America/St_Thomas"
-_country["VN"] = "Asia/Phnom_Penh"
-_country["VU"] = "Pacific/Efate"
-_country["WF"] = "Pacific/Wallis"
-_country["WS"] = "Pacific/Samoa"
-_country["YE"] = "Asia/Aden"
-_country["YT"] = "Indian/Mayotte"
-_country["YU"] = "Europe/Belgrade"
-_country["ZA"] = "Africa/Johannesburg"
-_country["ZM"] = "Africa/Lusaka"
-_country["ZW"] = "Africa/Harare"
+# distinct time zone names, separated by spaces
+_ZONES = (
+    'Africa/Abidjan '
+    'Africa/Accra '
+    'Africa/Addis_Ababa '
+    'Africa/Algiers '
+    'Africa/Asmera '
+    'Africa/Bamako '
+    'Africa/Bangui '
+    'Africa/Banjul '
+    'Africa/Bissau '
+    'Africa/Blantyre '
+    'Africa/Brazzaville '
+    'Africa/Bujumbura '
+    'Africa/Cairo '
+    'Africa/Casablanca '
+    'Africa/Ceuta '
+    'Africa/Conakry '
+    'Africa/Dakar '
+    'Africa/Dar_es_Salaam '
+    'Africa/Djibouti '
+    'Africa/El_Aaiun '
+    'Africa/Freetown '
+    'Africa/Gaborone '
+    'Africa/Harare '
+    'Africa/Johannesburg '
+    'Africa/Kampala '
+    'Africa/Khartoum '
+    'Africa/Kigali '
+    'Africa/Kinshasa '
+    'Africa/Lagos '
+    'Africa/Libreville '
+    'Africa/Lome '
+    'Africa/Luanda '
+    'Africa/Lubumbashi '
+    'Africa/Lusaka '
+    'Africa/Malabo '
+    'Africa/Maputo '
+    'Africa/Maseru '
+    'Africa/Mbabane '
+    'Africa/Mogadishu '
+    'Africa/Monrovia '
+    'Africa/Nairobi '
+    'Africa/Ndjamena '
+    'Africa/Niamey '
+    'Africa/Nouakchott '
+    'Africa/Ouagadougou '
+    'Africa/Porto-Novo '
+    'Africa/Sao_Tome '
+    'Africa/Tripoli '
+    'Africa/Tunis '
+    'Africa/Windhoek '
+    'America/Anchorage '
+    'America/Anguilla '
+    'America/Antigua '
+    'America/Araguaina '
+    'America/Argentina/Buenos_Aires '
+    'America/Argentina/Catamarca '
+    'America/Argentina/Cordoba '
+    'America/Argentina/Jujuy '
+    'America/Argentina/La_Rioja '
+    'America/Argentina/Mendoza '
+    'America/Argentina/Rio_Gallegos '
+    'America/Argentina/Salta '
+    'America/Argentina/San_Juan '
+    'America/Argentina/San_Luis '
+    'America/Argentina/Tucuman '
+    'America/Argentina/Ushuaia '
+    'America/Aruba '
+    'America/Asuncion '
+    'America/Bahia '
+    'America/Barbados '
+    'America/Belem '
+    'America/Belize '
+    'America/Boa_Vista '
+    'America/Bogota '
+    'America/Campo_Grande '
+    'America/Cancun '
+    'America/Caracas '
+    'America/Cayenne '
+    'America/Cayman '
+    'America/Chicago '
+    'America/Chihuahua '
+    'America/Costa_Rica '
+    'America/Cuiaba '
+    'America/Curacao '
+    'America/Denver '
+    'America/Dominica '
+    'America/Edmonton '
+    'America/El_Salvador '
+    'America/Fortaleza '
+    'America/Godthab '
+    'America/Grand_Turk '
+    'America/Grenada '
+    'America/Guadeloupe '
+    'America/Guatemala '
+    'America/Guayaquil '
+    'America/Guyana '
+    'America/Halifax '
+    'America/Havana '
+    'America/Hermosillo '
+    'America/Indianapolis '
+    'America/Jamaica '
+    'America/La_Paz '
+    'America/Lima '
+    'America/Los_Angeles '
+    'America/Maceio '
+    'America/Managua '
+    'America/Manaus '
+    'America/Marigot '
+    'America/Martinique '
+    'America/Mazatlan '
+    'America/Merida '
+    'America/Mexico_City '
+    'America/Miquelon '
+    'America/Monterrey '
+    'America/Montevideo '
+    'America/Montreal '
+    'America/Montserrat '
+    'America/Nassau '
+    'America/New_York '
+    'America/Panama '
+    'America/Paramaribo '
+    'America/Phoenix '
+    'America/Port-au-Prince '
+    'America/Port_of_Spain '
+    'America/Porto_Velho '
+    'America/Puerto_Rico '
+    'America/Rainy_River '
+    'America/Rankin_Inlet '
+    'America/Recife '
+    'America/Regina '
+    'America/Rio_Branco '
+    'America/Santo_Domingo '
+    'America/Sao_Paulo '
+    'America/St_Barthelemy '
+    'America/St_Johns '
+    'America/St_Kitts '
+    'America/St_Lucia '
+    'America/St_Thomas '
+    'America/St_Vincent '
+    'America/Tegucigalpa '
+    'America/Thule '
+    'America/Tijuana '
+    'America/Tortola '
+    'America/Vancouver '
+    'America/Whitehorse '
+    'America/Winnipeg '
+    'America/Yellowknife '
+    'Arctic/Longyearbyen '
+    'Asia/Aden '
+    'Asia/Almaty '
+    'Asia/Amman '
+    'Asia/Anadyr '
+    'Asia/Aqtau '
+    'Asia/Aqtobe '
+    'Asia/Ashgabat '
+    'Asia/Baghdad '
+    'Asia/Bahrain '
+    'Asia/Baku '
+    'Asia/Bangkok '
+    'Asia/Beirut '
+    'Asia/Bishkek '
+    'Asia/Brunei '
+    'Asia/Calcutta '
+    'Asia/Choibalsan '
+    'Asia/Chongqing '
+    'Asia/Colombo '
+    'Asia/Damascus '
+    'Asia/Dhaka '
+    'Asia/Dili '
+    'Asia/Dubai '
+    'Asia/Dushanbe '
+    'Asia/Gaza '
+    'Asia/Harbin '
+    'Asia/Hong_Kong '
+    'Asia/Irkutsk '
+    'Asia/Istanbul '
+    'Asia/Jakarta '
+    'Asia/Jayapura '
+    'Asia/Jerusalem '
+    'Asia/Kabul '
+    'Asia/Kamchatka '
+    'Asia/Karachi '
+    'Asia/Katmandu '
+    'Asia/Krasnoyarsk '
+    'Asia/Kuala_Lumpur '
+    'Asia/Kuching '
+    'Asia/Kuwait '
+    'Asia/Macao '
+    'Asia/Magadan '
+    'Asia/Makassar '
+    'Asia/Manila '
+    'Asia/Muscat '
+    'Asia/Nicosia '
+    'Asia/Novokuznetsk '
+    'Asia/Novosibirsk '
+    'Asia/Omsk '
+    'Asia/Oral '
+    'Asia/Phnom_Penh '
+    'Asia/Pontianak '
+    'Asia/Pyongyang '
+    'Asia/Qatar '
+    'Asia/Qyzylorda '
+    'Asia/Rangoon '
+    'Asia/Riyadh '
+    'Asia/Sakhalin '
+    'Asia/Samarkand '
+    'Asia/Seoul '
+    'Asia/Shanghai '
+    'Asia/Singapore '
+    'Asia/Taipei '
+    'Asia/Tashkent '
+    'Asia/Tbilisi '
+    'Asia/Tehran '
+    'Asia/Thimphu '
+    'Asia/Tokyo '
+    'Asia/Urumqi '
+    'Asia/Vientiane '
+    'Asia/Vladivostok '
+    'Asia/Yakutsk '
+    'Asia/Yekaterinburg '
+    'Asia/Yerevan '
+    'Atlantic/Bermuda '
+    'Atlantic/Canary '
+    'Atlantic/Cape_Verde '
+    'Atlantic/Faeroe '
+    'Atlantic/Madeira '
+    'Atlantic/Reykjavik '
+    'Atlantic/South_Georgia '
+    'Atlantic/St_Helena '
+    'Atlantic/Stanley '
+    'Australia/Canberra '
+    'Australia/NSW '
+    'Australia/North '
+    'Australia/Queensland '
+    'Australia/South '
+    'Australia/Tasmania '
+    'Australia/Victoria '
+    'Australia/West '
+    'Chile/Continental '
+    'Europe/Amsterdam '
+    'Europe/Andorra '
+    'Europe/Athens '
+    'Europe/Belgrade '
+    'Europe/Berlin '
+    'Europe/Bratislava '
+    'Europe/Brussels '
+    'Europe/Bucharest '
+    'Europe/Budapest '
+    'Europe/Chisinau '
+    'Europe/Copenhagen '
+    'Europe/Dublin '
+    'Europe/Gibraltar '
+    'Europe/Guernsey '
+    'Europe/Helsinki '
+    'Europe/Isle_of_Man '
+    'Europe/Jersey '
+    'Europe/Kaliningrad '
+    'Europe/Kiev '
+    'Europe/Lisbon '
+    'Europe/Ljubljana '
+    'Europe/London '
+    'Europe/Luxembourg '
+    'Europe/Madrid '
+    'Europe/Malta '
+    'Europe/Mariehamn '
+    'Europe/Minsk '
+    'Europe/Monaco '
+    'Europe/Moscow '
+    'Europe/Oslo '
+    'Europe/Paris '
+    'Europe/Podgorica '
+    'Europe/Prague '
+    'Europe/Riga '
+    'Europe/Rome '
+    'Europe/Samara '
+    'Europe/San_Marino '
+    'Europe/Sarajevo '
+    'Europe/Simferopol '
+    'Europe/Skopje '
+    'Europe/Sofia '
+    'Europe/Stockholm '
+    'Europe/Tallinn '
+    'Europe/Tirane '
+    'Europe/Uzhgorod '
+    'Europe/Vaduz '
+    'Europe/Vatican '
+    'Europe/Vienna '
+    'Europe/Vilnius '
+    'Europe/Volgograd '
+    'Europe/Warsaw '
+    'Europe/Zagreb '
+    'Europe/Zaporozhye '
+    'Europe/Zurich '
+    'Indian/Antananarivo '
+    'Indian/Chagos '
+    'Indian/Christmas '
+    'Indian/Cocos '
+    'Indian/Comoro '
+    'Indian/Kerguelen '
+    'Indian/Mahe '
+    'Indian/Maldives '
+    'Indian/Mauritius '
+    'Indian/Mayotte '
+    'Indian/Reunion '
+    'Pacific/Auckland '
+    'Pacific/Chatham '
+    'Pacific/Efate '
+    'Pacific/Fakaofo '
+    'Pacific/Fiji '
+    'Pacific/Funafuti '
+    'Pacific/Galapagos '
+    'Pacific/Guadalcanal '
+    'Pacific/Guam '
+    'Pacific/Honolulu '
+    'Pacific/Marquesas '
+    'Pacific/Nauru '
+    'Pacific/Niue '
+    'Pacific/Norfolk '
+    'Pacific/Noumea '
+    'Pacific/Palau '
+    'Pacific/Pitcairn '
+    'Pacific/Port_Moresby '
+    'Pacific/Rarotonga '
+    'Pacific/Saipan '
+    'Pacific/Samoa '
+    'Pacific/Tarawa '
+    'Pacific/Tongatapu '
+    'Pacific/Wallis '
+    'US/Samoa '
+)
 
-def time_zone_by_country_and_region(country_code, region_name=None):
+# country code, or country code followed by region code, and index in
+# _ZONES, separated by spaces; countries that are listed with a region
+# code have no country-wide zone
+_TABLE = (
+    'AD:240 '
+    'AE:169 '
+    'AF:179 '
+    'AG:52 '
+    'AI:51 '
+    'AL:282 '
+    'AM:220 '
+    'AO:31 '
+    'AR01:54 '
+    'AR02:55 '
+    'AR03:64 '
+    'AR04:60 '
+    'AR05:56 '
+    'AR06:64 '
+    'AR07:54 '
+    'AR08:54 '
+    'AR09:64 '
+    'AR10:57 '
+    'AR11:63 '
+    'AR12:58 '
+    'AR13:59 '
+    'AR14:54 '
+    'AR15:63 '
+    'AR16:54 '
+    'AR17:61 '
+    'AR18:62 '
+    'AR19:63 '
+    'AR20:60 '
+    'AR21:54 '
+    'AR22:55 '
+    'AR23:65 '
+    'AR24:64 '
+    'AS:328 '
+    'AT:286 '
+    'AU01:230 '
+    'AU02:231 '
+    'AU03:232 '
+    'AU04:233 '
+    'AU05:234 '
+    'AU06:235 '
+    'AU07:236 '
+    'AU08:237 '
+    'AW:66 '
+    'AX:264 '
+    'AZ:157 '
+    'BA:276 '
+    'BB:69 '
+    'BD:167 '
+    'BE:245 '
+    'BF:44 '
+    'BG:279 '
+    'BH:156 '
+    'BI:11 '
+    'BJ:45 '
+    'BL:133 '
+    'BM:221 '
+    'BN:161 '
+    'BO:101 '
+    'BQ:83 '
+    'BR01:130 '
+    'BR02:104 '
+    'BR03:132 '
+    'BR04:106 '
+    'BR05:68 '
+    'BR06:88 '
+    'BR07:132 '
+    'BR08:132 '
+    'BR11:74 '
+    'BR13:70 '
+    'BR14:82 '
+    'BR15:132 '
+    'BR16:70 '
+    'BR17:128 '
+    'BR18:132 '
+    'BR20:88 '
+    'BR21:132 '
+    'BR22:128 '
+    'BR23:132 '
+    'BR24:124 '
+    'BR25:72 '
+    'BR26:132 '
+    'BR27:132 '
+    'BR28:104 '
+    'BR29:132 '
+    'BR30:128 '
+    'BR31:53 '
+    'BS:117 '
+    'BT:213 '
+    'BW:21 '
+    'BY:265 '
+    'BZ:71 '
+    'CAAB:86 '
+    'CABC:143 '
+    'CAMB:145 '
+    'CANB:96 '
+    'CANL:134 '
+    'CANS:96 '
+    'CANT:146 '
+    'CANU:127 '
+    'CAON:126 '
+    'CAPE:96 '
+    'CAQC:115 '
+    'CASK:129 '
+    'CAYT:144 '
+    'CC:296 '
+    'CD02:27 '
+    'CD05:32 '
+    'CD06:27 '
+    'CD08:27 '
+    'CD10:32 '
+    'CD11:32 '
+    'CD12:32 '
+    'CF:6 '
+    'CG:10 '
+    'CH:292 '
+    'CI:0 '
+    'CK:322 '
+    'CL:238 '
+    'CM:28 '
+    'CN01:207 '
+    'CN02:207 '
+    'CN03:207 '
+    'CN04:207 '
+    'CN05:172 '
+    'CN06:164 '
+    'CN07:207 '
+    'CN08:172 '
+    'CN09:207 '
+    'CN10:207 '
+    'CN11:164 '
+    'CN12:207 '
+    'CN13:215 '
+    'CN14:164 '
+    'CN15:164 '
+    'CN16:164 '
+    'CN18:164 '
+    'CN19:172 '
+    'CN20:172 '
+    'CN21:164 '
+    'CN22:172 '
+    'CN23:207 '
+    'CN24:164 '
+    'CN25:207 '
+    'CN26:164 '
+    'CN28:207 '
+    'CN29:164 '
+    'CN30:164 '
+    'CN31:164 '
+    'CN32:164 '
+    'CN33:164 '
+    'CO:73 '
+    'CR:81 '
+    'CU:97 '
+    'CV:223 '
+    'CW:83 '
+    'CX:295 '
+    'CY:192 '
+    'CZ:271 '
+    'DE:243 '
+    'DJ:18 '
+    'DK:249 '
+    'DM:85 '
+    'DO:131 '
+    'DZ:3 '
+    'EC01:310 '
+    'EC02:94 '
+    'EC03:94 '
+    'EC04:94 '
+    'EC05:94 '
+    'EC06:94 '
+    'EC07:94 '
+    'EC08:94 '
+    'EC09:94 '
+    'EC10:94 '
+    'EC11:94 '
+    'EC12:94 '
+    'EC13:94 '
+    'EC14:94 '
+    'EC15:94 '
+    'EC17:94 '
+    'EC18:94 '
+    'EC19:94 '
+    'EC20:94 '
+    'EC22:94 '
+    'EE:281 '
+    'EG:12 '
+    'EH:19 '
+    'ER:4 '
+    'ES07:262 '
+    'ES27:262 '
+    'ES29:262 '
+    'ES31:262 '
+    'ES32:262 '
+    'ES34:262 '
+    'ES39:262 '
+    'ES51:14 '
+    'ES52:262 '
+    'ES53:222 '
+    'ES54:262 '
+    'ES55:262 '
+    'ES56:262 '
+    'ES57:262 '
+    'ES58:262 '
+    'ES59:262 '
+    'ES60:262 '
+    'ET:2 '
+    'FI:253 '
+    'FJ:308 '
+    'FK:229 '
+    'FO:224 '
+    'FR:269 '
+    'GA:29 '
+    'GB:260 '
+    'GD:91 '
+    'GE:211 '
+    'GF:77 '
+    'GG:252 '
+    'GH:1 '
+    'GI:251 '
+    'GL01:140 '
+    'GL02:89 '
+    'GL03:89 '
+    'GM:7 '
+    'GN:15 '
+    'GP:92 '
+    'GQ:34 '
+    'GR:241 '
+    'GS:227 '
+    'GT:93 '
+    'GU:312 '
+    'GW:8 '
+    'GY:95 '
+    'HK:173 '
+    'HN:139 '
+    'HR:290 '
+    'HT:122 '
+    'HU:247 '
+    'ID01:198 '
+    'ID02:189 '
+    'ID03:176 '
+    'ID04:176 '
+    'ID05:176 '
+    'ID06:176 '
+    'ID07:176 '
+    'ID08:176 '
+    'ID09:177 '
+    'ID10:176 '
+    'ID11:198 '
+    'ID12:189 '
+    'ID13:189 '
+    'ID14:189 '
+    'ID15:176 '
+    'ID16:189 '
+    'ID17:189 '
+    'ID18:189 '
+    'ID19:198 '
+    'ID20:189 '
+    'ID21:189 '
+    'ID22:189 '
+    'ID23:189 '
+    'ID24:176 '
+    'ID25:198 '
+    'ID26:198 '
+    'ID30:176 '
+    'ID31:189 '
+    'ID33:176 '
+    'IE:250 '
+    'IL:178 '
+    'IM:254 '
+    'IN:162 '
+    'IO:294 '
+    'IQ:155 '
+    'IR:212 '
+    'IS:226 '
+    'IT:273 '
+    'JE:255 '
+    'JM:100 '
+    'JO:150 '
+    'JP:214 '
+    'KE:40 '
+    'KG:160 '
+    'KH:197 '
+    'KI:325 '
+    'KM:297 '
+    'KN:135 '
+    'KP:199 '
+    'KR:206 '
+    'KW:186 '
+    'KY:78 '
+    'KZ01:149 '
+    'KZ02:149 '
+    'KZ03:201 '
+    'KZ04:153 '
+    'KZ05:201 '
+    'KZ06:152 '
+    'KZ07:196 '
+    'KZ08:201 '
+    'KZ09:152 '
+    'KZ10:201 '
+    'KZ11:149 '
+    'KZ12:201 '
+    'KZ13:153 '
+    'KZ14:201 '
+    'KZ15:149 '
+    'KZ16:153 '
+    'KZ17:149 '
+    'LA:216 '
+    'LB:159 '
+    'LC:136 '
+    'LI:284 '
+    'LK:165 '
+    'LR:39 '
+    'LS:36 '
+    'LT:287 '
+    'LU:261 '
+    'LV:272 '
+    'LY:47 '
+    'MA:13 '
+    'MC:266 '
+    'MD:248 '
+    'ME:270 '
+    'MF:107 '
+    'MG:293 '
+    'MK:278 '
+    'ML:5 '
+    'MM:202 '
+    'MN:163 '
+    'MO:187 '
+    'MP:323 '
+    'MQ:108 '
+    'MR:43 '
+    'MS:116 '
+    'MT:263 '
+    'MU:301 '
+    'MV:300 '
+    'MW:9 '
+    'MX01:111 '
+    'MX02:141 '
+    'MX03:98 '
+    'MX04:110 '
+    'MX05:111 '
+    'MX06:80 '
+    'MX07:113 '
+    'MX08:111 '
+    'MX09:111 '
+    'MX10:109 '
+    'MX11:111 '
+    'MX12:111 '
+    'MX13:111 '
+    'MX14:109 '
+    'MX15:80 '
+    'MX16:111 '
+    'MX17:111 '
+    'MX18:109 '
+    'MX19:113 '
+    'MX20:111 '
+    'MX21:111 '
+    'MX22:111 '
+    'MX23:75 '
+    'MX24:111 '
+    'MX25:109 '
+    'MX26:98 '
+    'MX27:110 '
+    'MX28:113 '
+    'MX29:111 '
+    'MX30:111 '
+    'MX31:110 '
+    'MX32:113 '
+    'MY01:184 '
+    'MY02:184 '
+    'MY03:184 '
+    'MY04:184 '
+    'MY05:184 '
+    'MY06:184 '
+    'MY07:184 '
+    'MY08:184 '
+    'MY09:184 '
+    'MY11:185 '
+    'MY12:184 '
+    'MY13:184 '
+    'MY14:184 '
+    'MY15:185 '
+    'MY16:185 '
+    'MZ:35 '
+    'NA:49 '
+    'NC:318 '
+    'NE:42 '
+    'NF:317 '
+    'NG:28 '
+    'NI:105 '
+    'NL:239 '
+    'NO:268 '
+    'NP:182 '
+    'NR:315 '
+    'NU:316 '
+    'NZ85:304 '
+    'NZE7:304 '
+    'NZE8:304 '
+    'NZE9:304 '
+    'NZF1:304 '
+    'NZF2:304 '
+    'NZF3:304 '
+    'NZF4:304 '
+    'NZF5:304 '
+    'NZF7:305 '
+    'NZF8:304 '
+    'NZF9:304 '
+    'NZG1:304 '
+    'NZG2:304 '
+    'NZG3:304 '
+    'OM:191 '
+    'PA:119 '
+    'PE:102 '
+    'PF:314 '
+    'PG:321 '
+    'PH:190 '
+    'PK:181 '
+    'PL:289 '
+    'PM:112 '
+    'PN:320 '
+    'PR:125 '
+    'PS:171 '
+    'PT02:258 '
+    'PT03:258 '
+    'PT04:258 '
+    'PT05:258 '
+    'PT06:258 '
+    'PT07:258 '
+    'PT08:258 '
+    'PT09:258 '
+    'PT10:225 '
+    'PT11:258 '
+    'PT13:258 '
+    'PT14:258 '
+    'PT16:258 '
+    'PT17:258 '
+    'PT18:258 '
+    'PT19:258 '
+    'PT20:258 '
+    'PT21:258 '
+    'PT22:258 '
+    'PW:319 '
+    'PY:67 '
+    'QA:200 '
+    'RE:303 '
+    'RO:246 '
+    'RS:242 '
+    'RU01:288 '
+    'RU02:174 '
+    'RU03:193 '
+    'RU04:194 '
+    'RU05:217 '
+    'RU06:267 '
+    'RU07:288 '
+    'RU08:274 '
+    'RU09:267 '
+    'RU10:267 '
+    'RU11:174 '
+    'RU13:219 '
+    'RU14:174 '
+    'RU15:151 '
+    'RU16:274 '
+    'RU17:288 '
+    'RU18:183 '
+    'RU20:174 '
+    'RU21:267 '
+    'RU22:288 '
+    'RU23:256 '
+    'RU24:288 '
+    'RU25:267 '
+    'RU26:180 '
+    'RU27:288 '
+    'RU28:267 '
+    'RU29:193 '
+    'RU30:217 '
+    'RU31:183 '
+    'RU32:195 '
+    'RU33:219 '
+    'RU34:219 '
+    'RU35:219 '
+    'RU36:151 '
+    'RU37:267 '
+    'RU38:288 '
+    'RU39:183 '
+    'RU40:219 '
+    'RU41:267 '
+    'RU42:267 '
+    'RU43:267 '
+    'RU44:188 '
+    'RU45:274 '
+    'RU46:274 '
+    'RU47:267 '
+    'RU48:267 '
+    'RU49:267 '
+    'RU50:219 '
+    'RU51:267 '
+    'RU52:267 '
+    'RU53:194 '
+    'RU54:195 '
+    'RU55:274 '
+    'RU56:267 '
+    'RU57:274 '
+    'RU58:219 '
+    'RU59:217 '
+    'RU60:256 '
+    'RU61:288 '
+    'RU62:267 '
+    'RU63:218 '
+    'RU64:204 '
+    'RU65:274 '
+    'RU66:267 '
+    'RU67:274 '
+    'RU68:288 '
+    'RU69:267 '
+    'RU70:288 '
+    'RU71:219 '
+    'RU72:267 '
+    'RU73:274 '
+    'RU74:183 '
+    'RU75:194 '
+    'RU76:267 '
+    'RU77:267 '
+    'RU78:219 '
+    'RU79:174 '
+    'RU80:219 '
+    'RU81:274 '
+    'RU82:174 '
+    'RU83:267 '
+    'RU84:288 '
+    'RU85:267 '
+    'RU86:267 '
+    'RU87:194 '
+    'RU88:267 '
+    'RU89:217 '
+    'RW:26 '
+    'SA:203 '
+    'SB:311 '
+    'SC:299 '
+    'SD:25 '
+    'SE:280 '
+    'SG:208 '
+    'SH:228 '
+    'SI:259 '
+    'SJ:147 '
+    'SK:244 '
+    'SL:20 '
+    'SM:275 '
+    'SN:16 '
+    'SO:38 '
+    'SR:120 '
+    'ST:46 '
+    'SV:87 '
+    'SX:83 '
+    'SY:166 '
+    'SZ:37 '
+    'TC:90 '
+    'TD:41 '
+    'TF:298 '
+    'TG:30 '
+    'TH:158 '
+    'TJ:170 '
+    'TK:307 '
+    'TL:168 '
+    'TM:154 '
+    'TN:48 '
+    'TO:326 '
+    'TR:175 '
+    'TT:123 '
+    'TV:309 '
+    'TW:209 '
+    'TZ:17 '
+    'UA01:257 '
+    'UA02:257 '
+    'UA03:283 '
+    'UA04:291 '
+    'UA05:291 '
+    'UA06:283 '
+    'UA07:291 '
+    'UA08:277 '
+    'UA09:257 '
+    'UA10:291 '
+    'UA11:277 '
+    'UA13:257 '
+    'UA14:291 '
+    'UA15:283 '
+    'UA16:291 '
+    'UA17:277 '
+    'UA18:291 '
+    'UA19:257 '
+    'UA20:277 '
+    'UA21:257 '
+    'UA22:283 '
+    'UA23:257 '
+    'UA24:283 '
+    'UA25:283 '
+    'UA26:291 '
+    'UA27:257 '
+    'UG:24 '
+    'USAK:50 '
+    'USAL:79 '
+    'USAR:79 '
+    'USAZ:121 '
+    'USCA:103 '
+    'USCO:84 '
+    'USCT:118 '
+    'USDC:118 '
+    'USDE:118 '
+    'USFL:118 '
+    'USGA:118 '
+    'USHI:313 '
+    'USIA:79 '
+    'USID:84 '
+    'USIL:79 '
+    'USIN:99 '
+    'USKS:79 '
+    'USKY:118 '
+    'USLA:79 '
+    'USMA:118 '
+    'USMD:118 '
+    'USME:118 '
+    'USMI:118 '
+    'USMN:79 '
+    'USMO:79 '
+    'USMS:79 '
+    'USMT:84 '
+    'USNC:118 '
+    'USND:79 '
+    'USNE:79 '
+    'USNH:118 '
+    'USNJ:118 '
+    'USNM:84 '
+    'USNV:103 '
+    'USNY:118 '
+    'USOH:118 '
+    'USOK:79 '
+    'USOR:103 '
+    'USPA:118 '
+    'USRI:118 '
+    'USSC:118 '
+    'USSD:79 '
+    'USTN:79 '
+    'USTX:79 '
+    'USUT:84 '
+    'USVA:118 '
+    'USVT:118 '
+    'USWA:103 '
+    'USWI:79 '
+    'USWV:118 '
+    'USWY:84 '
+    'UY:114 '
+    'UZ01:210 '
+    'UZ02:205 '
+    'UZ03:210 '
+    'UZ06:210 '
+    'UZ07:205 '
+    'UZ08:205 '
+    'UZ09:205 '
+    'UZ10:205 '
+    'UZ12:205 '
+    'UZ13:210 '
+    'UZ14:210 '
+    'VA:285 '
+    'VC:138 '
+    'VE:76 '
+    'VG:142 '
+    'VI:137 '
+    'VN:197 '
+    'VU:306 '
+    'WF:327 '
+    'WS:324 '
+    'YE:148 '
+    'YT:302 '
+    'YU:242 '
+    'ZA:23 '
+    'ZM:33 '
+    'ZW:22 '
+)
 
-    if country_code not in _country:
-        return None
+_index = None
 
-    if not region_name or region_name == '00':
-        region_name = None
+def _build_index():
+    global _index
+    zones = _ZONES.split()
+    # build the whole index before publishing it, so that concurrent
+    # callers never see a partial one
+    index = {}
+    for entry in _TABLE.split():
+        key, zone = entry.split(':')
+        index[key] = zones[int(zone)]
+    _index = index
+    return index
 
-    timezones = _country[country_code]
+def time_zone_by_country_and_region(country_code, region_name=None):
+    """
+    @param country_code: two-letter country code
+    @type country_code: str
+    @param region_name: region code, if any
+    @type region_name: str
+    @return: time zone name, or None if unknown
+    @rtype: str
+    """
+    index = _index or _build_index()
+
+    if not country_code:
+        return None
 
-    if isinstance(timezones, str):
-        return timezones
+    timezone = index.get(country_code)
+    if timezone is None and region_name and region_name != '00':
+        timezone = index.get(country_code + region_name)
 
-    if region_name:
-        return timezones.get(region_name)
+    return timezone
@@ -20,16 +20,158 @@ You should have received a copy of the GNU Lesser General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/lgpl.txt>.
 """
 
+import socket
+import struct
+import threading
+import bisect
+from array import array
+from collections import OrderedDict
+
+_ipv4_struct = struct.Struct('!L')
+_ipv6_struct = struct.Struct('!QQ')
+
 def ip2long(ip):
     """
-    Convert a IPv4 address into a 32-bit integer.
-    
-    @param ip: quad-dotted IPv4 address
+    Convert an IPv4 or IPv6 address into an integer.
+
+    @param ip: quad-dotted IPv4 address or IPv6 address
     @type ip: str
-    @return: network byte order 32-bit integer
+    @return: network byte order 32-bit (IPv4) or 128-bit (IPv6) integer
     @rtype: int
     """
-    ip_array = ip.split('.')
-    ip_long = long(ip_array[0]) * 16777216 + long(ip_array[1]) * 65536 + long(ip_array[2]) * 256 + long(ip_array[3])
-    return ip_long  
+    try:
+        if ':' in ip:
+            high, low = _ipv6_struct.unpack(socket.inet_pton(socket.AF_INET6, ip))
+            return high << 64 | low
+
+        # unlike inet_aton, inet_pton accepts only four decimal octets
+        return _ipv4_struct.unpack(socket.inet_pton(socket.AF_INET, ip))[0]
+    except socket.error:
+        raise ValueError("Invalid IP address: %s" % ip)
+
+class LRUCache(object):
+    """
+    Bounded mapping that evicts the least recently used entry once it holds
+    maxsize entries, and counts hits, misses, and evictions. It is safe to
+    use from several threads.
+    """
+
+    def __init__(self, maxsize):
+        """
+        @param maxsize: maximum number of entries
+        @type maxsize: int
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        """
+        Return the value for key and mark it as most recently used, or
+        return default if key is not cached.
+        """
+        with self._lock:
+            try:
+                value = self._data.pop(key)
+            except KeyError:
+                self.misses += 1
+                return default
+
+            self._data[key] = value
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """
+        Cache value for key, evicting the least recently used entry if the
+        cache is full.
+        """
+        with self._lock:
+            if key in self._data:
+                del self._data[key]
+            elif len(self._data) >= self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+            self._data[key] = value
+
+    def info(self):
+        """
+        @return: dict with hits, misses, evictions, size, and maxsize
+        @rtype: dict
+        """
+        return {'hits': self.hits, 'misses': self.misses,
+                'evictions': self.evictions, 'size': len(self._data),
+                'maxsize': self.maxsize}
+
+class MappedArray(object):
+    """
+    Read-only sequence of little-endian unsigned 32-bit integers stored in a
+    buffer such as an mmap, decoded on access so that opening it copies
+    nothing. Supports len(), indexing, and a fast L{bisect_right}.
+    """
+
+    _struct = struct.Struct('<I')
+
+    # bisect_right samples every BLOCK-th value, then decodes one block
+    BLOCK = 64
+    _block_struct = struct.Struct('<%dI' % BLOCK)
+
+    def __init__(self, buf, offset, count):
+        """
+        @param buf: buffer holding the integers
+        @type buf: str or mmap
+        @param offset: offset of the first integer in buf
+        @type offset: int
+        @param count: number of integers
+        @type count: int
+        """
+        self._buf = buf
+        self._offset = offset
+        self._count = count
+        self._samples = None
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError('MappedArray index out of range')
+        return self._struct.unpack_from(self._buf, self._offset + 4 * i)[0]
+
+    def bisect_right(self, x):
+        """
+        Same as C{bisect.bisect_right(self, x)} for a sorted array, but only
+        decodes O(log n) samples in Python and then a single block of values.
+        The samples are decoded on the first call.
+
+        @param x: value to search for
+        @type x: int
+        @return: index after the last value <= x
+        @rtype: int
+        """
+        if self._samples is None:
+            self._samples = array('I', [self[i] for i in
+                                        range(0, self._count, self.BLOCK)])
+
+        block = bisect.bisect_right(self._samples, x) - 1
+        if block < 0:
+            return 0
+
+        start = block * self.BLOCK
+        pos = self._offset + 4 * start
+        if start + self.BLOCK <= self._count:
+            values = self._block_struct.unpack_from(self._buf, pos)
+        else:
+            values = struct.unpack_from('<%dI' % (self._count - start), self._buf, pos)
+
+        return start + bisect.bisect_right(values, x)
 
@@ -0,0 +1,433 @@
+"""
+Usage - python -m unittest pygeoip_test
+
+Checks every lookup mode of pygeoip against STANDARD on the synthetic
+databases that benchmark.py -s generates, so that no download is needed.
+"""
+
+import gzip
+import multiprocessing
+import os
+import pickle
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+
+import pygeoip
+from pygeoip import const, snapshot, timezone
+from pygeoip.history import GeoIPHistory
+
+import benchmark
+
+def write_city(directory, records):
+    """
+    Write a City database with one (start, end, country_code, region, city,
+    postal_code, latitude, longitude, dma_code, area_code) record per range.
+    """
+    data = ['\0']
+    ranges = []
+    for record in records:
+        start, end, code, region, city, postal, lat, lon, dma, area = record
+        ranges.append((start, end, sum(len(d) for d in data)))
+        data.append(chr(const.COUNTRY_CODES.index(code)) +
+                    '\0'.join((region, city, postal)) + '\0' +
+                    struct.pack('<I', int((lat + 180) * 10000))[:3] +
+                    struct.pack('<I', int((lon + 180) * 10000))[:3] +
+                    struct.pack('<I', dma * 1000 + area)[:3])
+    nodes = benchmark.build_tree(ranges, 0)
+    filename = os.path.join(directory, 'GeoLiteCity.dat')
+    benchmark.write_dat(filename, nodes, len(nodes), ''.join(data),
+                        '\xff\xff\xff' + chr(const.CITY_EDITION_REV1) +
+                        struct.pack('<I', len(nodes))[:3])
+    return filename
+
+def write_country_v6(directory, networks):
+    """
+    Write an IPv6 Country database assigning the country codes of the
+    (network, prefix length, country_code) networks, broadest first.
+    """
+    nodes = [[('leaf', 0), ('leaf', 0)]]
+    for network, length, code in networks:
+        ipnum = pygeoip.util.ip2long(network)
+        index = 0
+        for depth in range(length):
+            bit = ipnum >> (127 - depth) & 1
+            if depth == length - 1:
+                nodes[index][bit] = ('leaf', const.COUNTRY_CODES.index(code))
+                break
+            if nodes[index][bit][0] == 'leaf':
+                # the new node inherits the value of the leaf it replaces
+                nodes.append([nodes[index][bit]] * 2)
+                nodes[index][bit] = ('node', len(nodes) - 1)
+            index = nodes[index][bit][1]
+    filename = os.path.join(directory, 'GeoIPv6.dat')
+    benchmark.write_dat(filename, nodes, const.COUNTRY_BEGIN, '',
+                        '\xff\xff\xff' + chr(const.COUNTRY_EDITION_V6))
+    return filename
+
+# database opened before a multiprocessing.Pool forks, for its workers
+_shared_gi = None
+
+def _shared_lookups(addrs):
+    return ([_shared_gi.org_by_addr(addr) for addr in addrs],
+            _shared_gi.org_by_addrs(addrs))
+
+class SyntheticDatabaseTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='pygeoip-test-')
+        self.databases = benchmark.write_synthetic(self.directory, 2000, 1)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def addrs(self, edition):
+        return benchmark.suite_addrs(self.databases[edition][1], 2000, 2)
+
+    def test_modes_match_standard(self):
+        for edition, single, batch in benchmark.SUITE_EDITIONS:
+            filename, ranges = self.databases[edition]
+            addrs = self.addrs(edition)
+            gi = pygeoip.GeoIP(filename, pygeoip.STANDARD)
+            expected = [getattr(gi, single)(addr) for addr in addrs]
+            snapshot_filename = filename + '.snapshot'
+            snapshot.compile_snapshot(filename, snapshot_filename)
+            modes = [(name, filename, flags)
+                     for name, flags in benchmark.MODES[1:]
+                     if edition == 'country' or not flags & pygeoip.RANGE_CACHE]
+            modes.append(('SNAPSHOT', snapshot_filename, 0))
+            for name, path, flags in modes:
+                gi = pygeoip.GeoIP(path, flags)
+                self.assertEqual(expected,
+                                 [getattr(gi, single)(addr) for addr in addrs],
+                                 '%s %s' % (edition, name))
+                self.assertEqual(expected, getattr(gi, batch)(addrs),
+                                 '%s %s in bulk' % (edition, name))
+
+    def test_range_table_sidecar(self):
+        filename, ranges = self.databases['country']
+        addrs = self.addrs('country')
+        expected = benchmark.expected_values(ranges, addrs, '')
+        # the first open writes the table, later ones read it
+        for i in range(2):
+            gi = pygeoip.GeoIP(filename, pygeoip.RANGE_CACHE)
+            self.assertEqual(expected, gi.country_code_by_addrs(addrs))
+        # a truncated table is rebuilt
+        with open(filename + '.ranges', 'r+b') as f:
+            f.truncate(100)
+        gi = pygeoip.GeoIP(filename, pygeoip.RANGE_CACHE)
+        self.assertEqual(expected, gi.country_code_by_addrs(addrs))
+
+    def test_history_of_snapshots(self):
+        for edition, single, batch in benchmark.SUITE_EDITIONS:
+            filename, ranges = self.databases[edition]
+            snapshot_filename = filename + '.snapshot'
+            snapshot.compile_snapshot(filename, snapshot_filename)
+            addrs = self.addrs(edition)
+            histories = [GeoIPHistory([('20130101', filename)]),
+                         GeoIPHistory([('20130101', snapshot_filename)])]
+            expected = benchmark.expected_values(
+                ranges, addrs, '' if edition == 'country' else None)
+            for history in histories:
+                self.assertEqual(expected,
+                                 getattr(history, batch)(addrs, '20130201'))
+
+    def test_gzipped_database(self):
+        filename, ranges = self.databases['country']
+        gzipped = os.path.join(self.directory, 'archive', 'GeoIP-20130101.dat.gz')
+        os.mkdir(os.path.dirname(gzipped))
+        with open(filename, 'rb') as f:
+            with gzip.open(gzipped, 'wb') as out:
+                out.write(f.read())
+        cache_home = os.path.join(self.directory, 'cache')
+        environ = dict(os.environ)
+        os.environ['XDG_CACHE_HOME'] = cache_home
+        try:
+            gi = pygeoip.GeoIP(gzipped, pygeoip.MMAP_CACHE)
+        finally:
+            os.environ.clear()
+            os.environ.update(environ)
+        addrs = self.addrs('country')
+        self.assertEqual(benchmark.expected_values(ranges, addrs, ''),
+                         gi.country_code_by_addrs(addrs))
+        # the copy is in the cache directory, not next to the archive
+        self.assertEqual(['GeoIP-20130101.dat.gz'],
+                         os.listdir(os.path.dirname(gzipped)))
+        self.assertEqual(1, len(os.listdir(os.path.join(cache_home, 'pygeoip'))))
+
+    def test_corrupt_gzipped_database(self):
+        gzipped = os.path.join(self.directory, 'GeoIP-20130101.dat.gz')
+        with open(gzipped, 'wb') as f:
+            f.write('\x1f\x8b not really gzipped')
+        cache_dir = os.path.join(self.directory, 'cache')
+        os.mkdir(cache_dir)
+        self.assertRaises(IOError, pygeoip._decompress_cached, gzipped, cache_dir)
+        self.assertEqual([], os.listdir(cache_dir))
+
+    def test_asn_records_decoded_once(self):
+        filename, ranges = self.databases['asn']
+        addrs = self.addrs('asn')
+        for flags in (pygeoip.STANDARD, pygeoip.MMAP_CACHE):
+            gi = pygeoip.GeoIP(filename, flags)
+            decoded = []
+            decode_org = gi._decode_org
+            gi._decode_org = lambda seek_org: (decoded.append(seek_org) or
+                                               decode_org(seek_org))
+            asns = gi.asn_by_addrs(addrs, with_name=True)
+            asns += [gi.asn_by_addr(addr, with_name=True) for addr in addrs]
+            self.assertEqual(sorted(set(decoded)), sorted(decoded))
+            # repeated ASNs share the same tuple
+            self.assertEqual(len(set(asns)), len(set(id(asn) for asn in asns)))
+
+    def test_standard_matches_ranges(self):
+        filename, ranges = self.databases['country']
+        addrs = self.addrs('country')
+        gi = pygeoip.GeoIP(filename)
+        self.assertEqual(benchmark.expected_values(ranges, addrs, ''),
+                         [gi.country_code_by_addr(addr) for addr in addrs])
+
+    def test_lookup_cache(self):
+        filename, ranges = self.databases['country']
+        a, b, c, d = self.addrs('country')[:4]
+        gi = pygeoip.GeoIP(filename, cache_size=3)
+        uncached = pygeoip.GeoIP(filename)
+        self.assertEqual(None, uncached.cache_info())
+        for addr in (a, b, c, a, d, b):
+            self.assertEqual(uncached.country_code_by_addr(addr),
+                             gi.country_code_by_addr(addr))
+        # a is hit, d evicts b, and b evicts c
+        self.assertEqual({'hits': 1, 'misses': 5, 'evictions': 2,
+                          'size': 3, 'maxsize': 3}, gi.cache_info())
+        # batches share the cache with single lookups; c evicts d
+        self.assertEqual(uncached.country_code_by_addrs([a, b, c]),
+                         gi.country_code_by_addrs([a, b, c]))
+        self.assertEqual({'hits': 3, 'misses': 6, 'evictions': 3,
+                          'size': 3, 'maxsize': 3}, gi.cache_info())
+
+    def test_asn_lookups(self):
+        filename, ranges = self.databases['asn']
+        addrs = self.addrs('asn')
+        names = benchmark.expected_values(ranges, addrs, None)
+        self.assertTrue(None in names)
+        # the synthetic names look like 'AS12 Synthetic Org 12'
+        expected = [(int(name[2:name.index(' ')]), name[name.index(' ') + 1:])
+                    if name else None for name in names]
+        numbers = [asn[0] if asn else None for asn in expected]
+        ipnums = [pygeoip.util.ip2long(addr) for addr in addrs]
+        for flags in (pygeoip.STANDARD, pygeoip.MMAP_CACHE):
+            gi = pygeoip.GeoIP(filename, flags)
+            self.assertEqual(numbers, gi.asn_by_addrs(addrs))
+            self.assertEqual(expected, gi.asn_by_addrs(addrs, with_name=True))
+            self.assertEqual(numbers, [gi.asn_by_addr(addr) for addr in addrs])
+            self.assertEqual(expected, [gi.asn_by_addr(addr, with_name=True)
+                                        for addr in addrs])
+            self.assertEqual(numbers, gi.asn_by_addrs(ipnums))
+        gi = pygeoip.GeoIP(self.databases['country'][0])
+        self.assertRaises(pygeoip.GeoIPError, gi.asn_by_addr, addrs[0])
+        self.assertRaises(pygeoip.GeoIPError, gi.asn_by_addrs, addrs)
+
+    def test_stack(self):
+        country_filename, country_ranges = self.databases['country']
+        asn_filename, asn_ranges = self.databases['asn']
+        addrs = self.addrs('asn')
+        codes = benchmark.expected_values(country_ranges, addrs, '')
+        names = benchmark.expected_values(asn_ranges, addrs, None)
+        expected = [{'country_code': code, 'org': name,
+                     'asn': int(name[2:name.index(' ')]) if name else None}
+                    for code, name in zip(codes, names)]
+        for flags in (pygeoip.STANDARD, pygeoip.MMAP_CACHE | pygeoip.INDEX_CACHE):
+            stack = pygeoip.GeoIPStack([pygeoip.GeoIP(country_filename, flags),
+                                        pygeoip.GeoIP(asn_filename, flags)])
+            self.assertEqual(expected, stack.records_by_addrs(addrs))
+            self.assertEqual(expected,
+                             [stack.record_by_addr(addr) for addr in addrs])
+        # the first database that provides a field wins
+        other = pygeoip.GeoIP(asn_filename)
+        other._read_org = lambda seek_org: 'AS1 Other'
+        stack = pygeoip.GeoIPStack([pygeoip.GeoIP(asn_filename), other])
+        for record in expected:
+            del record['country_code']
+        self.assertEqual(expected, stack.records_by_addrs(addrs))
+        self.assertRaises(pygeoip.GeoIPError, stack.record_by_addr, 'example.com')
+        self.assertRaises(pygeoip.GeoIPError, pygeoip.GeoIPStack, [])
+        v6 = pygeoip.GeoIP(write_country_v6(self.directory,
+                                            [('2001:db8::', 32, 'DE')]))
+        self.assertRaises(pygeoip.GeoIPError, pygeoip.GeoIPStack, [v6, other])
+
+class AddressTest(unittest.TestCase):
+    V6_ADDRS = [('2001:db8::1', 'DE'), ('2001:db8:1::1', 'FR'),
+                ('2001:db8:2::1', 'DE'), ('2400:1::1', 'JP'),
+                ('2a00::1', ''), ('::1', '')]
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='pygeoip-test-')
+        self.v6_filename = write_country_v6(self.directory, [
+            ('2001:db8::', 32, 'DE'), ('2001:db8:1::', 48, 'FR'),
+            ('2400::', 12, 'JP')])
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_ip2long(self):
+        self.assertEqual(0x0a010101, pygeoip.util.ip2long('10.1.1.1'))
+        self.assertEqual(0x20010db8 << 96 | 1,
+                         pygeoip.util.ip2long('2001:db8::1'))
+        # only four decimal octets, as before inet_aton was used
+        for ip in ('010.1.1.1', '1.2.3.0x10', '1.2.3.4 junk', '127.1',
+                   '1.2.3.256', ''):
+            self.assertRaises(ValueError, pygeoip.util.ip2long, ip)
+
+    def test_country_v6(self):
+        addrs = [addr for addr, code in AddressTest.V6_ADDRS]
+        expected = [code for addr, code in AddressTest.V6_ADDRS]
+        for name, flags in benchmark.MODES:
+            if flags & pygeoip.RANGE_CACHE:
+                continue
+            gi = pygeoip.GeoIP(self.v6_filename, flags)
+            self.assertEqual(expected,
+                             [gi.country_code_by_addr(addr) for addr in addrs],
+                             name)
+            self.assertEqual(expected, gi.country_code_by_addrs(addrs), name)
+        self.assertRaises(pygeoip.GeoIPError, gi.country_code_by_addr,
+                          '10.1.1.1')
+
+    def test_integer_addresses(self):
+        gi = pygeoip.GeoIP(self.v6_filename)
+        ipnums = [pygeoip.util.ip2long(addr)
+                  for addr, code in AddressTest.V6_ADDRS]
+        expected = [code for addr, code in AddressTest.V6_ADDRS]
+        self.assertEqual(expected, [gi.country_code_by_addr(ipnum)
+                                    for ipnum in ipnums])
+        self.assertEqual(expected, gi.country_code_by_addrs(ipnums))
+
+        databases = benchmark.write_synthetic(self.directory, 200, 1)
+        filename, ranges = databases['country']
+        gi = pygeoip.GeoIP(filename)
+        addrs = benchmark.suite_addrs(ranges, 200, 2)
+        ipnums = [pygeoip.util.ip2long(addr) for addr in addrs]
+        self.assertEqual(gi.country_code_by_addrs(addrs),
+                         gi.country_code_by_addrs(ipnums))
+        self.assertEqual(gi.country_code_by_addr(addrs[0]),
+                         gi.country_code_by_addr(ipnums[0]))
+        self.assertRaises(pygeoip.GeoIPError, gi.country_code_by_addr, 1 << 32)
+
+class ConcurrencyTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='pygeoip-test-')
+        self.filename, ranges = benchmark.write_synthetic(
+            self.directory, 2000, 1)['asn']
+        self.addrs = benchmark.suite_addrs(ranges, 2000, 2)
+        self.expected = benchmark.expected_values(ranges, self.addrs, None)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_threads(self):
+        # the lookup cache is smaller than the batch, so the threads keep
+        # evicting each other's entries
+        gi = pygeoip.GeoIP(self.filename, pygeoip.STANDARD, cache_size=500)
+        results = []
+        def lookups():
+            results.append([gi.org_by_addr(addr) for addr in self.addrs])
+            results.append(gi.org_by_addrs(self.addrs))
+        threads = [threading.Thread(target=lookups) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([self.expected] * 16, results)
+        info = gi.cache_info()
+        self.assertEqual(8 * 2 * len(self.addrs), info['hits'] + info['misses'])
+        self.assertEqual(500, info['size'])
+        self.assertTrue(info['evictions'] > 0)
+
+    def test_forked_pool(self):
+        global _shared_gi
+        chunks = [self.addrs[i:i + 250] for i in range(0, len(self.addrs), 250)]
+        for flags in (pygeoip.STANDARD, pygeoip.MMAP_CACHE):
+            _shared_gi = pygeoip.GeoIP(self.filename, flags)
+            pool = multiprocessing.Pool(4)
+            try:
+                # a worker that dies would otherwise hang map()
+                results = pool.map_async(_shared_lookups, chunks).get(60)
+            finally:
+                pool.terminate()
+                pool.join()
+                _shared_gi = None
+            for single, batch in results:
+                self.assertEqual(single, batch)
+            self.assertEqual(self.expected,
+                             sum((single for single, batch in results), []))
+
+class RecordTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='pygeoip-test-')
+        self.filename = write_city(self.directory, [
+            (0x01000000, 0x01ffffff, 'US', 'NY', 'New York', '10001',
+             40.75, -73.99, 501, 212),
+            (0x02000000, 0x02ffffff, 'DE', '16', 'Berlin', '',
+             52.52, 13.41, 0, 0)])
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_pickle(self):
+        for flags in (pygeoip.STANDARD, pygeoip.MEMORY_CACHE,
+                      pygeoip.MMAP_CACHE):
+            gi = pygeoip.GeoIP(self.filename, flags)
+            for addr in ('1.2.3.4', '2.2.3.4'):
+                record = gi.record_by_addr(addr)
+                for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+                    data = pickle.dumps(record, protocol)
+                    # the record, not the whole database
+                    self.assertTrue(len(data) < 200)
+                    self.assertEqual(record.to_dict(),
+                                     pickle.loads(data).to_dict())
+
+    def test_fields(self):
+        gi = pygeoip.GeoIP(self.filename)
+        record = gi.record_by_addr('1.2.3.4')
+        self.assertEqual(('US', 'NY', 'New York', '10001', 501, 212),
+                         (record.country_code, record.region_name,
+                          record.city, record.postal_code, record.dma_code,
+                          record.area_code))
+        self.assertAlmostEqual(40.75, record.latitude, 3)
+        self.assertEqual(None, gi.record_by_addr('3.2.3.4'))
+
+class TimeZoneTest(unittest.TestCase):
+    def test_concurrent_first_lookups(self):
+        # every thread races to build the index on its first lookup
+        results = []
+        for i in range(20):
+            timezone._index = None
+            threads = [threading.Thread(target=lambda: results.append(
+                timezone.time_zone_by_country_and_region('US', 'NY')))
+                for j in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(['America/New_York'] * 160, results)
+
+    def test_lazy_reexport(self):
+        self.assertEqual('America/New_York',
+                         pygeoip.time_zone_by_country_and_region('US', 'NY'))
+        self.assertEqual('Europe/Paris',
+                         pygeoip.time_zone_by_country_and_region('FR'))
+        self.assertEqual(None, pygeoip.time_zone_by_country_and_region(None))
+
+class ImportTest(unittest.TestCase):
+    def test_tables_not_imported(self):
+        # a fresh interpreter, since this one has imported everything
+        script = ('import sys, pygeoip; '
+                  'print(sorted(name for name in sys.modules if name in '
+                  '("pygeoip.tables", "pygeoip.timezone", "gzip")))')
+        output = subprocess.check_output([sys.executable, '-c', script],
+            cwd=os.path.dirname(os.path.abspath(__file__)))
+        self.assertEqual('[]', output.strip())
+
+if __name__ == '__main__':
+    unittest.main()
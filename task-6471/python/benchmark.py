@@ -0,0 +1,233 @@
+"""
+Usage - python benchmark.py -h
+Times loading a combined database file like the one that the Java
+DatabasePerformanceExample writes, geoip-2007-10-2012-09.csv, and the
+lookups in it.  Without such a file, -g writes a synthetic one in the same
+format first.
+
+Lookups are the 100000 random (address, date) test cases that
+DatabasePerformanceExample generates, so that timings can be compared with
+the Java implementation.  If its test-cases-2007-10-2012-09.csv exists, the
+results are checked against the expected codes in there, too.
+
+With -b, the combined file is also converted to the binary format, and
+opening that and the lookups in it are timed as well.
+
+With -c, lookups of the same relays in daily consensuses of one month are
+timed with and without a lookup cache of the given size.
+"""
+
+import datetime
+import gc
+import os
+import random
+import sys
+import time
+
+from optparse import OptionParser
+
+from pygeodate import Database
+
+class JavaRandom:
+  """The linear congruential generator of java.util.Random."""
+
+  MULTIPLIER = 0x5DEECE66D
+  MASK = (1 << 48) - 1
+
+  def __init__(self, seed):
+    self.seed = (seed ^ JavaRandom.MULTIPLIER) & JavaRandom.MASK
+
+  def next(self, bits):
+    self.seed = (self.seed * JavaRandom.MULTIPLIER + 0xB) & JavaRandom.MASK
+    result = self.seed >> (48 - bits)
+    # Results are signed 32 bit ints in Java.
+    if result >= 1 << 31:
+      result -= 1 << 32
+    return result
+
+  def next_long(self):
+    result = (self.next(32) << 32) + self.next(32)
+    return ((result + (1 << 63)) & ((1 << 64) - 1)) - (1 << 63)
+
+  def next_int(self, n):
+    if n & -n == n:
+      return (n * self.next(31)) >> 31
+    while True:
+      bits = self.next(31)
+      result = bits % n
+      if bits - result + (n - 1) < 1 << 31:
+        return result
+
+def write_synthetic(path, ranges, databases, seed=1):
+  """Write a combined file with the given number of address ranges and
+  monthly databases, in descending key order like the Java importer."""
+  rnd = random.Random(seed)
+  dates = []
+  day = datetime.date(2007, 10, 1)
+  for i in range(databases):
+    dates.append(day.strftime('%Y%m%d'))
+    day = (day + datetime.timedelta(days=32)).replace(day=1)
+  codes = ['us', 'de', 'cn', 'jp', 'gb', 'fr', 'ca', 'kr', 'br', 'it']
+  lines = []
+  address = 1 << 24
+  for i in range(ranges):
+    size = 1 << rnd.randint(8, 16)
+    start, end = address, address + size - 1
+    address += size + rnd.choice([0, 0, 0, 256])
+    # Split the databases into a few periods with the same code, with
+    # occasional gaps where the range is missing.
+    first = 0
+    while first < len(dates):
+      last = min(len(dates) - 1, first + rnd.randint(0, len(dates)))
+      if rnd.random() < 0.9:
+        lines.append((Database.create_key(start, first), start, end,
+                      rnd.choice(codes), dates[first], dates[last]))
+      first = last + 1
+  lines.sort(reverse=True)
+  with open(path, 'w') as output_file:
+    for date in reversed(dates):
+      output_file.write('!%s!GeoIP-%s.dat\n' % (date, date))
+    for key, start, end, code, start_date, end_date in lines:
+      output_file.write('%s,%s,%s,%s,%s\n' % (address_string(start),
+          address_string(end), code, start_date, end_date))
+  return len(lines)
+
+def address_string(address):
+  return '%d.%d.%d.%d' % (address >> 24, (address >> 16) & 255,
+                          (address >> 8) & 255, address & 255)
+
+def time_load(path):
+  gc.collect()
+  start = time.time()
+  db = Database()
+  db.load_combined_databases(path)
+  return db, time.time() - start
+
+def time_open_binary(path):
+  start = time.time()
+  db = Database.open_binary(path)
+  return db, time.time() - start
+
+def java_test_cases(count=100000):
+  """Return the (address, date) test cases of DatabasePerformanceExample,
+  in the order in which it generates them."""
+  rnd = JavaRandom(1)
+  start_date = Database.date_string_to_number('20071001')
+  end_date = Database.date_string_to_number('20120930')
+  # Dec 1--3, 2009 are skipped, because the first available database from
+  # December 2009 was published on the 4th.
+  skip_dates = set(Database.date_string_to_number(date)
+                   for date in ('20091201', '20091202', '20091203'))
+  epoch = datetime.date(1970, 1, 1)
+  tests = []
+  while len(tests) < count:
+    address = rnd.next_long() & ((1 << 32) - 1)
+    date = start_date + rnd.next_int(end_date - start_date)
+    if date not in skip_dates:
+      tests.append((address_string(address),
+          (epoch + datetime.timedelta(days=date)).strftime('%Y%m%d')))
+  return tests
+
+def read_test_cases(path):
+  with open(path) as input_file:
+    return [tuple(line.strip().split(',')) for line in input_file]
+
+def time_lookups(db, tests):
+  start = time.time()
+  results = [db.lookup_address_and_date(address, date)
+             for address, date in tests]
+  return results, time.time() - start
+
+def time_bulk_lookups(db, tests):
+  start = time.time()
+  results = db.lookup_addresses_and_dates(tests)
+  return results, time.time() - start
+
+def relay_test_cases(tests, relays, month):
+  """Return lookups of the addresses of the first test cases on every day
+  of a month, like those of relays in a month of consensuses."""
+  addresses = [address for address, date in tests[:relays]]
+  return [(address, '%s%02d' % (month, day))
+          for day in range(1, 29) for address in addresses]
+
+def time_cache(db, tests, cache_size):
+  results = []
+  for size in (0, cache_size):
+    db.cache_size = size
+    db.clear_cache()
+    results.append(time_lookups(db, tests) + (db.cache_info(),))
+  db.cache_size = 0
+  db.clear_cache()
+  return results
+
+def parse_args():
+  usage = "Usage - python benchmark.py [options] [combined database]"
+  parser = OptionParser(usage)
+  parser.add_option("-g", "--generate", dest="generate", type="int",
+                    default=0, help="Write a synthetic combined file with "
+                    "this many address ranges to the given path first")
+  parser.add_option("-d", "--databases", dest="databases", type="int",
+                    default=60, help="Number of monthly databases in a "
+                    "synthetic file [default: %default]")
+  parser.add_option("-r", "--repeat", dest="repeat", type="int",
+                    default=3, help="Number of loads to time "
+                    "[default: %default]")
+  parser.add_option("-l", "--lookups", dest="lookups", type="int",
+                    default=100000, help="Number of test cases to time "
+                    "if there is no test cases file [default: %default]")
+  parser.add_option("-t", "--test-cases", dest="test_cases",
+                    default="test-cases-2007-10-2012-09.csv",
+                    help="Test cases with expected codes written by "
+                    "DatabasePerformanceExample [default: %default]")
+  parser.add_option("-b", "--binary", dest="binary", default=None,
+                    help="Also convert to a binary database at this path "
+                    "and time lookups in it")
+  parser.add_option("-c", "--cache-size", dest="cache_size", type="int",
+                    default=0, help="Also time lookups of the same relays "
+                    "over a month with a cache of this many blocks")
+  (options, args) = parser.parse_args()
+  if len(args) > 1:
+    parser.error("expected at most one combined database")
+  return options, (args or ['geoip-2007-10-2012-09.csv'])[0]
+
+if __name__ == "__main__":
+  options, path = parse_args()
+  if options.generate:
+    lines = write_synthetic(path, options.generate, options.databases)
+    print "Wrote %d lines to %s" % (lines, path)
+  timings = []
+  for i in range(options.repeat):
+    db, seconds = time_load(path)
+    timings.append(seconds)
+  print "Loaded %d ranges of %d databases in %.2f s (best of %d)" % (
+      len(db.keys), len(db.dates), min(timings), options.repeat)
+  if os.path.exists(options.test_cases):
+    tests = read_test_cases(options.test_cases)
+  elif options.lookups:
+    tests = java_test_cases(options.lookups)
+  else:
+    sys.exit(0)
+  databases = [('text', db)]
+  if options.binary:
+    db.save_binary(options.binary)
+    binary_db, seconds = time_open_binary(options.binary)
+    print "Opened binary database in %.2f ms" % (seconds * 1e3)
+    databases.append(('binary', binary_db))
+  for name, db in databases:
+    if options.cache_size:
+      relay_tests = relay_test_cases(tests, 5000, db.dates[-1][:6])
+      for (results, seconds, info) in time_cache(db, relay_tests,
+                                                 options.cache_size):
+        print "Looked up %d relay addresses in %s database with cache " \
+            "size %d in %.2f s (%.1f us per lookup, %d hits, %d misses)" % (
+            len(relay_tests), name, info['max_size'], seconds,
+            seconds * 1e6 / len(relay_tests), info['hits'], info['misses'])
+    for kind, timer in [('', time_lookups), (' in bulk', time_bulk_lookups)]:
+      results, seconds = timer(db, [test[:2] for test in tests])
+      print "Looked up %d addresses%s in %s database in %.2f s " \
+          "(%.1f us per lookup)" % (len(tests), kind, name, seconds,
+                                    seconds * 1e6 / len(tests))
+      if tests and len(tests[0]) == 3:
+        failures = sum(1 for test, result in zip(tests, results)
+                       if test[2] != result)
+        print "%d out of %d tests failed." % (failures, len(tests))
@@ -1,88 +1,855 @@
+import array
+import binascii
 import bisect
+import collections
 import datetime
+import mmap
+import os
+import socket
+import struct
+import sys
 
-class Range:
-  def __init__(self, line):
-    parts = line.split(',')
-    # TODO Extend to IPv6.  The cool thing in Python is that ints have
-    # variable size, so we can use 48 bit keys for IPv4 (32 bit for the
-    # IPv4 address and 16 bit for the database date) and 144 bit keys for
-    # IPv6.
-    self.start_address = Database.address_string_to_number(parts[0])
-    self.end_address = Database.address_string_to_number(parts[1])
-    self.code = parts[2]
-    self.start_date = Database.date_string_to_number(parts[3])
-    self.end_date = Database.date_string_to_number(parts[4])
-    self.key = Database.create_key(self.start_address, self.start_date)
+# Typecode for 48 bit keys: 'Q' where the array module has it, otherwise
+# 'L' on platforms where that is 64 bits wide.
+if 'Q' in getattr(array, 'typecodes', ''):
+  KEY_TYPECODE = 'Q'
+elif array.array('L').itemsize >= 8:
+  KEY_TYPECODE = 'L'
+else:
+  raise ImportError('pygeodate needs 64 bit array items for its keys, but '
+                    'the array module has neither typecode Q nor a 64 bit L')
+
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+ADDRESS_STRUCT = struct.Struct('!I')
+
+# Binary format: one or more sections, the first with all ranges at the
+# time of writing, and the others with the delta segments of databases
+# appended later.  Sections have a header with the number of IPv4 ranges
+# and spans, IPv6 ranges and spans, dates, and the size of the code table,
+# followed by the little-endian IPv4 range arrays (keys, end addresses,
+# start dates, end dates, codes), IPv4 span starts and offsets, IPv6 range
+# arrays (start dates, end dates, codes), IPv6 span offsets, packed IPv6
+# span starts and ends, dates as yyyymmdd, and the codes that the section
+# adds to the code table, separated by newlines.
+BINARY_MAGIC = 'PGDB'
+BINARY_VERSION = 3
+BINARY_HEADER = struct.Struct('<4sHxxIIIIII')
+BINARY_ARRAYS = [('keys', 'Q'), ('end_addresses', 'I'), ('start_dates', 'H'),
+                 ('end_dates', 'H'), ('codes', 'I')]
+BINARY_IPV6_ARRAYS = [('v6_start_dates', 'H'), ('v6_end_dates', 'H'),
+                      ('v6_codes', 'I')]
+
+# Lookups search the delta segments one by one, so the append command
+# merges them into the other ranges once there are more than this many.
+MAX_SEGMENTS = 12
+
+class MappedArray:
+  """Read-only array of little-endian values in a buffer, like the range
+  arrays of a Database opened with open_binary."""
+
+  # Number of values that bisect_right unpacks at once.
+  BLOCK_SIZE = 64
+
+  def __init__(self, buf, offset, typecode, count):
+    self.buf = buf
+    self.offset = offset
+    self.count = count
+    self.item_struct = struct.Struct('<' + typecode)
+    self.itemsize = self.item_struct.size
+    self.typecode = typecode
+
+  def __len__(self):
+    return self.count
+
+  def __getitem__(self, index):
+    if index < 0:
+      index += self.count
+    if not 0 <= index < self.count:
+      raise IndexError('MappedArray index out of range')
+    return self.item_struct.unpack_from(self.buf,
+        self.offset + index * self.itemsize)[0]
+
+  def __setitem__(self, index, value):
+    # Only works for buffers of writable mappings.
+    if not 0 <= index < self.count:
+      raise IndexError('MappedArray index out of range')
+    self.item_struct.pack_into(self.buf,
+        self.offset + index * self.itemsize, value)
+
+  def __iter__(self):
+    for index in xrange(self.count):
+      yield self[index]
+
+  def values(self, lo, hi):
+    return struct.unpack_from('<%d%s' % (hi - lo, self.typecode), self.buf,
+                              self.offset + lo * self.itemsize)
+
+  def bisect_right(self, value, lo, hi):
+    unpack_from, buf = self.item_struct.unpack_from, self.buf
+    offset, itemsize = self.offset, self.itemsize
+    while hi - lo > MappedArray.BLOCK_SIZE:
+      mid = (lo + hi) // 2
+      if value < unpack_from(buf, offset + mid * itemsize)[0]:
+        hi = mid
+      else:
+        lo = mid + 1
+    return lo + bisect.bisect(self.values(lo, hi), value)
+
+class PackedAddresses:
+  """Read-only array of packed 16 byte IPv6 addresses, stored back to back
+  in a string or buffer.  Packed addresses compare like the numbers they
+  stand for, so they are kept sorted and bisected as strings."""
+
+  WIDTH = 16
+
+  def __init__(self, buf, offset, count):
+    self.buf = buf
+    self.offset = offset
+    self.count = count
+
+  def __len__(self):
+    return self.count
+
+  def __getitem__(self, index):
+    if index < 0:
+      index += self.count
+    if not 0 <= index < self.count:
+      raise IndexError('PackedAddresses index out of range')
+    start = self.offset + index * PackedAddresses.WIDTH
+    return self.buf[start:start + PackedAddresses.WIDTH]
+
+  def __iter__(self):
+    for index in xrange(self.count):
+      yield self[index]
+
+  def data(self):
+    return self.buf[self.offset:self.offset +
+                    self.count * PackedAddresses.WIDTH]
+
+  def bisect_right(self, value, lo, hi):
+    buf, offset, width = self.buf, self.offset, PackedAddresses.WIDTH
+    while lo < hi:
+      mid = (lo + hi) // 2
+      start = offset + mid * width
+      if value < buf[start:start + width]:
+        hi = mid
+      else:
+        lo = mid + 1
+    return lo
+
+def bisect_right(values, value, lo, hi):
+  if isinstance(values, (MappedArray, PackedAddresses)):
+    return values.bisect_right(value, lo, hi)
+  return bisect.bisect(values, value, lo, hi)
+
+def packed_to_number(packed):
+  return long(binascii.hexlify(packed), 16)
+
+def number_to_packed(number):
+  return binascii.unhexlify('%032x' % number)
+
+def split_ranges(ranges):
+  # Split (start, end, start date, end date, code) ranges with integer
+  # addresses where any other range starts or ends, so that the pieces of
+  # any two ranges are identical or disjoint, and return the pieces as
+  # (start, start date, end, end date, code) tuples sorted by start address
+  # and start date.  Of pieces with the same start address and start date,
+  # the one of the first range is kept.
+  bounds = sorted(set([r[0] for r in ranges]) |
+                  set([r[1] + 1 for r in ranges]))
+  pieces = {}
+  for start, end, start_date, end_date, code in ranges:
+    pos = bisect.bisect_right(bounds, start)
+    while start <= end:
+      piece_end = min(end, bounds[pos] - 1)
+      pieces.setdefault((start, start_date), (piece_end, end_date, code))
+      start = piece_end + 1
+      pos += 1
+  return [key + value for key, value in sorted(pieces.items())]
 
 class Database:
-  def __init__(self):
-    # TODO Replace with crit-bit tree if performance becomes a problem;
-    # alternatively, use an OrderedDict which is the equivalent of
-    # LinkedHashMap in Java.
-    self.data = []
+  def __init__(self, cache_size=0):
+    # Ranges are stored in parallel arrays sorted by key, and codes as
+    # indexes into code_table, so that there are no objects per range.
+    self.keys = array.array(KEY_TYPECODE)
+    self.end_addresses = array.array('I')
+    self.start_dates = array.array('H')
+    self.end_dates = array.array('H')
+    self.codes = array.array('I')
+    self.code_table = []
+    self.code_numbers = {}
     self.dates = []
-    self.keys = []
+    # Day numbers of database dates, converted on first use.
+    self.date_numbers = {}
+    # Index of spans, that is, runs of ranges with the same start address,
+    # with the first position of each span in the range arrays and the
+    # position after the last span at the end.
+    self.span_starts = array.array('I')
+    self.span_offsets = array.array('I', [0])
+    # IPv6 ranges are kept apart, so that the IPv4 ones can keep their
+    # compact integer keys.  They are sorted by packed start address and
+    # start date, and indexed by spans in the same way.
+    self.v6_start_dates = array.array('H')
+    self.v6_end_dates = array.array('H')
+    self.v6_codes = array.array('I')
+    self.v6_span_starts = PackedAddresses('', 0, 0)
+    self.v6_span_ends = PackedAddresses('', 0, 0)
+    self.v6_span_offsets = array.array('I', [0])
+    # Delta segments of appended databases as (date number, Database)
+    # tuples, oldest first.  Segments share the code table.
+    self.segments = []
+    # Mapped file of a database opened from a binary file, and whether it
+    # was opened writable.
+    self.buf = self.path = None
+    self.writable = False
+    # Optional cache of IPv4 lookup results by /24 block and database
+    # date.  When full, the oldest entry is evicted, with the keys kept in
+    # insertion order in a deque.  Hits don't move entries, because keeping
+    # them in LRU order would cost about as much as the lookups it saves.
+    self.cache_size = cache_size
+    self.clear_cache()
 
   @staticmethod
   def address_string_to_number(address_string):
-    octets = address_string.split('.')
-    return long(''.join(["%02X" % long(octet) for octet in octets]), 16)
+    return ADDRESS_STRUCT.unpack(socket.inet_pton(socket.AF_INET,
+                                                 address_string))[0]
+
+  @staticmethod
+  def address_string_to_packed(address_string):
+    return socket.inet_pton(socket.AF_INET6, address_string)
 
   @staticmethod
   def date_string_to_number(date_string):
-    date_datetime = datetime.datetime.strptime(date_string, '%Y%m%d')
-    # Divide seconds by 86400=24*60*60 for number of days since 19700101
-    return int(date_datetime.strftime('%s')) / 86400
+    # Number of days since 19700101 in UTC, like the Java implementation.
+    date = datetime.date(int(date_string[:4]), int(date_string[4:6]),
+                         int(date_string[6:8]))
+    return date.toordinal() - EPOCH_ORDINAL
 
   @staticmethod
   def create_key(address, date):
     return (address << 16) + date
 
+  def code_number(self, code):
+    number = self.code_numbers.get(code)
+    if number is None:
+      number = self.code_numbers[code] = len(self.code_table)
+      self.code_table.append(code)
+    return number
+
+  def clear_cache(self):
+    self.cache = {} if self.cache_size else None
+    self.cache_keys = collections.deque()
+    self.cache_hits = self.cache_misses = self.cache_evictions = 0
+
+  def cache_info(self):
+    return {'hits': self.cache_hits, 'misses': self.cache_misses,
+            'evictions': self.cache_evictions,
+            'size': len(self.cache) if self.cache is not None else 0,
+            'max_size': self.cache_size}
+
   def load_combined_databases(self, path):
+    self.clear_cache()
+    dates = set(self.dates)
+    # Files contain few distinct dates, so convert each of them only once.
+    day_numbers = {}
+    def day_number(date_string):
+      number = day_numbers.get(date_string)
+      if number is None:
+        number = day_numbers[date_string] = \
+            Database.date_string_to_number(date_string)
+      return number
+    # Bind everything used per line to locals, which is noticeably faster
+    # than attribute lookups for millions of lines.
+    unpack_address = ADDRESS_STRUCT.unpack
+    inet_pton = socket.inet_pton
+    AF_INET = socket.AF_INET
+    code_number = self.code_number
+    keys = array.array(KEY_TYPECODE)
+    end_addresses = array.array('I')
+    start_dates = array.array('H')
+    end_dates = array.array('H')
+    codes = array.array('I')
+    # The Java importer writes ranges in descending key order, so we only
+    # need to reverse them, unless the file turns out to be unsorted.
+    descending = True
+    last_key = None
+    v6_ranges = []
     with open(path) as input_file:
       for line in input_file:
         line = line.strip()
+        if not line:
+          continue
         if line.startswith('!'):
-          date = line.split("!")[1]
-          if date not in self.dates:
-            bisect.insort(self.dates, date)
+          dates.add(line.split("!")[1])
+          continue
+        start, end, code, start_date, end_date = line.split(',')
+        if ':' in start:
+          v6_ranges.append((Database.address_string_to_packed(start),
+                            day_number(start_date),
+                            Database.address_string_to_packed(end),
+                            day_number(end_date), code_number(code)))
+          continue
+        start_date = day_number(start_date)
+        key = (unpack_address(inet_pton(AF_INET, start))[0] << 16) + start_date
+        if last_key is not None and key >= last_key:
+          descending = False
+        last_key = key
+        keys.append(key)
+        end_addresses.append(unpack_address(inet_pton(AF_INET, end))[0])
+        start_dates.append(start_date)
+        end_dates.append(day_number(end_date))
+        codes.append(code_number(code))
+    self.dates = sorted(dates)
+    if descending and len(self.keys) == 0:
+      for values in (keys, end_addresses, start_dates, end_dates, codes):
+        values.reverse()
+      self.keys, self.end_addresses = keys, end_addresses
+      self.start_dates, self.end_dates, self.codes = \
+          start_dates, end_dates, codes
+    else:
+      self.keys.extend(keys)
+      self.end_addresses.extend(end_addresses)
+      self.start_dates.extend(start_dates)
+      self.end_dates.extend(end_dates)
+      self.codes.extend(codes)
+      self.sort_ranges()
+    self.build_index()
+    if v6_ranges:
+      self.set_ipv6_ranges(sorted(v6_ranges + list(self.ipv6_ranges())))
+
+  def sort_ranges(self):
+    keys = self.keys
+    order = sorted(xrange(len(keys)), key=keys.__getitem__)
+    for name in ('keys', 'end_addresses', 'start_dates', 'end_dates',
+                 'codes'):
+      values = getattr(self, name)
+      setattr(self, name, array.array(values.typecode,
+                                      [values[i] for i in order]))
+
+  def build_index(self):
+    # Address ranges of different databases are either identical or
+    # disjoint, so all ranges starting at the same address end at the same
+    # address, and their date ranges are disjoint and sorted by start date.
+    starts = [key >> 16 for key in self.keys]
+    offsets = [pos for pos in xrange(len(starts))
+               if pos == 0 or starts[pos] != starts[pos - 1]]
+    self.span_starts = array.array('I', [starts[pos] for pos in offsets])
+    self.span_offsets = array.array('I', offsets + [len(starts)])
+
+  def ipv6_ranges(self):
+    # Yield IPv6 ranges as (start, start date, end, end date, code number)
+    # tuples with packed addresses.
+    for span in xrange(len(self.v6_span_starts)):
+      start, end = self.v6_span_starts[span], self.v6_span_ends[span]
+      for pos in xrange(self.v6_span_offsets[span],
+                        self.v6_span_offsets[span + 1]):
+        yield (start, self.v6_start_dates[pos], end,
+               self.v6_end_dates[pos], self.v6_codes[pos])
+
+  def set_ipv6_ranges(self, ranges):
+    # Replace IPv6 ranges by the given tuples, sorted by start address and
+    # start date.
+    start_dates = array.array('H')
+    end_dates = array.array('H')
+    codes = array.array('I')
+    span_starts, span_ends = [], []
+    span_offsets = array.array('I')
+    for pos, (start, start_date, end, end_date, code) in enumerate(ranges):
+      if not span_starts or span_starts[-1] != start:
+        span_starts.append(start)
+        span_ends.append(end)
+        span_offsets.append(pos)
+      start_dates.append(start_date)
+      end_dates.append(end_date)
+      codes.append(code)
+    span_offsets.append(len(codes))
+    self.v6_start_dates, self.v6_end_dates, self.v6_codes = \
+        start_dates, end_dates, codes
+    self.v6_span_starts = PackedAddresses(''.join(span_starts), 0,
+                                          len(span_starts))
+    self.v6_span_ends = PackedAddresses(''.join(span_ends), 0,
+                                        len(span_ends))
+    self.v6_span_offsets = span_offsets
+
+  def write_section(self, output_file, dates, codes):
+    code_table = '\n'.join(codes)
+    output_file.write(BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION,
+        len(self.keys), len(self.span_starts), len(self.v6_codes),
+        len(self.v6_span_starts), len(dates), len(code_table)))
+    for name, typecode in BINARY_ARRAYS + [('span_starts', 'I'),
+        ('span_offsets', 'I')] + BINARY_IPV6_ARRAYS + [
+        ('v6_span_offsets', 'I')]:
+      values = getattr(self, name)
+      if isinstance(values, MappedArray):
+        values = values.values(0, len(values))
+      values = array.array(KEY_TYPECODE if typecode == 'Q' else typecode,
+                           values)
+      if sys.byteorder == 'big':
+        values.byteswap()
+      values.tofile(output_file)
+    output_file.write(self.v6_span_starts.data())
+    output_file.write(self.v6_span_ends.data())
+    output_file.write(''.join(dates))
+    output_file.write(code_table)
+
+  def save_binary(self, path):
+    with open(path, 'wb') as output_file:
+      self.write_section(output_file, self.dates, self.code_table)
+      for first_date, segment in self.segments:
+        segment.write_section(output_file, segment.dates, [])
+
+  @staticmethod
+  def read_section(buf, offset, path):
+    if len(buf) < offset + BINARY_HEADER.size or \
+        buf[offset:offset + len(BINARY_MAGIC)] != BINARY_MAGIC:
+      raise ValueError('Not a binary combined database: %s' % path)
+    magic, version = BINARY_HEADER.unpack_from(buf, offset)[:2]
+    if version != BINARY_VERSION:
+      raise ValueError('Unsupported binary combined database version %d, '
+                       'expected %d: %s' % (version, BINARY_VERSION, path))
+    (magic, version, range_count, span_count, v6_range_count, v6_span_count,
+     date_count, code_table_size) = BINARY_HEADER.unpack_from(buf, offset)
+    db = Database()
+    offset += BINARY_HEADER.size
+    for name, typecode in BINARY_ARRAYS:
+      values = MappedArray(buf, offset, typecode, range_count)
+      setattr(db, name, values)
+      offset += values.itemsize * range_count
+    db.span_starts = MappedArray(buf, offset, 'I', span_count)
+    offset += 4 * span_count
+    db.span_offsets = MappedArray(buf, offset, 'I', span_count + 1)
+    offset += 4 * (span_count + 1)
+    for name, typecode in BINARY_IPV6_ARRAYS:
+      values = MappedArray(buf, offset, typecode, v6_range_count)
+      setattr(db, name, values)
+      offset += values.itemsize * v6_range_count
+    db.v6_span_offsets = MappedArray(buf, offset, 'I', v6_span_count + 1)
+    offset += 4 * (v6_span_count + 1)
+    db.v6_span_starts = PackedAddresses(buf, offset, v6_span_count)
+    offset += PackedAddresses.WIDTH * v6_span_count
+    db.v6_span_ends = PackedAddresses(buf, offset, v6_span_count)
+    offset += PackedAddresses.WIDTH * v6_span_count
+    db.dates = [buf[pos:pos + 8]
+                for pos in xrange(offset, offset + 8 * date_count, 8)]
+    offset += 8 * date_count
+    code_table = buf[offset:offset + code_table_size]
+    codes = code_table.split('\n') if code_table_size else []
+    return db, codes, offset + code_table_size
+
+  @staticmethod
+  def open_binary(path, writable=False, cache_size=0):
+    # Map the file instead of reading it, so that opening it takes constant
+    # time, and processes opening the same file share its pages.  Opening
+    # it writable allows to append databases and flush them to the file.
+    with open(path, 'r+b' if writable else 'rb') as input_file:
+      buf = mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_WRITE
+                      if writable else mmap.ACCESS_READ)
+    db, codes, offset = Database.read_section(buf, 0, path)
+    db.buf, db.path, db.writable = buf, path, writable
+    dates = set(db.dates)
+    while offset < len(buf):
+      segment, segment_codes, offset = Database.read_section(buf, offset,
+                                                             path)
+      codes.extend(segment_codes)
+      dates.update(segment.dates)
+      db.segments.append((Database.date_string_to_number(segment.dates[0]),
+                          segment))
+    db.dates = sorted(dates)
+    db.code_table = codes
+    db.code_numbers = dict((code, number)
+                           for number, code in enumerate(db.code_table))
+    for first_date, segment in db.segments:
+      segment.code_table, segment.code_numbers = \
+          db.code_table, db.code_numbers
+    db.flushed_segments, db.flushed_codes = len(db.segments), len(codes)
+    db.cache_size = cache_size
+    db.clear_cache()
+    return db
+
+  def range_to_extend(self, ipv6, start, end, code, previous_date, date):
+    # Return the end dates array and position of the range with the given
+    # addresses and code if it was assigned in the previous database, or
+    # already extended to the given date, which ranges in a file can be if
+    # appending to it was interrupted before flushing.  Return None if there
+    # is no such range.
+    if ipv6:
+      span_starts, span_ends = self.v6_span_starts, self.v6_span_ends
+      span_offsets, end_dates, codes = \
+          self.v6_span_offsets, self.v6_end_dates, self.v6_codes
+    else:
+      span_starts, span_ends = self.span_starts, None
+      span_offsets, end_dates, codes = \
+          self.span_offsets, self.end_dates, self.codes
+    span = bisect_right(span_starts, start, 0, len(span_starts)) - 1
+    if span < 0 or span_starts[span] != start:
+      return None
+    if span_ends is None:
+      span_end = self.end_addresses[span_offsets[span]]
+    else:
+      span_end = span_ends[span]
+    pos = span_offsets[span + 1] - 1
+    if span_end != end or end_dates[pos] not in (previous_date, date) or \
+        codes[pos] != code:
+      return None
+    return end_dates, pos
+
+  def append_database(self, date_string, ranges):
+    # Merge the (start address, end address, code) ranges of a database
+    # newer than all others.  Ranges that were assigned the same way in the
+    # previous database are extended in place, and only the others are
+    # added, as a delta segment of this database.  Ranges are only extended
+    # once all others are added, so that a failure leaves them unchanged.
+    if self.buf is not None and not self.writable:
+      raise ValueError('Can only append databases to binary databases '
+                       'opened writable, not to %s' % self.path)
+    if self.dates and date_string <= self.dates[-1]:
+      raise ValueError('Can only append databases newer than %s, not %s' %
+                       (self.dates[-1], date_string))
+    self.clear_cache()
+    date = Database.date_string_to_number(date_string)
+    previous_date = self.database_date(self.dates[-1]) if self.dates \
+        else None
+    sections = [self] + [segment for first_date, segment in self.segments]
+    v4_ranges, v6_ranges, extensions = [], [], []
+    for start, end, code in ranges:
+      code = self.code_number(code)
+      ipv6 = ':' in start
+      if ipv6:
+        start = Database.address_string_to_packed(start)
+        end = Database.address_string_to_packed(end)
+      else:
+        start = Database.address_string_to_number(start)
+        end = Database.address_string_to_number(end)
+      extension = None
+      if previous_date is not None:
+        for section in sections:
+          extension = section.range_to_extend(ipv6, start, end, code,
+                                              previous_date, date)
+          if extension is not None:
+            break
+      if extension is not None:
+        extensions.append(extension)
+        continue
+      if ipv6:
+        v6_ranges.append((start, date, end, date, code))
+      else:
+        v4_ranges.append((start, end, code))
+    segment = Database()
+    segment.code_table, segment.code_numbers = \
+        self.code_table, self.code_numbers
+    segment.dates = [date_string]
+    v4_ranges.sort()
+    segment.keys = array.array(KEY_TYPECODE, [Database.create_key(r[0], date)
+                                              for r in v4_ranges])
+    segment.end_addresses = array.array('I', [r[1] for r in v4_ranges])
+    segment.start_dates = array.array('H', [date] * len(v4_ranges))
+    segment.end_dates = array.array('H', [date] * len(v4_ranges))
+    segment.codes = array.array('I', [r[2] for r in v4_ranges])
+    segment.build_index()
+    segment.set_ipv6_ranges(sorted(v6_ranges))
+    for end_dates, pos in extensions:
+      end_dates[pos] = date
+    self.segments.append((date, segment))
+    self.dates.append(date_string)
+    return len(v4_ranges) + len(v6_ranges)
+
+  def flush(self):
+    # Write changes to a database opened writable back to its file, and
+    # append the segments of databases appended since.  Extended ranges are
+    # written first, because without the segments of their database, they
+    # don't change any lookups, and appending it again finds them extended.
+    if not self.writable:
+      raise ValueError('Can only flush binary databases opened writable, '
+                       'use save_binary to write other databases')
+    self.buf.flush()
+    with open(self.path, 'ab') as output_file:
+      for first_date, segment in self.segments[self.flushed_segments:]:
+        segment.write_section(output_file, segment.dates,
+                              self.code_table[self.flushed_codes:])
+        self.flushed_codes = len(self.code_table)
+    # Map the file again, so that the segments just written are backed by
+    # it, too, and ranges extended in them later are written back by the
+    # next flush.
+    buf = self.buf
+    cache_size = self.cache_size
+    self.__dict__.update(Database.open_binary(self.path, writable=True,
+                                              cache_size=cache_size).__dict__)
+    buf.close()
+
+  def compact(self):
+    # Merge the delta segments into the other ranges, splitting ranges
+    # that overlap without being identical, so that lookups don't have to
+    # search the segments anymore.  A database opened from a binary file
+    # is no longer backed by it afterwards and has to be saved to a new
+    # file with save_binary.
+    if not self.segments:
+      return
+    self.clear_cache()
+    sections = [segment for first_date, segment in reversed(self.segments)]
+    sections.append(self)
+    v4_ranges, v6_ranges = [], []
+    for section in sections:
+      for pos in xrange(len(section.keys)):
+        v4_ranges.append((section.keys[pos] >> 16,
+                          section.end_addresses[pos],
+                          section.start_dates[pos], section.end_dates[pos],
+                          section.codes[pos]))
+      for start, start_date, end, end_date, code in section.ipv6_ranges():
+        v6_ranges.append((packed_to_number(start), packed_to_number(end),
+                          start_date, end_date, code))
+    v4_ranges = split_ranges(v4_ranges)
+    self.keys = array.array(KEY_TYPECODE, [Database.create_key(r[0], r[1])
+                                           for r in v4_ranges])
+    self.end_addresses = array.array('I', [r[2] for r in v4_ranges])
+    self.start_dates = array.array('H', [r[1] for r in v4_ranges])
+    self.end_dates = array.array('H', [r[3] for r in v4_ranges])
+    self.codes = array.array('I', [r[4] for r in v4_ranges])
+    self.build_index()
+    self.set_ipv6_ranges([(number_to_packed(r[0]), r[1],
+                           number_to_packed(r[2]), r[3], r[4])
+                          for r in split_ranges(v6_ranges)])
+    self.segments = []
+    self.buf = self.path = None
+    self.writable = False
+
+  def database_date(self, date_string):
+    # Return the date number of the database valid at the given date, or
+    # of the first database for earlier dates.
+    dates_pos = max(0, bisect.bisect(self.dates, date_string) - 1)
+    database_date = self.dates[dates_pos]
+    date = self.date_numbers.get(database_date)
+    if date is None:
+      date = self.date_numbers[database_date] = \
+          Database.date_string_to_number(database_date)
+    return date
+
+  def lookup_in_span(self, span, address, date):
+    if span < 0:
+      return '??'
+    low = self.span_offsets[span]
+    if self.end_addresses[low] < address:
+      return '??'
+    # Find the last range of the span starting at or before the date, which
+    # is the only one that can contain it.
+    pos = bisect_right(self.start_dates, date, low,
+                       self.span_offsets[span + 1]) - 1
+    if pos < low or self.end_dates[pos] < date:
+      return '??'
+    return self.code_table[self.codes[pos]]
+
+  def lookup_ipv6(self, address, date):
+    span = bisect_right(self.v6_span_starts, address, 0,
+                        len(self.v6_span_starts)) - 1
+    if span < 0 or self.v6_span_ends[span] < address:
+      return '??'
+    low = self.v6_span_offsets[span]
+    pos = bisect_right(self.v6_start_dates, date, low,
+                       self.v6_span_offsets[span + 1]) - 1
+    if pos < low or self.v6_end_dates[pos] < date:
+      return '??'
+    return self.code_table[self.v6_codes[pos]]
+
+  def lookup_ipv4(self, address, date):
+    # Find the last span starting at or before the address, which is the
+    # only one that can contain it.
+    span = bisect_right(self.span_starts, address, 0,
+                        len(self.span_starts)) - 1
+    return self.lookup_in_span(span, address, date)
+
+  def lookup_ipv4_range(self, address, date):
+    # Return the start address, end address, and code of the range
+    # containing the address at the given database date, or the address
+    # itself and '??' if there is none.
+    sections = [segment for first_date, segment in reversed(self.segments)
+                if first_date <= date] + [self]
+    for section in sections:
+      span = bisect_right(section.span_starts, address, 0,
+                          len(section.span_starts)) - 1
+      code = section.lookup_in_span(span, address, date)
+      if code != '??':
+        return (section.span_starts[span],
+                section.end_addresses[section.span_offsets[span]], code)
+    return (address, address, '??')
+
+  def lookup_ipv4_cached(self, address, date):
+    # Ranges are rarely smaller than a /24, so most lookups in the same
+    # block at the same database date find the range cached by another
+    # one.  Cached ranges are checked to contain the address, though.
+    key = (address >> 8, date)
+    cached = self.cache.get(key)
+    if cached is not None and cached[0] <= address <= cached[1]:
+      self.cache_hits += 1
+      return cached[2]
+    self.cache_misses += 1
+    result = self.lookup_ipv4_range(address, date)
+    if key not in self.cache:
+      if len(self.cache) >= self.cache_size:
+        del self.cache[self.cache_keys.popleft()]
+        self.cache_evictions += 1
+      self.cache_keys.append(key)
+    self.cache[key] = result
+    return result[2]
+
+  def lookup_segments(self, ipv6, address, date):
+    # Look up an address in the delta segments of databases published up
+    # to the given date, newest first, and return None if none has it.
+    for first_date, segment in reversed(self.segments):
+      if first_date <= date:
+        if ipv6:
+          code = segment.lookup_ipv6(address, date)
         else:
-          r = Range(line)
-          self.data.append((r.key, r))
-    self.data.sort()
-    self.keys = [r[0] for r in self.data]
+          code = segment.lookup_ipv4(address, date)
+        if code != '??':
+          return code
+    return None
 
   def lookup_address_and_date(self, address_string, date_string):
-    if len(self.data) == 0:
+    if len(self.dates) == 0:
       return '??'
-    dates_pos = max(0, bisect.bisect(self.dates, date_string) - 1)
-    address = Database.address_string_to_number(address_string)
-    date = Database.date_string_to_number(self.dates[dates_pos])
-    key = Database.create_key(address, date)
-    pos = bisect.bisect(self.keys, key + 1)
-    # Look up address and date by iterating backwards over possibly
-    # matching ranges.
-    while pos:
-      pos = pos - 1
-      r = self.data[pos][1]
-      # If either the end address or end date of the range we're looking
-      # at is smaller than the values we're looking for, we can be sure
-      # not to find it anymore.
-      if r.end_address < address or r.end_date < date:
-        return '??'
-      # If the range starts at a later date, skip it and look at the next
-      # one.
-      if r.start_date > date:
+    date = self.database_date(date_string)
+    ipv6 = ':' in address_string
+    if ipv6:
+      address = Database.address_string_to_packed(address_string)
+    else:
+      address = Database.address_string_to_number(address_string)
+      if self.cache is not None:
+        return self.lookup_ipv4_cached(address, date)
+    if self.segments:
+      code = self.lookup_segments(ipv6, address, date)
+      if code is not None:
+        return code
+    if ipv6:
+      return self.lookup_ipv6(address, date)
+    return self.lookup_ipv4(address, date)
+
+  def lookup_addresses_and_dates(self, addresses_and_dates):
+    addresses_and_dates = list(addresses_and_dates)
+    results = ['??'] * len(addresses_and_dates)
+    if len(self.dates) == 0:
+      return results
+    # Convert every distinct address and date only once, and sort IPv4
+    # lookups by key, so that they can be resolved in one pass over the
+    # spans.  IPv6 lookups and lookups in delta segments are resolved one
+    # by one.
+    addresses, dates = {}, {}
+    keys = []
+    v4_indexes = []
+    first_segment_date = self.segments[0][0] if self.segments else None
+    for index, (address_string, date_string) in \
+        enumerate(addresses_and_dates):
+      date = dates.get(date_string)
+      if date is None:
+        date = dates[date_string] = self.database_date(date_string)
+      if ':' in address_string:
+        results[index] = self.lookup_address_and_date(address_string,
+                                                      date_string)
+        continue
+      address = addresses.get(address_string)
+      if address is None:
+        address = addresses[address_string] = \
+            Database.address_string_to_number(address_string)
+      if first_segment_date is not None and date >= first_segment_date:
+        code = self.lookup_segments(False, address, date)
+        if code is not None:
+          results[index] = code
+          continue
+      keys.append(Database.create_key(address, date))
+      v4_indexes.append(index)
+    if len(self.keys) == 0:
+      return results
+    order = sorted(xrange(len(keys)), key=keys.__getitem__)
+    span_starts = self.span_starts
+    span_count = len(span_starts)
+    # Number of spans starting at or before the current address, which
+    # only ever grows.  Lookups of the next spans advance it directly, and
+    # larger gaps between lookups are skipped by bisecting the remainder.
+    next_span = 0
+    last_key, last_result = None, None
+    for index in order:
+      key = keys[index]
+      if key != last_key:
+        address, date = key >> 16, key & 0xffff
+        if next_span < span_count and span_starts[next_span] <= address:
+          next_span += 1
+          if next_span < span_count and span_starts[next_span] <= address:
+            next_span = bisect_right(span_starts, address, next_span,
+                                     span_count)
+        last_key = key
+        last_result = self.lookup_in_span(next_span - 1, address, date)
+      results[v4_indexes[index]] = last_result
+    return results
+
+def convert(combined_path, binary_path):
+  db = Database()
+  db.load_combined_databases(combined_path)
+  db.save_binary(binary_path)
+  return db
+
+def read_regional_registry_stats_file(path):
+  # Return the date and (start address, end address, code) ranges of an
+  # RIR stats file, named like delegated-arin-20120901, skipping the same
+  # lines as the Java importer except for IPv6 ranges.
+  ranges = []
+  with open(path) as input_file:
+    for line in input_file:
+      line = line.strip()
+      if line.startswith('#') or not line:
+        continue
+      parts = line.split('|')
+      if parts[0] == '2' or parts[1] == '*' or parts[2] == 'asn':
+        continue
+      code = parts[1].lower()
+      if len(code) != 2:
         continue
-      # Both address and date ranges match, so return the assigned
-      # code.
-      return r.code
-    # No ranges (left) to look at.  We don't have what we were looking
-    # for. */
-    return '??';
+      start = parts[3]
+      if parts[2] == 'ipv6':
+        # The count of IPv6 ranges is their prefix length.
+        number = packed_to_number(Database.address_string_to_packed(start))
+        number += (1 << (128 - int(parts[4]))) - 1
+        end = socket.inet_ntop(socket.AF_INET6, number_to_packed(number))
+      else:
+        number = Database.address_string_to_number(start) + \
+            long(parts[4]) - 1
+        end = socket.inet_ntoa(ADDRESS_STRUCT.pack(number))
+      ranges.append((start, end, code))
+  return path[-8:], ranges
 
 if __name__ == "__main__":
+  if sys.argv[1:2] == ['append']:
+    if len(sys.argv) < 4:
+      sys.exit("Usage - python pygeodate.py append <binary database> "
+               "<stats file>...")
+    db = Database.open_binary(sys.argv[2], writable=True)
+    # Stats files of the five registries with the same date make up one
+    # database.
+    ranges_by_date = {}
+    for path in sys.argv[3:]:
+      date_string, ranges = read_regional_registry_stats_file(path)
+      ranges_by_date.setdefault(date_string, []).extend(ranges)
+    for date_string, ranges in sorted(ranges_by_date.items()):
+      added = db.append_database(date_string, ranges)
+      print "Appended %s with %d of %d ranges changed" % (date_string,
+                                                          added,
+                                                          len(ranges))
+    if len(db.segments) > MAX_SEGMENTS:
+      # Replace the file only once the compacted one is complete.
+      db.compact()
+      db.save_binary(sys.argv[2] + '.tmp')
+      os.rename(sys.argv[2] + '.tmp', sys.argv[2])
+      print "Compacted %d ranges of %d databases into %s" % (
+          len(db.keys), len(db.dates), sys.argv[2])
+    else:
+      db.flush()
+    sys.exit(0)
+  if sys.argv[1:2] == ['convert']:
+    if len(sys.argv) != 4:
+      sys.exit("Usage - python pygeodate.py convert <combined database> "
+               "<binary database>")
+    db = convert(sys.argv[2], sys.argv[3])
+    print "Wrote %d ranges of %d databases to %s" % (len(db.keys),
+                                                     len(db.dates),
+                                                     sys.argv[3])
+    sys.exit(0)
   db = Database()
   db.load_combined_databases('geoip-2007-10-2012-09.csv')
   with open('test-cases-2007-10-2012-09.csv') as input_file:
@@ -0,0 +1,469 @@
+import os
+import shutil
+import socket
+import struct
+import tempfile
+import unittest
+
+from pygeodate import BINARY_HEADER, Database, \
+    read_regional_registry_stats_file
+
+class DatabaseTest(unittest.TestCase):
+  def setUp(self):
+    self.directory = tempfile.mkdtemp()
+
+  def tearDown(self):
+    shutil.rmtree(self.directory)
+
+  def load(self, lines, cache_size=0):
+    # Write a combined database in the format of the Java importer, with
+    # ranges in descending order, and load it.
+    path = os.path.join(self.directory, 'combined.csv')
+    with open(path, 'w') as output_file:
+      output_file.write('\n'.join(lines) + '\n')
+    database = Database(cache_size)
+    database.load_combined_databases(path)
+    return database
+
+  def assert_lookups(self, database, address_string, expected_by_date):
+    for date_string, expected in expected_by_date:
+      self.assertEqual(expected, database.lookup_address_and_date(
+          address_string, date_string))
+
+  def assert_test_cases(self, database, test_cases):
+    # Check lines in the address,date,code format of the test cases that
+    # DatabasePerformanceExample writes, one by one and in bulk.
+    addresses_and_dates, expected = [], []
+    for line in test_cases:
+      address_string, date_string, code = line.split(',')
+      addresses_and_dates.append((address_string, date_string))
+      expected.append(code)
+    self.assertEqual(expected, [database.lookup_address_and_date(*test)
+                                for test in addresses_and_dates])
+    self.assertEqual(expected,
+        database.lookup_addresses_and_dates(addresses_and_dates))
+
+  def test_empty_database(self):
+    database = self.load(['!20120901!delegated-arin-20120901'])
+    self.assertEqual('??', database.lookup_address_and_date(
+        '3.127.0.0', '20120901'))
+
+  def test_single_ip_range_single_database(self):
+    database = self.load([
+        '!20120901!delegated-arin-20120901',
+        '3.0.0.0,3.255.255.255,us,20120901,20120901'])
+    self.assertEqual(1, len(database.keys))
+    dates = ['19920901', '20020901', '20120901', '20220901']
+    for address_string in ['2.255.255.255', '4.0.0.0']:
+      self.assert_lookups(database, address_string,
+                          [(date, '??') for date in dates])
+    for address_string in ['3.0.0.0', '3.127.0.0', '3.255.255.255']:
+      self.assert_lookups(database, address_string,
+                          [(date, 'us') for date in dates])
+
+  def test_two_adjacent_ip_ranges_single_database(self):
+    database = self.load([
+        '!20120901!delegated-arin-20120901',
+        '4.0.0.0,4.255.255.255,ca,20120901,20120901',
+        '3.0.0.0,3.255.255.255,us,20120901,20120901'])
+    self.assertEqual(2, len(database.keys))
+    self.assert_lookups(database, '2.255.255.255', [('20120901', '??')])
+    self.assert_lookups(database, '3.127.0.0', [('20120901', 'us')])
+    self.assert_lookups(database, '4.127.0.0', [('20120901', 'ca')])
+    self.assert_lookups(database, '5.0.0.0', [('20120901', '??')])
+
+  def test_leave_ip_range_unchanged(self):
+    database = self.load([
+        '!20121001!delegated-arin-20121001',
+        '!20120901!delegated-arin-20120901',
+        '3.0.0.0,3.255.255.255,us,20120901,20121001'])
+    self.assertEqual(1, len(database.keys))
+    self.assert_lookups(database, '3.127.0.0', [
+        ('20120801', 'us'), ('20120901', 'us'), ('20121001', 'us'),
+        ('20121101', 'us')])
+
+  def test_missing_ip_range(self):
+    database = self.load([
+        '!20121101!delegated-arin-20121101',
+        '!20121001!delegated-arin-20121001',
+        '!20120901!delegated-arin-20120901',
+        '6.0.0.0,6.255.255.255,us,20121001,20121001',
+        '3.0.0.0,3.255.255.255,us,20121101,20121101',
+        '3.0.0.0,3.255.255.255,us,20120901,20120901'])
+    self.assertEqual(3, len(database.keys))
+    self.assert_lookups(database, '3.127.0.0', [
+        ('20120801', 'us'), ('20120901', 'us'), ('20121001', '??'),
+        ('20121101', 'us')])
+    self.assert_lookups(database, '6.127.0.0', [
+        ('20120901', '??'), ('20121001', 'us'), ('20121101', '??')])
+
+  def test_many_date_ranges(self):
+    dates = ['2012%02d01' % month for month in range(1, 13)]
+    lines = ['!%s!delegated-arin-%s' % (date, date) for date in dates]
+    # Alternate codes and leave out every third database.
+    for i, date in reversed(list(enumerate(dates))):
+      if i % 3 != 2:
+        lines.append('3.0.0.0,3.255.255.255,%s,%s,%s' % (
+            ['us', 'ca'][i % 2], date, date))
+    lines.append('2.0.0.0,2.255.255.255,de,20120101,20121201')
+    database = self.load(lines)
+    self.assertEqual(2, len(database.span_starts))
+    for i, date in enumerate(dates):
+      self.assert_lookups(database, '3.127.0.0', [
+          (date, ['us', 'ca'][i % 2] if i % 3 != 2 else '??')])
+      self.assert_lookups(database, '2.127.0.0', [(date, 'de')])
+    self.assert_lookups(database, '1.255.255.255', [('20120101', '??')])
+    self.assert_lookups(database, '4.0.0.0', [('20121201', '??')])
+
+  def test_bulk_lookups(self):
+    database = self.load([
+        '!20121101!delegated-arin-20121101',
+        '!20121001!delegated-arin-20121001',
+        '!20120901!delegated-arin-20120901',
+        '8.0.0.0,8.255.255.255,jp,20120901,20121101',
+        '6.0.0.0,6.255.255.255,de,20121001,20121001',
+        '3.0.0.0,3.255.255.255,us,20121101,20121101',
+        '3.0.0.0,3.255.255.255,ca,20120901,20120901'])
+    addresses_and_dates = [
+        (address, date)
+        for address in ['9.0.0.0', '3.127.0.0', '6.0.0.1', '1.0.0.0',
+                        '8.255.255.255', '7.0.0.0', '3.127.0.0']
+        for date in ['20121101', '20120801', '20121015', '20120901']]
+    expected = [database.lookup_address_and_date(address, date)
+                for address, date in addresses_and_dates]
+    self.assertEqual(expected,
+        database.lookup_addresses_and_dates(addresses_and_dates))
+    self.assertEqual([], database.lookup_addresses_and_dates([]))
+
+  def test_unsorted_ranges(self):
+    database = self.load([
+        '!20120901!delegated-arin-20120901',
+        '!20121001!delegated-arin-20121001',
+        '3.0.0.0,3.255.255.255,us,20120901,20120901',
+        '6.0.0.0,6.255.255.255,de,20121001,20121001',
+        '3.0.0.0,3.255.255.255,ca,20121001,20121001'])
+    self.assertEqual(['20120901', '20121001'], database.dates)
+    self.assertEqual(sorted(database.keys), list(database.keys))
+    self.assert_lookups(database, '3.127.0.0', [
+        ('20120901', 'us'), ('20121001', 'ca')])
+    self.assert_lookups(database, '6.127.0.0', [
+        ('20120901', '??'), ('20121001', 'de')])
+
+  def test_conversions(self):
+    self.assertEqual(0, Database.date_string_to_number('19700101'))
+    self.assertEqual(15584, Database.date_string_to_number('20120901'))
+    self.assertEqual(0x03000001,
+                     Database.address_string_to_number('3.0.0.1'))
+    self.assertEqual(0xffffffff,
+                     Database.address_string_to_number('255.255.255.255'))
+
+  def test_binary_round_trip(self):
+    database = self.load([
+        '!20121101!delegated-arin-20121101',
+        '!20121001!delegated-arin-20121001',
+        '!20120901!delegated-arin-20120901',
+        '6.0.0.0,6.255.255.255,de,20121001,20121001',
+        '3.0.0.0,3.255.255.255,us,20121101,20121101',
+        '3.0.0.0,3.255.255.255,ca,20120901,20120901'])
+    path = os.path.join(self.directory, 'combined.bin')
+    database.save_binary(path)
+    mapped = Database.open_binary(path)
+    self.assertEqual(database.dates, mapped.dates)
+    self.assertEqual(database.code_table, mapped.code_table)
+    self.assertEqual(list(database.keys), list(mapped.keys))
+    self.assert_lookups(mapped, '3.127.0.0', [
+        ('20120801', 'ca'), ('20120901', 'ca'), ('20121001', '??'),
+        ('20121101', 'us')])
+    self.assert_lookups(mapped, '6.127.0.0', [
+        ('20120901', '??'), ('20121001', 'de'), ('20121101', '??')])
+    self.assert_lookups(mapped, '7.0.0.0', [('20121001', '??')])
+
+  def test_binary_version_check(self):
+    path = os.path.join(self.directory, 'combined.bin')
+    with open(path, 'wb') as output_file:
+      output_file.write(BINARY_HEADER.pack('PGDB', 99, 0, 0, 0, 0, 0, 0))
+    self.assertRaises(ValueError, Database.open_binary, path)
+    with open(path, 'wb') as output_file:
+      output_file.write('3.0.0.0,3.255.255.255,us,20120901,20120901\n')
+    self.assertRaises(ValueError, Database.open_binary, path)
+
+  IPV6_COMBINED = [
+      '!20121101!delegated-ripencc-20121101',
+      '!20121001!delegated-ripencc-20121001',
+      '!20120901!delegated-ripencc-20120901',
+      '2001:db8:1::,2001:db8:1:ffff:ffff:ffff:ffff:ffff,de,20120901,20121101',
+      '6.0.0.0,6.255.255.255,de,20121001,20121001',
+      '2001:db8::,2001:db8:0:ffff:ffff:ffff:ffff:ffff,nl,20121101,20121101',
+      '2001:db8::,2001:db8:0:ffff:ffff:ffff:ffff:ffff,fr,20120901,20120901',
+      '3.0.0.0,3.255.255.255,us,20120901,20121101']
+  IPV6_TEST_CASES = [
+      '2001:db8::1,20120901,fr',
+      '2001:db8::1,20121015,??',
+      '2001:db8::1,20121101,nl',
+      '2001:db8:0:ffff:ffff:ffff:ffff:ffff,20120801,fr',
+      '2001:db8:1::,20121001,de',
+      '2001:db8:1:ffff::1,20121201,de',
+      '2001:db8:2::,20121001,??',
+      '2001:db7:ffff:ffff:ffff:ffff:ffff:ffff,20121001,??',
+      '::1,20121001,??',
+      'ffff::1,20121001,??',
+      '::ffff:3.1.2.3,20121001,??',
+      '3.1.2.3,20121001,us',
+      '6.1.2.3,20121001,de',
+      '6.1.2.3,20121101,??']
+
+  def test_ipv6_ranges(self):
+    database = self.load(DatabaseTest.IPV6_COMBINED)
+    self.assertEqual(2, len(database.keys))
+    self.assertEqual(3, len(database.v6_codes))
+    self.assertEqual(2, len(database.v6_span_starts))
+    self.assert_test_cases(database, DatabaseTest.IPV6_TEST_CASES)
+
+  def test_ipv6_binary_round_trip(self):
+    database = self.load(DatabaseTest.IPV6_COMBINED)
+    path = os.path.join(self.directory, 'combined.bin')
+    database.save_binary(path)
+    self.assert_test_cases(Database.open_binary(path),
+                           DatabaseTest.IPV6_TEST_CASES)
+
+  def test_ipv6_only(self):
+    database = self.load(DatabaseTest.IPV6_COMBINED[:4])
+    self.assertEqual(0, len(database.keys))
+    self.assert_test_cases(database, [
+        '2001:db8:1::1,20121001,de', '2001:db8::1,20121001,??',
+        '3.1.2.3,20121001,??'])
+
+  APPEND_COMBINED = [
+      '!20121001!delegated-arin-20121001',
+      '!20120901!delegated-arin-20120901',
+      '2001:db8::,2001:db8:0:ffff:ffff:ffff:ffff:ffff,nl,20120901,20121001',
+      '6.0.0.0,6.255.255.255,de,20120901,20121001',
+      '4.0.0.0,4.255.255.255,ca,20120901,20120901',
+      '3.0.0.0,3.255.255.255,us,20120901,20121001']
+  APPEND_RANGES = [
+      ('3.0.0.0', '3.255.255.255', 'us'),
+      ('4.0.0.0', '4.255.255.255', 'ca'),
+      ('6.0.0.0', '6.127.255.255', 'de'),
+      ('6.128.0.0', '6.255.255.255', 'fr'),
+      ('2001:db8::', '2001:db8:0:ffff:ffff:ffff:ffff:ffff', 'nl'),
+      ('2001:db8:1::', '2001:db8:1:ffff:ffff:ffff:ffff:ffff', 'be')]
+  APPEND_TEST_CASES = [
+      '3.1.2.3,20121001,us', '3.1.2.3,20121101,us', '3.1.2.3,20121201,us',
+      '4.1.2.3,20120901,ca', '4.1.2.3,20121001,??', '4.1.2.3,20121101,ca',
+      '6.1.2.3,20121001,de', '6.1.2.3,20121101,de',
+      '6.200.2.3,20121001,de', '6.200.2.3,20121101,fr',
+      '5.1.2.3,20121101,??', '7.1.2.3,20121101,??',
+      '2001:db8::1,20121001,nl', '2001:db8::1,20121101,nl',
+      '2001:db8:1::1,20121001,??', '2001:db8:1::1,20121101,be']
+
+  def test_append_database(self):
+    database = self.load(DatabaseTest.APPEND_COMBINED)
+    self.assertEqual(4, database.append_database('20121101',
+                                                 DatabaseTest.APPEND_RANGES))
+    self.assertEqual(['20120901', '20121001', '20121101'], database.dates)
+    # Unchanged ranges are extended, and the others are in a new segment.
+    self.assertEqual(3, len(database.keys))
+    self.assertEqual(1, len(database.segments))
+    segment = database.segments[0][1]
+    self.assertEqual(3, len(segment.keys))
+    self.assertEqual(1, len(segment.v6_codes))
+    self.assert_test_cases(database, DatabaseTest.APPEND_TEST_CASES)
+    self.assertRaises(ValueError, database.append_database, '20121101',
+                      DatabaseTest.APPEND_RANGES)
+
+  def test_compact(self):
+    database = self.load(DatabaseTest.APPEND_COMBINED)
+    database.append_database('20121101', DatabaseTest.APPEND_RANGES)
+    database.append_database('20121201', [
+        ('3.0.0.0', '3.127.255.255', 'us'), ('6.0.0.0', '6.255.255.255', 'fr'),
+        ('2001:db8::', '2001:db8:0:ffff:ffff:ffff:ffff:ffff', 'nl')])
+    test_cases = DatabaseTest.APPEND_TEST_CASES + [
+        '3.1.2.3,20121201,us', '3.200.2.3,20121201,??',
+        '3.200.2.3,20121101,us', '6.1.2.3,20121201,fr',
+        '6.200.2.3,20121201,fr', '2001:db8::1,20121201,nl',
+        '2001:db8:1::1,20121201,??']
+    self.assert_test_cases(database, test_cases)
+    database.compact()
+    self.assertEqual([], database.segments)
+    self.assert_test_cases(database, test_cases)
+    # Ranges are split where others start or end.
+    self.assertEqual(['3.0.0.0', '3.128.0.0', '4.0.0.0', '6.0.0.0',
+                      '6.128.0.0'],
+                     [socket.inet_ntoa(struct.pack('!I', start))
+                      for start in database.span_starts])
+    path = os.path.join(self.directory, 'combined.bin')
+    database.save_binary(path)
+    self.assert_test_cases(Database.open_binary(path), test_cases)
+
+  def test_compact_binary(self):
+    path = os.path.join(self.directory, 'combined.bin')
+    self.load(DatabaseTest.APPEND_COMBINED).save_binary(path)
+    database = Database.open_binary(path, writable=True)
+    database.append_database('20121101', DatabaseTest.APPEND_RANGES)
+    database.compact()
+    self.assertRaises(ValueError, database.flush)
+    database.save_binary(path + '.compact')
+    database = Database.open_binary(path + '.compact')
+    self.assertEqual([], database.segments)
+    self.assert_test_cases(database, DatabaseTest.APPEND_TEST_CASES)
+
+  def test_malformed_addresses(self):
+    # Octets are decimal, and nothing else is accepted.
+    database = self.load(DatabaseTest.APPEND_COMBINED)
+    self.assertEqual(3 << 24 | 1, Database.address_string_to_number('3.0.0.1'))
+    for address_string in ('010.1.1.1', '1.2.3.0x10', '1.2.3.4 junk',
+                           '1.2.3'):
+      self.assertRaises(socket.error, database.lookup_address_and_date,
+                        address_string, '20121001')
+
+  def test_append_failure(self):
+    database = self.load(DatabaseTest.APPEND_COMBINED)
+    end_dates = list(database.end_dates)
+    self.assertRaises(socket.error, database.append_database, '20121101',
+                      DatabaseTest.APPEND_RANGES + [('3.0.0.0', '3.0.0.x', 'us')])
+    self.assertEqual(end_dates, list(database.end_dates))
+    self.assertEqual(0, len(database.segments))
+
+  def test_append_to_empty_database(self):
+    database = Database()
+    database.append_database('20121001', DatabaseTest.APPEND_RANGES)
+    database.append_database('20121101', DatabaseTest.APPEND_RANGES[:2])
+    self.assertEqual(0, len(database.segments[1][1].keys))
+    self.assert_test_cases(database, [
+        '3.1.2.3,20120901,us', '3.1.2.3,20121101,us', '6.1.2.3,20121001,de',
+        '6.1.2.3,20121101,??', '2001:db8::1,20121101,??'])
+
+  def test_append_binary(self):
+    path = os.path.join(self.directory, 'combined.bin')
+    self.load(DatabaseTest.APPEND_COMBINED).save_binary(path)
+    size = os.path.getsize(path)
+    database = Database.open_binary(path, writable=True)
+    database.append_database('20121101', DatabaseTest.APPEND_RANGES)
+    database.flush()
+    self.assertTrue(os.path.getsize(path) > size)
+    database = Database.open_binary(path)
+    self.assertEqual(['20120901', '20121001', '20121101'], database.dates)
+    self.assertEqual(1, len(database.segments))
+    self.assert_test_cases(database, DatabaseTest.APPEND_TEST_CASES)
+    # Saving writes the segments as well.
+    database.save_binary(path + '.copy')
+    self.assert_test_cases(Database.open_binary(path + '.copy'),
+                           DatabaseTest.APPEND_TEST_CASES)
+
+  def test_append_read_only(self):
+    path = os.path.join(self.directory, 'combined.bin')
+    database = self.load(DatabaseTest.APPEND_COMBINED)
+    self.assertRaises(ValueError, database.flush)
+    database.save_binary(path)
+    database = Database.open_binary(path)
+    self.assertRaises(ValueError, database.append_database, '20121101',
+                      DatabaseTest.APPEND_RANGES)
+    self.assertRaises(ValueError, database.flush)
+    self.assertEqual(['20120901', '20121001'], database.dates)
+
+  def test_append_binary_again(self):
+    # Extended ranges may be written back to the file before appending
+    # the segment is, and the same database can be appended again then.
+    path = os.path.join(self.directory, 'combined.bin')
+    self.load(DatabaseTest.APPEND_COMBINED).save_binary(path)
+    database = Database.open_binary(path, writable=True)
+    database.append_database('20121101', DatabaseTest.APPEND_RANGES)
+    database.buf.flush()
+    database = Database.open_binary(path, writable=True)
+    self.assertEqual(['20120901', '20121001'], database.dates)
+    self.assert_test_cases(database, DatabaseTest.APPEND_TEST_CASES[:1])
+    self.assertEqual(4, database.append_database('20121101',
+                                                 DatabaseTest.APPEND_RANGES))
+    database.flush()
+    self.assert_test_cases(Database.open_binary(path),
+                           DatabaseTest.APPEND_TEST_CASES)
+
+  def test_append_binary_twice(self):
+    # Ranges of a segment flushed earlier in the same session are extended
+    # in the file, too.
+    path = os.path.join(self.directory, 'combined.bin')
+    self.load(DatabaseTest.APPEND_COMBINED).save_binary(path)
+    database = Database.open_binary(path, writable=True)
+    for date_string in ('20121101', '20121201', '20130101'):
+      database.append_database(date_string, DatabaseTest.APPEND_RANGES)
+      database.flush()
+    test_cases = DatabaseTest.APPEND_TEST_CASES + [
+        '6.200.2.3,20130101,fr', '2001:db8:1::1,20130101,be',
+        '3.1.2.3,20130101,us', '4.1.2.3,20121201,ca']
+    self.assert_test_cases(database, test_cases)
+    database = Database.open_binary(path)
+    self.assertEqual(3, len(database.segments))
+    self.assert_test_cases(database, test_cases)
+
+  def test_read_regional_registry_stats_file(self):
+    path = os.path.join(self.directory, 'delegated-ripencc-20121101')
+    with open(path, 'w') as output_file:
+      output_file.write('\n'.join([
+          '2|ripencc|1351724399|3|19830705|20121031|+0100',
+          'ripencc|*|ipv4|*|2|summary',
+          '# comment',
+          'ripencc|FR|ipv4|6.128.0.0|8388608|20121101|allocated',
+          'ripencc|EU|ipv4|7.0.0.0|256|20121101|allocated',
+          'ripencc|ZZ1|ipv4|8.0.0.0|256|20121101|allocated',
+          'ripencc|BE|ipv6|2001:db8:1::|48|20121101|allocated',
+          'ripencc|BE|asn|3333|1|20121101|allocated']) + '\n')
+    self.assertEqual(('20121101', [
+        ('6.128.0.0', '6.255.255.255', 'fr'),
+        ('7.0.0.0', '7.0.0.255', 'eu'),
+        ('2001:db8:1::', '2001:db8:1:ffff:ffff:ffff:ffff:ffff', 'be')]),
+        read_regional_registry_stats_file(path))
+
+  def test_cache(self):
+    database = self.load([
+        '!20121001!delegated-arin-20121001',
+        '!20120901!delegated-arin-20120901',
+        '3.0.0.128,3.0.0.255,ca,20120901,20121001',
+        '3.0.0.0,3.0.0.127,us,20120901,20121001'], cache_size=100)
+    test_cases = ['3.0.0.1,20120901,us', '3.0.0.2,20120915,us',
+                  '3.0.0.200,20120901,ca', '3.0.0.1,20120901,us',
+                  '3.0.1.1,20120901,??', '3.0.1.1,20120901,??',
+                  '3.0.0.3,20121001,us']
+    for line in test_cases:
+      address_string, date_string, code = line.split(',')
+      self.assertEqual(code, database.lookup_address_and_date(
+          address_string, date_string))
+    self.assertEqual({'hits': 2, 'misses': 5, 'evictions': 0, 'size': 3,
+                      'max_size': 100}, database.cache_info())
+
+  def test_cache_with_segments(self):
+    database = self.load(DatabaseTest.APPEND_COMBINED, cache_size=100)
+    self.assert_test_cases(database, DatabaseTest.APPEND_TEST_CASES[:4])
+    database.append_database('20121101', DatabaseTest.APPEND_RANGES)
+    self.assertEqual(0, database.cache_info()['size'])
+    for i in range(2):
+      self.assert_test_cases(database, DatabaseTest.APPEND_TEST_CASES)
+    self.assertTrue(database.cache_info()['hits'] > 0)
+
+  def test_cache_evictions(self):
+    database = self.load(DatabaseTest.APPEND_COMBINED, cache_size=2)
+    self.assert_test_cases(database, DatabaseTest.APPEND_TEST_CASES[:5])
+    info = database.cache_info()
+    self.assertTrue(info['evictions'] > 0)
+    self.assertTrue(info['size'] <= 2)
+
+  def test_cache_larger_working_set(self):
+    # A full cache evicts only its oldest entry, so that the other blocks
+    # are still cached afterwards.
+    database = self.load(DatabaseTest.APPEND_COMBINED, cache_size=4)
+    for block in [1, 2, 3, 4, 5, 2, 3, 4]:
+      self.assertEqual('us', database.lookup_address_and_date(
+          '3.0.%d.1' % block, '20120901'))
+    self.assertEqual({'hits': 3, 'misses': 5, 'evictions': 1, 'size': 4,
+                      'max_size': 4}, database.cache_info())
+
+  def test_codes_are_shared(self):
+    database = self.load([
+        '!20120901!delegated-arin-20120901',
+        '6.0.0.0,6.255.255.255,us,20120901,20120901',
+        '4.0.0.0,4.255.255.255,ca,20120901,20120901',
+        '3.0.0.0,3.255.255.255,us,20120901,20120901'])
+    self.assertEqual(['us', 'ca'], database.code_table)
+    self.assertEqual([0, 1, 0], list(database.codes))
+
+if __name__ == '__main__':
+  unittest.main()